@@ -9,6 +9,9 @@ import numpy as np
 from pathlib import Path
 import sys
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / "sequence_generation"))
+from be_trajectory_index import load_trajectory_index
+
 def get_animation_frames(npz_path):
 #    print(f"Processing: {npz_path}", file=sys.stderr)
     num_frames = 0
@@ -21,14 +24,23 @@ def get_animation_frames(npz_path):
 ################################################################################
 
 if len(sys.argv) != 4:
-    print(f"Usage: {sys.argv[0]} /path/to/whitelist.json /path/to/npz/animations FRAMES_MIN")
+    print(f"Usage: {sys.argv[0]} /path/to/whitelist.json /path/to/npz/animations|/path/to/trajectories.json FRAMES_MIN")
     print(f"       {sys.argv[0]} /mnt/c/bedlam2/render/config/whitelist_animations_b2v3.json /mnt/c/bedlam2/animations/b2v3 300")
+    print(f"       {sys.argv[0]} /mnt/c/bedlam2/render/config/whitelist_animations_b2v3.json /mnt/c/bedlam2/render/stats/trajectories_b2v3.json 300")
     sys.exit(1)
 
 whitelist_path = Path(sys.argv[1])
 animation_root = Path(sys.argv[2])
 frames_min = int(sys.argv[3])
 
+# Source animation frame counts from packed trajectory index, see sequence_generation/be_trajectory_index.py
+trajectory_index = None
+if animation_root.suffix == ".json":
+    trajectory_index = load_trajectory_index(animation_root)
+    if trajectory_index is None:
+        print(f"ERROR: Cannot load trajectory index: {animation_root}", file=sys.stderr)
+        sys.exit(1)
+
 whitelist_frames = {}
 body_animations = []
 num_subjects = 0
@@ -37,8 +49,15 @@ with open(whitelist_path) as f:
     whitelist_animations = json.load(f)
     for subject in whitelist_animations:
         for animation_index in whitelist_animations[subject]:
-            npz_path = animation_root / subject / animation_index / "motion_seq.npz"
-            num_frames = get_animation_frames(npz_path)
+            if trajectory_index is not None:
+                entry = trajectory_index.get_entry(subject, animation_index)
+                if entry is None:
+                    print(f"WARNING: Animation not in trajectory index, skipping: {subject}_{animation_index}", file=sys.stderr)
+                    continue
+                (_, _, num_frames, _) = entry
+            else:
+                npz_path = animation_root / subject / animation_index / "motion_seq.npz"
+                num_frames = get_animation_frames(npz_path)
             if num_frames < frames_min:
                 continue
 
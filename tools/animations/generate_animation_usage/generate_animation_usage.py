@@ -9,6 +9,9 @@ from pathlib import Path
 import sys
 import tarfile
 
+sys.path.append(str(Path(__file__).resolve().parents[2] / "sequence_generation"))
+from be_seq_csv import parse_be_seq
+
 # Globals
 USAGE_ANIMATIONS_PATH = Path("usage_animations.csv")
 USAGE_SUBJECTS_PATH = Path("usage_subjects.csv")
@@ -20,7 +23,7 @@ def process_tgz_gt(animation_usage, source_root):
     for tgz_filepath in tgz_filepaths:
         print(f"Processing: {tgz_filepath}", file=sys.stderr)
 
-        csv_data = []
+        csv_data = ""
         with tarfile.open(tgz_filepath, "r:gz") as tar:
             try:
                 centersubframe = ""
@@ -33,7 +36,7 @@ def process_tgz_gt(animation_usage, source_root):
 
                 if file:
                     file_contents = file.read().decode("utf-8")
-                    csv_data = file_contents.split("\n")
+                    csv_data = file_contents
 
             except KeyError:
                 print(f"ERROR: {renderjob}/be_seq.csv not found in the archive")
@@ -44,15 +47,17 @@ def process_tgz_gt(animation_usage, source_root):
     return True
 
 def process_csv_data(animation_usage, renderjob, csv_data):
-    for line in csv_data:
-        if len(line) == 0:
-            continue
+    try:
+        be_seq = parse_be_seq(csv_data)
+    except ValueError as e:
+        print(f"ERROR: {renderjob}/{e}", file=sys.stderr)
+        sys.exit(1)
 
-        data = line.split(",")
-        if data[1] != "Body":
-            continue
+    if be_seq is None:
+        return True
 
-        animation = data[2]
+    for row in be_seq.get_rows("Body"):
+        animation = be_seq.body[row]
 
         if animation not in animation_usage:
             animation_usage[animation] = { "count": 1, "renderjobs": [renderjob] }
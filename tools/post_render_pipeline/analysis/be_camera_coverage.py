@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Camera parameter coverage summary over multiple render jobs
+#
+# Camera ground truth CSVs (ground_truth/meta_exr_csv) of each render job are read once into a columnar
+# store (overview/camera_coverage.npz) together with per-job aggregates: 1D histograms of camera height,
+# distance to nearest body, yaw/pitch/roll and hfov, 2D histograms of parameter pairs, min/max/mean.
+# The store is reused as long as the ground truth files and histogram bins are unchanged, so adding
+# a render job only processes the new job. All jobs are summed into one text report and one PNG overview.
+#
+# Distance to body is measured from the camera to the nearest body placement location in be_seq.csv
+# of the render job (root translation of the animation is not applied). It is NaN if be_seq.csv is missing.
+#
+# Requirements:
+#   + matplotlib
+#
+# Usage:
+#   python be_camera_coverage.py REPORT_PATH RENDERJOB_FOLDER [RENDERJOB_FOLDER ...]
+#   python be_camera_coverage.py /mnt/c/bedlam2/coverage.txt /mnt/c/bedlam2/images/job1 /mnt/c/bedlam2/images/job2
+#
+from pathlib import Path
+import sys
+
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "sequence_generation"))
+from be_seq_csv import read_be_seq
+
+COVERAGE_STORE_VERSION = 1
+COVERAGE_STORE_NAME = "camera_coverage.npz" # stored in overview/ folder of render job
+
+# Coverage parameters, name => (min, max, number of bins, label)
+COVERAGE_PARAMETERS = { "height": (0.0, 500.0, 50, "Height [cm]"),
+                        "distance": (0.0, 3000.0, 60, "Distance to body [cm]"),
+                        "yaw": (-180.0, 180.0, 72, "Yaw [deg]"),
+                        "pitch": (-90.0, 90.0, 36, "Pitch [deg]"),
+                        "roll": (-45.0, 45.0, 18, "Roll [deg]"),
+                        "hfov": (0.0, 120.0, 48, "HFOV [deg]") }
+
+COVERAGE_PAIRS = [ ("distance", "height"), ("distance", "hfov"), ("height", "pitch"), ("yaw", "pitch") ]
+
+# Camera ground truth CSV columns stored in columnar store, distance is computed
+CAMERA_GT_COLUMNS = ["x", "y", "z", "yaw", "pitch", "roll", "focal_length", "hfov"]
+
+################################################################################
+# Columnar store
+################################################################################
+
+def get_bin_edges(name):
+    (value_min, value_max, num_bins, _label) = COVERAGE_PARAMETERS[name]
+    return np.linspace(value_min, value_max, num_bins + 1)
+
+def get_source_signature(renderjob_path):
+    """
+    Source file name, modification time and size of all ground truth files used for render job
+    """
+    gt_path = renderjob_path / "ground_truth" / "meta_exr_csv"
+    source_paths = sorted(gt_path.glob("*_camera.csv"))
+    be_seq_path = renderjob_path / "be_seq.csv"
+    if be_seq_path.exists():
+        source_paths.append(be_seq_path)
+
+    signature = []
+    for source_path in source_paths:
+        stat = source_path.stat()
+        signature.append(f"{source_path.name}:{stat.st_mtime_ns}:{stat.st_size}")
+
+    return np.array(signature, dtype=str)
+
+def get_bins_signature():
+    return np.array([f"{name}:{value_min}:{value_max}:{num_bins}" for (name, (value_min, value_max, num_bins, _label)) in COVERAGE_PARAMETERS.items()]
+                    + [f"{name_x}:{name_y}" for (name_x, name_y) in COVERAGE_PAIRS], dtype=str)
+
+def load_camera_gt(camera_gt_path):
+    with open(camera_gt_path, mode="r") as csv_file:
+        header = csv_file.readline().strip().split(",")
+        usecols = [header.index(column) for column in CAMERA_GT_COLUMNS]
+        values = np.loadtxt(csv_file, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+
+    return values
+
+def load_body_locations(renderjob_path):
+    """
+    Body placement locations per sequence, sequence name => (B, 3) [cm]
+    """
+    be_seq_path = renderjob_path / "be_seq.csv"
+    if not be_seq_path.exists():
+        print(f"WARNING: be_seq.csv not found, no distance to body data: {be_seq_path}", file=sys.stderr)
+        return {}
+
+    be_seq = read_be_seq(be_seq_path)
+    body_locations = {}
+    for sequence_name in be_seq.sequences:
+        body_rows = be_seq.get_sequence_body_rows(sequence_name)
+        body_locations[sequence_name] = be_seq.pose[body_rows.start:body_rows.stop, 0:3]
+
+    return body_locations
+
+def load_columns(renderjob_path):
+    """
+    Camera ground truth of all sequences of render job as columns
+      sequence_names: (S,) str, sequence: (N,) int32 index into sequence_names, frame: (N,) int32, parameter columns: (N,) float32
+    """
+    gt_path = renderjob_path / "ground_truth" / "meta_exr_csv"
+    camera_gt_paths = sorted(gt_path.glob("*_camera.csv"))
+    body_locations = load_body_locations(renderjob_path)
+
+    sequence_names = []
+    sequence = []
+    frame = []
+    values = []
+    distance = []
+    for camera_gt_path in camera_gt_paths:
+        sequence_name = camera_gt_path.name.replace("_camera.csv", "")
+        camera_gt = load_camera_gt(camera_gt_path)
+        num_frames = len(camera_gt)
+
+        sequence.append(np.full(num_frames, len(sequence_names), dtype=np.int32))
+        frame.append(np.arange(num_frames, dtype=np.int32))
+        values.append(camera_gt)
+        sequence_names.append(sequence_name)
+
+        locations = body_locations.get(sequence_name, np.zeros((0, 3)))
+        if len(locations) > 0:
+            delta = camera_gt[:, np.newaxis, 0:3] - locations[np.newaxis, :, :]
+            distance.append(np.sqrt(np.sum(delta * delta, axis=-1)).min(axis=1))
+        else:
+            distance.append(np.full(num_frames, np.nan))
+
+    columns = {}
+    columns["sequence_names"] = np.array(sequence_names, dtype=str)
+    columns["sequence"] = np.concatenate(sequence) if len(sequence) > 0 else np.zeros(0, dtype=np.int32)
+    columns["frame"] = np.concatenate(frame) if len(frame) > 0 else np.zeros(0, dtype=np.int32)
+    values = np.concatenate(values) if len(values) > 0 else np.zeros((0, len(CAMERA_GT_COLUMNS)))
+    for (index, column) in enumerate(CAMERA_GT_COLUMNS):
+        columns[column] = values[:, index].astype(np.float32)
+    columns["distance"] = (np.concatenate(distance) if len(distance) > 0 else np.zeros(0)).astype(np.float32)
+    return columns
+
+def get_parameter_values(columns):
+    """
+    Coverage parameter values from columns, name => (N,) float64
+    """
+    parameters = {}
+    parameters["height"] = columns["z"].astype(np.float64)
+    parameters["distance"] = columns["distance"].astype(np.float64)
+    parameters["yaw"] = (columns["yaw"].astype(np.float64) + 180.0) % 360.0 - 180.0
+    parameters["pitch"] = columns["pitch"].astype(np.float64)
+    parameters["roll"] = (columns["roll"].astype(np.float64) + 180.0) % 360.0 - 180.0
+    parameters["hfov"] = columns["hfov"].astype(np.float64)
+    return parameters
+
+def get_aggregates(columns):
+    """
+    Summable per render job aggregates: histograms, counts, sums, min, max
+    """
+    parameters = get_parameter_values(columns)
+
+    aggregates = {}
+    for (name, values) in parameters.items():
+        valid = values[np.isfinite(values)]
+        aggregates[f"hist_{name}"] = np.histogram(valid, bins=get_bin_edges(name))[0].astype(np.int64)
+        aggregates[f"count_{name}"] = np.int64(len(valid))
+        aggregates[f"sum_{name}"] = np.float64(valid.sum())
+        aggregates[f"min_{name}"] = np.float64(valid.min()) if len(valid) > 0 else np.float64(np.inf)
+        aggregates[f"max_{name}"] = np.float64(valid.max()) if len(valid) > 0 else np.float64(-np.inf)
+
+    for (name_x, name_y) in COVERAGE_PAIRS:
+        (values_x, values_y) = (parameters[name_x], parameters[name_y])
+        valid = np.isfinite(values_x) & np.isfinite(values_y)
+        aggregates[f"hist2d_{name_x}_{name_y}"] = np.histogram2d(values_x[valid], values_y[valid], bins=(get_bin_edges(name_x), get_bin_edges(name_y)))[0].astype(np.int64)
+
+    aggregates["num_sequences"] = np.int64(len(columns["sequence_names"]))
+    aggregates["num_frames"] = np.int64(len(columns["frame"]))
+    return aggregates
+
+def load_renderjob(renderjob_path):
+    """
+    Aggregates of render job from columnar store, store is rebuilt if ground truth or histogram bins changed.
+    Returns (aggregates, updated)
+    """
+    store_path = renderjob_path / "overview" / COVERAGE_STORE_NAME
+    signature = get_source_signature(renderjob_path)
+    bins_signature = get_bins_signature()
+
+    if store_path.exists():
+        try:
+            with np.load(store_path) as store:
+                if ((int(store["version"]) == COVERAGE_STORE_VERSION) and np.array_equal(store["signature"], signature)
+                    and np.array_equal(store["bins_signature"], bins_signature)):
+                    aggregates = { key[len("aggregate_"):]: store[key] for key in store.files if key.startswith("aggregate_") }
+                    return (aggregates, False)
+        except Exception as e:
+            print(f"WARNING: Ignoring invalid coverage store: {store_path} ({e})", file=sys.stderr)
+
+    columns = load_columns(renderjob_path)
+    aggregates = get_aggregates(columns)
+
+    store = { "version": np.int64(COVERAGE_STORE_VERSION), "signature": signature, "bins_signature": bins_signature }
+    store.update({ f"column_{key}": value for (key, value) in columns.items() })
+    store.update({ f"aggregate_{key}": value for (key, value) in aggregates.items() })
+
+    store_path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez(store_path, **store)
+    return (aggregates, True)
+
+def sum_aggregates(aggregates_list):
+    total = {}
+    for aggregates in aggregates_list:
+        for (key, value) in aggregates.items():
+            if key not in total:
+                total[key] = np.array(value)
+            elif key.startswith("min_"):
+                total[key] = np.minimum(total[key], value)
+            elif key.startswith("max_"):
+                total[key] = np.maximum(total[key], value)
+            else:
+                total[key] = total[key] + value
+    return total
+
+################################################################################
+# Report
+################################################################################
+
+def get_report(renderjob_paths, total):
+    lines = []
+    lines.append("Camera parameter coverage")
+    lines.append(f"  Render jobs: {len(renderjob_paths)}")
+    for renderjob_path in renderjob_paths:
+        lines.append(f"    {renderjob_path}")
+    lines.append(f"  Sequences: {int(total['num_sequences'])}")
+    lines.append(f"  Frames: {int(total['num_frames'])}")
+    lines.append("")
+
+    lines.append(f"{'Parameter':<10} {'Frames':>9} {'Min':>9} {'Mean':>9} {'Max':>9} {'Outside':>9} {'Empty bins':>11} {'Bin count range':>17}")
+    for (name, (value_min, value_max, num_bins, _label)) in COVERAGE_PARAMETERS.items():
+        hist = total[f"hist_{name}"]
+        count = int(total[f"count_{name}"])
+        if count == 0:
+            lines.append(f"{name:<10} {0:>9} {'-':>9} {'-':>9} {'-':>9} {'-':>9} {num_bins:>5}/{num_bins:<5} {'-':>17}")
+            continue
+
+        mean = float(total[f"sum_{name}"]) / count
+        outside = count - int(hist.sum())
+        empty = int(np.sum(hist == 0))
+        bin_range = f"{int(hist.min())}-{int(hist.max())}"
+        lines.append(f"{name:<10} {count:>9} {float(total[f'min_{name}']):>9.2f} {mean:>9.2f} {float(total[f'max_{name}']):>9.2f} {outside:>9} {empty:>5}/{num_bins:<5} {bin_range:>17}")
+
+    lines.append("")
+    lines.append("Parameter pair coverage (occupied cells)")
+    for (name_x, name_y) in COVERAGE_PAIRS:
+        hist2d = total[f"hist2d_{name_x}_{name_y}"]
+        lines.append(f"  {name_x:>10} x {name_y:<10} {int(np.sum(hist2d > 0)):>6}/{hist2d.size:<6} ({100.0 * np.mean(hist2d > 0):.1f}%)")
+
+    lines.append("")
+    lines.append("Histograms")
+    for (name, (value_min, value_max, num_bins, label)) in COVERAGE_PARAMETERS.items():
+        hist = total[f"hist_{name}"]
+        edges = get_bin_edges(name)
+        lines.append(f"  {label}")
+        scale = 50.0 / max(1, int(hist.max()))
+        for (index, count) in enumerate(hist):
+            lines.append(f"    {edges[index]:>8.1f} {int(count):>9} {'#' * int(round(count * scale))}")
+
+    return lines
+
+def plot_report(plot_path, total):
+    num_plots = len(COVERAGE_PARAMETERS) + len(COVERAGE_PAIRS)
+    num_columns = 4
+    num_rows = (num_plots + num_columns - 1) // num_columns
+    (figure, axes) = plt.subplots(num_rows, num_columns, figsize=(5 * num_columns, 4 * num_rows))
+    axes = axes.flatten()
+
+    for (index, (name, (value_min, value_max, num_bins, label))) in enumerate(COVERAGE_PARAMETERS.items()):
+        edges = get_bin_edges(name)
+        axes[index].stairs(total[f"hist_{name}"], edges, fill=True)
+        axes[index].set_xlabel(label)
+        axes[index].set_ylabel("Frames")
+
+    for (index, (name_x, name_y)) in enumerate(COVERAGE_PAIRS, start=len(COVERAGE_PARAMETERS)):
+        hist2d = total[f"hist2d_{name_x}_{name_y}"]
+        axes[index].pcolormesh(get_bin_edges(name_x), get_bin_edges(name_y), hist2d.T, cmap="viridis")
+        axes[index].set_xlabel(COVERAGE_PARAMETERS[name_x][3])
+        axes[index].set_ylabel(COVERAGE_PARAMETERS[name_y][3])
+
+    for index in range(num_plots, len(axes)):
+        axes[index].axis("off")
+
+    figure.tight_layout()
+    figure.savefig(plot_path)
+    plt.close(figure)
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        print(f"Usage: {sys.argv[0]} REPORT_PATH RENDERJOB_FOLDER [RENDERJOB_FOLDER ...]", file=sys.stderr)
+        sys.exit(1)
+
+    report_path = Path(sys.argv[1])
+    renderjob_paths = [Path(path) for path in sys.argv[2:]]
+
+    aggregates_list = []
+    for renderjob_path in renderjob_paths:
+        if not (renderjob_path / "ground_truth" / "meta_exr_csv").exists():
+            print(f"ERROR: Camera ground truth files not found: {renderjob_path / 'ground_truth' / 'meta_exr_csv'}", file=sys.stderr)
+            sys.exit(1)
+
+        (aggregates, updated) = load_renderjob(renderjob_path)
+        status = "updated" if updated else "cached"
+        print(f"[INFO] {renderjob_path}: {int(aggregates['num_sequences'])} sequences, {int(aggregates['num_frames'])} frames ({status})", file=sys.stderr)
+        aggregates_list.append(aggregates)
+
+    total = sum_aggregates(aggregates_list)
+
+    print(f"Saving: {report_path}", file=sys.stderr)
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(report_path, "w") as f:
+        for line in get_report(renderjob_paths, total):
+            f.write(f"{line}\n")
+
+    plot_path = report_path.with_suffix(".png")
+    print(f"Saving: {plot_path}", file=sys.stderr)
+    plot_report(plot_path, total)
+
+    sys.exit(0)
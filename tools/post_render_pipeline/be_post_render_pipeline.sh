@@ -17,9 +17,6 @@
 #   + opencv-python-headless 4.12.0.88
 #   + OpenEXR 3.4.4
 #
-#   + if you use extract_layers mode:
-#     + see exr/exr_save_layers.sh for additional requirements
-#
 venv_path="$HOME/.virtualenvs/bedlam2"
 
 echo "Usage: $0 render_output_directory landscape|portrait [extract_layers] [extract_masks]"
@@ -146,12 +143,10 @@ fi
 
 # Extract EXR image render camera ground truth
 if [ -d "$exr_image_folder" ]; then
-    echo "Extracting EXR camera ground truth information"
+    echo "Extracting EXR camera ground truth information (table, JSON, CSV)"
     source "$venv_path/bin/activate"
-    ./exr/exr_save_ground_truth.py "$exr_image_folder" meta_exr 16 > /dev/null
+    ./exr/exr_save_ground_truth.py "$exr_image_folder" meta_exr 16 json csv > /dev/null
     deactivate
-    echo "Generating ground truth CSV from EXR JSON"
-    ./exr/exr_gt_json_to_csv.py "$render_output_directory" meta_exr > /dev/null
 fi
 
 # Generate movies
@@ -171,20 +166,24 @@ fi
 
 # Extract EXR depth render camera ground truth
 if [ -d "$exr_folder" ]; then
-    echo "Extracting EXR depth camera ground truth information"
+    echo "Extracting EXR depth camera ground truth information (table, JSON, CSV)"
     source "$venv_path/bin/activate"
-    ./exr/exr_save_ground_truth.py "$exr_folder" meta_exr_depth 16 > /dev/null
-    deactivate
-    echo "Generating ground truth depth camera CSV from EXR depth JSON"
-    ./exr/exr_gt_json_to_csv.py "$render_output_directory" meta_exr_depth > /dev/null
+    ./exr/exr_save_ground_truth.py "$exr_folder" meta_exr_depth 16 json csv > /dev/null
 
+    # Layers and masks are extracted with one pass over the EXR files
+    exr_outputs=""
     if [ "$extract_layers" -eq 1 ]; then
         echo "Extracting EXR layers to exr_layers/ folder"
-        ./exr/exr_save_layers.sh "$exr_folder" 12 > /dev/null
+        exr_outputs="$exr_outputs layers"
     fi
 
     if [ "$extract_masks" -eq 1 ]; then
         echo "Extracting body segmentation masks to exr_layers/masks/ folder"
-        ./exr/exr_save_masks.py "$exr_folder" 16 > /dev/null
+        exr_outputs="$exr_outputs masks"
     fi
+
+    if [ -n "$exr_outputs" ]; then
+        ./exr/exr_save_layers.py "$exr_folder" 16 $exr_outputs > /dev/null
+    fi
+    deactivate
 fi
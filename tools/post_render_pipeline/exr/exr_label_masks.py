@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Segmentation label maps written by exr_save_masks.py in labels mode
+#
+# One greyscale PNG per frame (<frame>_labels.png) stores the mask value of every pixel instead of one binary PNG per mask.
+# 8-bit PNG is used if all mask values fit, 16-bit PNG otherwise.
+#   + 0: no mask
+#   + 1: environment (env)
+#   + 2 + 3 * actor_index + item_index: actor body/clothing/hair (NN_body, NN_clothing, NN_hair)
+# Each sequence folder contains a JSON legend (<sequence>_labels.json) with the mask values found in the sequence,
+# their mask names and the manifest names of the actors.
+#
+# Binary masks are rebuilt from the label maps with get_masks() or with this script.
+# Output matches the per-mask PNGs of the default mode: environment mask is always written, actor masks only if visible.
+#
+# Requirements:
+# + OpenCV (4.10.0.84)
+#   + Installation: pip install opencv-python-headless
+#
+# Usage:
+#   python exr_label_masks.py LABELS_DIR   # rebuild binary mask PNGs next to all label maps in directory
+#   python exr_label_masks.py /path/to/render/output/dir/exr_layers/masks
+#
+
+import json
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+MASK_ITEMS = ["body", "clothing", "hair"]
+ENV_MASK_VALUE = 1
+LABELS_SUFFIX = "_labels.png"
+
+def get_mask_value(actor_index, item):
+    return 2 + len(MASK_ITEMS) * actor_index + MASK_ITEMS.index(item)
+
+def get_mask_name(mask_value):
+    if mask_value == ENV_MASK_VALUE:
+        return "env"
+
+    (actor_index, item_index) = divmod(mask_value - 2, len(MASK_ITEMS))
+    return f"{actor_index:02}_{MASK_ITEMS[item_index]}"
+
+def load_legend(legend_path):
+    """
+    Legend of label maps of one sequence, mask value => mask name
+    """
+    with open(legend_path, "r") as f:
+        legend = json.load(f)
+
+    return { int(mask_value): mask_name for (mask_value, mask_name) in legend["masks"].items() }
+
+def load_labels(labels_path):
+    labels = cv2.imread(str(labels_path), cv2.IMREAD_UNCHANGED)
+    if labels is None:
+        print(f"ERROR: Cannot read label map: {labels_path}", file=sys.stderr)
+    return labels
+
+def get_masks(labels, mask_values=None):
+    """
+    Binary masks (uint8, 0/255) from label map, mask name => mask
+      mask_values: mask values to extract, default is environment mask and all actor masks present in label map
+    """
+    if mask_values is None:
+        present = np.flatnonzero(np.bincount(labels.ravel()))
+        mask_values = sorted(set(present[present > ENV_MASK_VALUE].tolist()) | { ENV_MASK_VALUE })
+
+    masks = {}
+    for mask_value in mask_values:
+        mask = (labels == mask_value).astype(np.uint8)
+        mask *= 255
+        masks[get_mask_name(mask_value)] = mask
+
+    return masks
+
+def save_masks(labels_path):
+    labels = load_labels(labels_path)
+    if labels is None:
+        return False
+
+    for (mask_name, mask) in get_masks(labels).items():
+        output_path = str(labels_path).replace(LABELS_SUFFIX, f"_{mask_name}.png")
+        print(f"  Saving: {output_path}")
+        cv2.imwrite(output_path, mask, [cv2.IMWRITE_PNG_COMPRESSION, 9]) # write as greyscale PNG with max compression
+
+    return True
+
+################################################################################
+# Main
+################################################################################
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: %s LABELS_DIR" % (sys.argv[0]), file=sys.stderr)
+        sys.exit(1)
+
+    labels_dir = Path(sys.argv[1])
+    labels_paths = sorted(labels_dir.rglob(f"*{LABELS_SUFFIX}"))
+    if len(labels_paths) == 0:
+        print(f"ERROR: No label maps found: {labels_dir}", file=sys.stderr)
+        sys.exit(1)
+
+    for labels_path in labels_paths:
+        status = save_masks(labels_path)
+        if not status:
+            sys.exit(1)
+
+    sys.exit(0)
@@ -2,29 +2,31 @@
 # Copyright (c) 2025 Max Planck Society
 # License: https://bedlam2.is.tuebingen.mpg.de/license.html
 #
-# Save camera ground truth (JSON) from Unreal Movie Render Queue raw exr output file
+# Save camera ground truth from Unreal Movie Render Queue raw exr output files
 #
-# Requirements:
-# + OpenEXR (1.3.9)
-#   + Installation
-#     + sudo apt install build-essential
-#     + sudo apt install python3-dev
-#     + sudo apt install libopenexr-dev
-#     + pip install OpenEXR
+# Only the EXR header bytes are parsed, pixel data is not read. All Unreal meta information (unreal/ keys)
+# of a sequence is stored in one columnar table (ground_truth/EXR_TYPE_table/SEQUENCE.npz):
+#   + frames: (F,) str, EXR file names without extension
+#   + numeric_keys: (N,) str and numeric: (F, N) float64, keys with numeric values in all frames, NaN if key is missing in frame
+#   + string_keys: (S,) str and strings: (F, S) str, other keys
+# Load tables with load_ground_truth_table().
+#
+# Optional legacy outputs
+#   + json: per-frame meta JSON (ground_truth/EXR_TYPE/SEQUENCE/FRAME_meta.json)
+#   + csv: per-sequence camera CSV (ground_truth/EXR_TYPE_csv/SEQUENCE_camera.csv), same format as exr_gt_json_to_csv.py
 #
-# + OpenCV (4.7.0.72)
-#   + PNG export
-#   + Installation: pip install opencv-python-headless
+# Requirements:
+# + NumPy
 #
 # References:
-#   + https://github.com/Psyop/Cryptomatte
-#   + https://github.com/Synthesis-AI-Dev/exr-info
+#   + https://openexr.com/en/latest/OpenEXRFileLayout.html
+#
+# Usage:
+#   python exr_save_ground_truth.py INPUT_EXR EXR_TYPE                                  # single file mode, writes legacy meta JSON
+#   python exr_save_ground_truth.py INPUT_EXR_DIR EXR_TYPE [NUM_PROCESSES] [json] [csv]
+#   python exr_save_ground_truth.py /path/to/render/exr_image meta_exr 16 json csv
 #
 
-import OpenEXR
-import Imath
-
-import cv2
 import json
 from multiprocessing import Pool
 import numpy as np
@@ -35,32 +37,73 @@ import time
 
 # Globals
 DEFAULT_PROCESSES = 16
+EXR_MAGIC = 20000630
+HEADER_CHUNK_SIZE = 65536
+LEGACY_OUTPUTS = ["json", "csv"]
 
-def process(input_exr, exr_type):
-    output_dir = input_exr.parent.parent.parent
-    exr = OpenEXR.InputFile(str(input_exr))
+# Camera CSV columns => meta keys, see exr_gt_json_to_csv.py
+CAMERA_CSV_COLUMNS = { "x": "unreal/camera/curPos/x",
+                       "y": "unreal/camera/curPos/y",
+                       "z": "unreal/camera/curPos/z",
+                       "yaw": "unreal/camera/curRot/yaw",
+                       "pitch": "unreal/camera/curRot/pitch",
+                       "roll": "unreal/camera/curRot/roll",
+                       "focal_length": "unreal/camera/FinalImage/focalLength",
+                       "sensor_width": "unreal/camera/FinalImage/sensorWidth",
+                       "sensor_height": "unreal/camera/FinalImage/sensorHeight",
+                       "hfov": "unreal/camera/FinalImage/fov" }
 
-    meta_output_path = output_dir / "ground_truth" / exr_type / input_exr.parent.name / input_exr.name.replace(".exr", "_meta.json")
-    status = process_meta(exr, meta_output_path)
-    if not status:
-        exr.close()
-        return False
+################################################################################
+# EXR header
+################################################################################
 
-    exr.close()
-    return True
+def read_exr_header(exr_path):
+    """
+    Attributes of first EXR header part without reading pixel data, attribute name => (type name, value bytes)
+    """
+    attributes = {}
+    with open(exr_path, "rb") as f:
+        data = bytearray(f.read(HEADER_CHUNK_SIZE))
 
-def process_args(args):
-    return process(*args)
+        def ensure(size):
+            while len(data) < size:
+                chunk = f.read(HEADER_CHUNK_SIZE)
+                if len(chunk) == 0:
+                    raise ValueError("Truncated EXR header")
+                data.extend(chunk)
 
-def process_meta(exr, output_path):
+        def read_string(offset):
+            while True:
+                end = data.find(b"\0", offset)
+                if end >= 0:
+                    return (bytes(data[offset:end]).decode(), end + 1)
+                ensure(len(data) + 1)
 
-    print("Extracting meta information")
-    if (output_path.exists()):
-        print(f"  Skipping. File exists: {output_path}")
-        return True
+        ensure(8)
+        (magic, _version) = struct.unpack_from("<ii", data, 0)
+        if magic != EXR_MAGIC:
+            raise ValueError("Not an EXR file")
+
+        offset = 8
+        while True:
+            (name, offset) = read_string(offset)
+            if name == "":
+                break
+
+            (type_name, offset) = read_string(offset)
+            ensure(offset + 4)
+            (size,) = struct.unpack_from("<i", data, offset)
+            offset += 4
+            ensure(offset + size)
+            attributes[name] = (type_name, bytes(data[offset:offset + size]))
+            offset += size
 
-    header = exr.header()
+    return attributes
 
+def get_meta(header):
+    """
+    Unreal meta information from header attribute values (bytes)
+    """
     meta = {}
     for key in header.keys():
         if key.startswith("unreal/"):
@@ -69,30 +112,182 @@ def process_meta(exr, output_path):
 
             meta[key] = header[key].decode()
 
+    return meta
+
+def read_meta(exr_path):
+    attributes = read_exr_header(exr_path)
+    return get_meta({ name: value for (name, (type_name, value)) in attributes.items() if type_name == "string" })
+
+################################################################################
+# Outputs
+################################################################################
+
+def save_meta_json(meta, output_path):
+    if not output_path.parent.exists():
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    print(f"  Exporting: {output_path}")
+    with open(output_path, "w") as f:
+        json.dump(meta, f, indent=4)
+
+def process_meta(exr, output_path):
+    """
+    Save meta JSON of opened OpenEXR.InputFile, used by exr_save_layers.py
+    """
+    print("Extracting meta information")
+    if (output_path.exists()):
+        print(f"  Skipping. File exists: {output_path}")
+        return True
+
+    meta = get_meta(exr.header())
     if len(meta) == 0:
         print(f"ERROR: No Unreal meta information found in EXR file")
         return False
 
+    save_meta_json(meta, output_path)
+    return True
+
+def get_ground_truth_table(frames, metas):
+    keys = []
+    for meta in metas:
+        for key in meta.keys():
+            if key not in keys:
+                keys.append(key)
+
+    numeric_keys = []
+    numeric = []
+    string_keys = []
+    strings = []
+    for key in keys:
+        values = [meta.get(key, "") for meta in metas]
+        try:
+            numeric.append(np.array([float(value) if value != "" else np.nan for value in values], dtype=np.float64))
+            numeric_keys.append(key)
+        except ValueError:
+            strings.append(np.array(values, dtype=str))
+            string_keys.append(key)
+
+    num_frames = len(frames)
+    table = {}
+    table["frames"] = np.array(frames, dtype=str)
+    table["numeric_keys"] = np.array(numeric_keys, dtype=str)
+    table["numeric"] = np.stack(numeric, axis=1) if len(numeric) > 0 else np.zeros((num_frames, 0))
+    table["string_keys"] = np.array(string_keys, dtype=str)
+    table["strings"] = np.stack(strings, axis=1) if len(strings) > 0 else np.zeros((num_frames, 0), dtype=str)
+    return table
+
+def load_ground_truth_table(table_path):
+    """
+    Columns of ground truth table, key => (F,) array, frame names are stored with key "frames"
+    """
+    columns = {}
+    with np.load(table_path) as table:
+        columns["frames"] = table["frames"]
+        for (index, key) in enumerate(table["numeric_keys"]):
+            columns[str(key)] = table["numeric"][:, index]
+        for (index, key) in enumerate(table["string_keys"]):
+            columns[str(key)] = table["strings"][:, index]
+
+    return columns
+
+def save_camera_csv(frames, metas, output_path):
+    output = []
+    output.append("name," + ",".join(CAMERA_CSV_COLUMNS.keys()))
+    for (frame, meta) in zip(frames, metas):
+        values = [meta[key] for key in CAMERA_CSV_COLUMNS.values()]
+        output.append(f"{frame}.png," + ",".join(values))
+
     if not output_path.parent.exists():
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    print(f"  Exporting: {output_path}")
+    print(f"  Saving: {output_path}")
     with open(output_path, "w") as f:
-        json.dump(meta, f, indent=4)
+        for line in output:
+            f.write(f"{line}\n")
+
+################################################################################
+# Processing
+################################################################################
+
+def process(input_exr, exr_type):
+    """
+    Save legacy meta JSON of single EXR file
+    """
+    output_dir = input_exr.parent.parent.parent
+    meta_output_path = output_dir / "ground_truth" / exr_type / input_exr.parent.name / input_exr.name.replace(".exr", "_meta.json")
+
+    print("Extracting meta information")
+    if (meta_output_path.exists()):
+        print(f"  Skipping. File exists: {meta_output_path}")
+        return True
+
+    meta = read_meta(input_exr)
+    if len(meta) == 0:
+        print(f"ERROR: No Unreal meta information found in EXR file: {input_exr}", file=sys.stderr)
+        return False
+
+    save_meta_json(meta, meta_output_path)
+    return True
+
+def process_sequence(input_exrs, exr_type, outputs):
+    """
+    Save ground truth table and optional legacy outputs of all EXR files of one sequence
+    """
+    sequence_name = input_exrs[0].parent.name
+    output_dir = input_exrs[0].parent.parent.parent / "ground_truth"
+    print(f"Extracting meta information: {sequence_name}")
+
+    frames = []
+    metas = []
+    for input_exr in input_exrs:
+        try:
+            meta = read_meta(input_exr)
+        except (OSError, ValueError) as e:
+            print(f"ERROR: Cannot read EXR header: {input_exr}: {e}", file=sys.stderr)
+            return False
+
+        if len(meta) == 0:
+            print(f"ERROR: No Unreal meta information found in EXR file: {input_exr}", file=sys.stderr)
+            return False
+
+        frames.append(input_exr.name.replace(".exr", ""))
+        metas.append(meta)
+
+        if "json" in outputs:
+            meta_output_path = output_dir / exr_type / sequence_name / input_exr.name.replace(".exr", "_meta.json")
+            if (meta_output_path.exists()):
+                print(f"  Skipping. File exists: {meta_output_path}")
+            else:
+                save_meta_json(meta, meta_output_path)
+
+    table_path = output_dir / f"{exr_type}_table" / f"{sequence_name}.npz"
+    table_path.parent.mkdir(parents=True, exist_ok=True)
+    print(f"  Saving: {table_path}")
+    np.savez(table_path, **get_ground_truth_table(frames, metas))
+
+    if "csv" in outputs:
+        try:
+            save_camera_csv(frames, metas, output_dir / f"{exr_type}_csv" / f"{sequence_name}_camera.csv")
+        except KeyError as e:
+            print(f"ERROR: Missing camera meta information in sequence {sequence_name}: {e}", file=sys.stderr)
+            return False
 
     return True
 
+def process_sequence_args(args):
+    return process_sequence(*args)
+
 def print_usage():
     print("Usage: %s INPUT_EXR TYPE" % (sys.argv[0]), file=sys.stderr) # single file mode, input ends with .exr
-    print("Usage: %s INPUT_EXR_DIR EXR_TYPE [NUM_PROCESSES]" % (sys.argv[0]), file=sys.stderr) # batch mode
-    print("Usage: %s /path/to/render/exr_image meta_exr [NUM_PROCESSES]" % (sys.argv[0]), file=sys.stderr) # batch mode
+    print("Usage: %s INPUT_EXR_DIR EXR_TYPE [NUM_PROCESSES] [json] [csv]" % (sys.argv[0]), file=sys.stderr) # batch mode
+    print("Usage: %s /path/to/render/exr_image meta_exr [NUM_PROCESSES] [json] [csv]" % (sys.argv[0]), file=sys.stderr) # batch mode
 
 
 ################################################################################
 # Main
 ################################################################################
 if __name__ == "__main__":
-    if (len(sys.argv) < 3) or (len(sys.argv) > 4):
+    if len(sys.argv) < 3:
         print_usage()
         sys.exit(1)
 
@@ -100,8 +295,16 @@ if __name__ == "__main__":
     exr_type = sys.argv[2]
 
     processes = DEFAULT_PROCESSES
-    if len(sys.argv) >= 4:
-        processes = int(sys.argv[3])
+    outputs = []
+    for arg in sys.argv[3:]:
+        if arg in LEGACY_OUTPUTS:
+            outputs.append(arg)
+        elif arg.isdigit():
+            processes = int(arg)
+        else:
+            print(f"ERROR: Invalid argument: {arg}", file=sys.stderr)
+            print_usage()
+            sys.exit(1)
 
     batch_mode = False
     if input_exr.is_dir():
@@ -113,15 +316,19 @@ if __name__ == "__main__":
         # Process single EXR file
         results = [process(input_exr, exr_type)]
     else:
-        # Batch mode
+        # Batch mode, each worker processes all frames of a sequence directory
         input_exr_files = sorted(input_exr.rglob("*.exr"))
-        tasklist = []
+        sequences = {} # sequence directory => EXR files
         for input_exr_file in input_exr_files:
-            tasklist.append( (input_exr_file, exr_type) )
+            sequences.setdefault(input_exr_file.parent, []).append(input_exr_file)
+
+        tasklist = []
+        for sequence_exr_files in sequences.values():
+            tasklist.append( (sequence_exr_files, exr_type, outputs) )
 
         print(f"Starting pool with {processes} processes\n")
         pool = Pool(processes)
-        results = pool.map(process_args, tasklist)
+        results = pool.map(process_sequence_args, tasklist, chunksize=1)
 
     if False not in results:
         print("EXR processing finished successfully.", file=sys.stderr)
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Extract layers, segmentation masks and Unreal meta information from multilayer EXR
+# + Each EXR file is opened once and only the channels of missing outputs are read
+# + Existing target layers will be skipped
+# + Can convert single EXR file or use multiprocessing for EXR directory, each worker processes all frames of a sequence
+#
+# Outputs (exr_layers/ and ground_truth/ folders next to EXR folder):
+# + layers
+#   + image: 8-bit RGB PNG (sRGB)
+#   + cameranormal, worldnormal (optional, if channels exist): 8-bit RGB PNG (linear, clamped to [0,1])
+#   + depth: EXR (16-bit float) with Unreal meta information
+# + masks: body segmentation masks, see exr_save_masks.py
+# + labels: body segmentation label maps, see exr_label_masks.py
+# + meta: Unreal meta information (JSON) in ground_truth/meta_exr_depth, see exr_save_ground_truth.py
+#
+# Unreal meta information is only preserved in the depth EXR, PNG layers carry no meta information.
+#
+# Requirements:
+# + OpenEXR (3.4.4)
+# + OpenCV (4.10.0.84)
+#   + PNG export
+#   + Installation: pip install opencv-python-headless
+#
+# Usage:
+#   python exr_save_layers.py INPUT_EXR [OUTPUT ...]
+#   python exr_save_layers.py INPUT_EXR_DIR [NUM_PROCESSES] [OUTPUT ...]    # OUTPUT: layers (default), masks, labels, meta
+#   python exr_save_layers.py /path/to/render/output/dir/exr_depth 16 meta layers masks
+#
+
+import OpenEXR
+import Imath
+
+import cv2
+from multiprocessing import Pool
+import numpy as np
+from pathlib import Path
+import sys
+import time
+
+from exr_save_ground_truth import process_meta
+from exr_save_masks import process_masks, save_legend
+
+# Globals
+DEFAULT_PROCESSES = 16
+META_EXR_TYPE = "meta_exr_depth"
+OUTPUTS = ["layers", "masks", "labels", "meta"]
+
+# PNG layers: type => (channel names, sRGB conversion), optional layers are skipped if channels do not exist
+PNG_LAYERS = { "image": (["R", "G", "B"], True),
+               "cameranormal": ([f"FinalImageMovieRenderQueue_CameraNormal.{channel_id}" for channel_id in ["R", "G", "B"]], False),
+               "worldnormal": ([f"FinalImageMovieRenderQueue_WorldNormal.{channel_id}" for channel_id in ["R", "G", "B"]], False) }
+OPTIONAL_PNG_LAYERS = ["cameranormal", "worldnormal"]
+DEPTH_CHANNEL = "FinalImageMovieRenderQueue_WorldDepth.R"
+
+def process(input_exr, outputs, label_tables):
+    print(f"Processing: '{input_exr}'")
+    output_dir = input_exr.parent.parent.parent
+    sequence_name = input_exr.parent.name
+    output_prefix = input_exr.name.replace(".exr", "")
+
+    exr = OpenEXR.InputFile(str(input_exr))
+
+    status = True
+    if "layers" in outputs:
+        status = process_layers(exr, output_dir / "exr_layers", sequence_name, output_prefix)
+
+    if status and (("masks" in outputs) or ("labels" in outputs)):
+        masks_output_path = output_dir / "exr_layers" / "masks" / sequence_name / input_exr.name
+        status = process_masks(exr, masks_output_path, label_tables, "labels" in outputs)
+
+    if status and ("meta" in outputs):
+        meta_output_path = output_dir / "ground_truth" / META_EXR_TYPE / sequence_name / input_exr.name.replace(".exr", "_meta.json")
+        status = process_meta(exr, meta_output_path)
+
+    exr.close()
+    return status
+
+def process_sequence(input_exrs, outputs):
+    label_tables = {} # cryptomatte manifest SHA-1 digest => label table, see exr_save_masks.py
+    for input_exr in input_exrs:
+        status = process(input_exr, outputs, label_tables)
+        if not status:
+            return False
+
+    if ("labels" in outputs) and (len(label_tables) > 0):
+        sequence_name = input_exrs[0].parent.name
+        legend_path = input_exrs[0].parent.parent.parent / "exr_layers" / "masks" / sequence_name / f"{sequence_name}_labels.json"
+        save_legend(legend_path, label_tables.values())
+
+    return True
+
+def process_sequence_args(args):
+    return process_sequence(*args)
+
+def get_srgb(data):
+    return np.where(data <= 0.0031308, 12.92 * data, 1.055 * np.power(np.maximum(data, 0.0031308), 1.0 / 2.4) - 0.055)
+
+def process_layers(exr, output_root, sequence_name, output_prefix):
+    header = exr.header()
+    image_size = (header["dataWindow"].max.x - header["dataWindow"].min.x + 1, header["dataWindow"].max.y - header["dataWindow"].min.y + 1)
+
+    # Collect channels of missing outputs so that all layers are read with one call
+    png_outputs = []
+    for (layer_type, (channel_names, srgb)) in PNG_LAYERS.items():
+        if any(channel_name not in header["channels"] for channel_name in channel_names):
+            if layer_type not in OPTIONAL_PNG_LAYERS:
+                print(f"ERROR: Missing {layer_type} channels: {channel_names}", file=sys.stderr)
+                return False
+            continue
+
+        output_path = output_root / layer_type / sequence_name / f"{output_prefix}_{layer_type}.png"
+        if output_path.exists():
+            print(f"  Skipping. File exists: '{output_path}'")
+            continue
+
+        png_outputs.append( (output_path, channel_names, srgb) )
+
+    depth_output_path = output_root / "depth" / sequence_name / f"{output_prefix}_depth.exr"
+    if depth_output_path.exists():
+        print(f"  Skipping. File exists: '{depth_output_path}'")
+        depth_output_path = None
+    elif DEPTH_CHANNEL not in header["channels"]:
+        print(f"ERROR: Missing depth channel: {DEPTH_CHANNEL}", file=sys.stderr)
+        return False
+
+    read_channel_names = [channel_name for (_output_path, channel_names, _srgb) in png_outputs for channel_name in channel_names]
+    if depth_output_path is not None:
+        read_channel_names.append(DEPTH_CHANNEL)
+
+    if len(read_channel_names) == 0:
+        return True
+
+    data = exr.channels(read_channel_names, Imath.PixelType(Imath.PixelType.FLOAT))
+    channels = { channel_name: np.frombuffer(data_exr, dtype=np.float32).reshape( (image_size[1], image_size[0]) ) for (channel_name, data_exr) in zip(read_channel_names, data) }
+
+    for (output_path, channel_names, srgb) in png_outputs:
+        # OpenCV expects BGR channel order
+        image_data = np.stack([channels[channel_name] for channel_name in reversed(channel_names)], axis=-1)
+        if srgb:
+            image_data = get_srgb(image_data)
+        image_data = (np.clip(image_data, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        print(f"  Exporting: '{output_path}'")
+        cv2.imwrite(str(output_path), image_data)
+
+    if depth_output_path is not None:
+        depth_header = OpenEXR.Header(image_size[0], image_size[1])
+        depth_header["channels"] = { "Depth": Imath.Channel(Imath.PixelType(Imath.PixelType.HALF)) }
+        depth_header["compression"] = Imath.Compression(Imath.Compression.ZIP_COMPRESSION)
+        for key in header.keys():
+            # Preserve Unreal meta information
+            if key.startswith("unreal/"):
+                depth_header[key] = header[key]
+
+        depth_output_path.parent.mkdir(parents=True, exist_ok=True)
+        print(f"  Exporting: '{depth_output_path}'")
+        depth_exr = OpenEXR.OutputFile(str(depth_output_path), depth_header)
+        depth_exr.writePixels({ "Depth": channels[DEPTH_CHANNEL].astype(np.float16).tobytes() })
+        depth_exr.close()
+
+    return True
+
+def print_usage():
+    print("Usage: %s INPUT_EXR [OUTPUT ...]" % (sys.argv[0]), file=sys.stderr) # single file mode, input ends with .exr
+    print("Usage: %s INPUT_EXR_DIR [NUM_PROCESSES] [OUTPUT ...]" % (sys.argv[0]), file=sys.stderr) # batch mode
+    print("  OUTPUT: %s, default: layers" % (", ".join(OUTPUTS)), file=sys.stderr)
+
+################################################################################
+# Main
+################################################################################
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print_usage()
+        sys.exit(1)
+
+    input_exr = Path(sys.argv[1])
+
+    processes = DEFAULT_PROCESSES
+    outputs = []
+    for arg in sys.argv[2:]:
+        if arg in OUTPUTS:
+            outputs.append(arg)
+        elif arg.isdigit():
+            processes = int(arg)
+        else:
+            print(f"ERROR: Invalid argument: {arg}", file=sys.stderr)
+            print_usage()
+            sys.exit(1)
+
+    if len(outputs) == 0:
+        outputs = ["layers"]
+
+    if ("masks" in outputs) and ("labels" in outputs):
+        print("ERROR: masks and labels output cannot be combined", file=sys.stderr)
+        sys.exit(1)
+
+    batch_mode = False
+    if input_exr.is_dir():
+        batch_mode = True
+
+    start_time = time.perf_counter()
+
+    if not batch_mode:
+        # Process single EXR file
+        results = [process_sequence([input_exr], outputs)]
+    else:
+        # Batch mode, each worker processes all frames of a sequence directory
+        input_exr_files = sorted(input_exr.rglob("*.exr"))
+        sequences = {} # sequence directory => EXR files
+        for input_exr_file in input_exr_files:
+            sequences.setdefault(input_exr_file.parent, []).append(input_exr_file)
+
+        tasklist = []
+        for sequence_exr_files in sequences.values():
+            tasklist.append( (sequence_exr_files, outputs) )
+
+        print(f"Starting pool with {processes} processes\n")
+        pool = Pool(processes)
+        results = pool.map(process_sequence_args, tasklist, chunksize=1)
+
+    if False not in results:
+        print("EXR processing finished successfully.", file=sys.stderr)
+        print(f"  Total conversion time: {(time.perf_counter() - start_time):.1f}s", file=sys.stderr)
+    else:
+        print("ERROR: EXR processing errors.", file=sys.stderr)
+        sys.exit(1)
@@ -3,8 +3,10 @@
 # License: https://bedlam2.is.tuebingen.mpg.de/license.html
 #
 # Export body part segmentation masks (greyscale PNG) from Unreal Movie Render Queue raw 16-bit exr output file
+# Optional labels mode writes one label map per frame instead of one PNG per mask, see exr_label_masks.py
 #
 # Generated EXR needs to be rendered without motion blur and antialiasing so that we have no partial coverage for the body parts and can use binary masks.
+# Object IDs of all pixels are decoded once into manifest labels (sorted ID table, np.searchsorted), all masks of a frame are derived from this label image.
 #
 # Requirements:
 # + OpenEXR (3.4.4)
@@ -27,24 +29,26 @@ import OpenEXR
 import Imath
 
 import cv2
+import hashlib
 import json
 from multiprocessing import Pool
 import numpy as np
 from pathlib import Path
-import struct
 import sys
 import time
 
+from exr_label_masks import MASK_ITEMS, ENV_MASK_VALUE, LABELS_SUFFIX, get_mask_value, get_mask_name
+
 # Globals
 DEFAULT_PROCESSES = 16
 FOLDER_MASK_PREFIX = "BEDLAM/masks/"
 
-def process(input_exr, mask_type):
+def process(input_exr, mask_type, label_tables, output_labels):
     output_dir = input_exr.parent.parent.parent
     exr = OpenEXR.InputFile(str(input_exr))
 
     masks_output_path = output_dir / "exr_layers" / mask_type / input_exr.parent.name / input_exr.name
-    status = process_masks(exr, masks_output_path)
+    status = process_masks(exr, masks_output_path, label_tables, output_labels)
     if not status:
         exr.close()
         return False
@@ -52,13 +56,56 @@ def process(input_exr, mask_type):
     exr.close()
     return True
 
-def process_args(args):
-    return process(*args)
+def process_sequence(input_exrs, mask_type, output_labels=False):
+    """
+    Process EXR files of one sequence. Cryptomatte manifest is identical for all frames of a sequence,
+    it is decoded once and reused for all frames with the same manifest hash.
+    """
+    label_tables = {} # manifest SHA-1 digest => label table
+    for input_exr in input_exrs:
+        status = process(input_exr, mask_type, label_tables, output_labels)
+        if not status:
+            return False
+
+    if output_labels and (len(label_tables) > 0):
+        sequence_name = input_exrs[0].parent.name
+        legend_path = input_exrs[0].parent.parent.parent / "exr_layers" / mask_type / sequence_name / f"{sequence_name}_labels.json"
+        save_legend(legend_path, label_tables.values())
 
-def process_masks(exr, output_path):
+    return True
+
+def save_legend(legend_path, label_tables):
+    """
+    Save label map legend of sequence, existing legend entries of skipped frames are kept
+    """
+    legend = { "masks": {}, "actors": {} }
+    if legend_path.exists():
+        with open(legend_path, "r") as f:
+            legend = json.load(f)
+
+    for (masks, actor_names, _mask_lut, _object_ids, _object_labels) in label_tables:
+        for (mask_value, _mask_names) in masks:
+            legend["masks"][str(mask_value)] = get_mask_name(mask_value)
+        for (actor_index, actor_name) in enumerate(actor_names):
+            legend["actors"][f"{actor_index:02}"] = actor_name
+
+    legend["masks"] = dict(sorted(legend["masks"].items(), key=lambda item: int(item[0])))
+    legend["actors"] = dict(sorted(legend["actors"].items()))
+
+    print(f"  Saving: {legend_path}")
+    with open(legend_path, "w") as f:
+        json.dump(legend, f, indent=4)
+
+def process_sequence_args(args):
+    return process_sequence(*args)
+
+def process_masks(exr, output_path, label_tables, output_labels=False):
 
     print("Extracting segmentation masks")
-    export_path = str(output_path).replace(".exr", "_env.png")
+    if output_labels:
+        export_path = str(output_path).replace(".exr", LABELS_SUFFIX)
+    else:
+        export_path = str(output_path).replace(".exr", "_env.png")
     if (Path(export_path).exists()):
         print(f"  Skipping. File exists: {export_path}")
         return True
@@ -89,28 +136,18 @@ def process_masks(exr, output_path):
     else:
         print(f"  Cryptomatte information found: key={cryptomatte_key}, name={cryptomatte_name}")
 
-    manifest = json.loads(header[f"cryptomatte/{cryptomatte_key}/manifest"])
-    actor_names = []
-    for key in manifest.keys():
-        key = key.replace(FOLDER_MASK_PREFIX, "") # Remove folder name prefix for generated masks from World Partition maps
-        if key.startswith("be_actor_"):
-            actor_name = key.rsplit("_", maxsplit=1)[0]
-            if actor_name not in actor_names:
-                actor_names.append(actor_name)
-
-    actor_names.sort()
+    manifest_data = header[f"cryptomatte/{cryptomatte_key}/manifest"]
+    manifest_digest = hashlib.sha1(manifest_data).digest()
+    if manifest_digest not in label_tables:
+        label_tables[manifest_digest] = get_label_table(json.loads(manifest_data))
+    (masks, actor_names, mask_lut, object_ids, object_labels) = label_tables[manifest_digest]
 
     # Get cryptomatte channel data
     # ID levels: R and B
     # Since we render without motion blur/antialiasing we ignore the coverage values and use simple binary mask
-    data_id = []
-    for layer_index in range(0,3):
-        for channel_id in ["R", "B"]:
-            channel_name = f"ActorHitProxyMask{layer_index:02}.{channel_id}"
-            #print(f"  Loading channel data: {channel_name}")
-            data_exr = exr.channel(channel_name)
-            data_np = np.frombuffer(data_exr, dtype=np.float32)
-            data_id.append(data_np)
+    # All ranks are read with one call, decoding each channel separately decompresses the file multiple times
+    channel_names = [f"ActorHitProxyMask{layer_index:02}.{channel_id}" for layer_index in range(0,3) for channel_id in ["R", "B"]]
+    data_id = [np.frombuffer(data_exr, dtype=np.float32) for data_exr in exr.channels(channel_names)]
 
     """
     # Coverage levels: G and A
@@ -127,95 +164,152 @@ def process_masks(exr, output_path):
     if not output_path.parent.exists():
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Export environment mask
-    mask_names = []
-    for key in manifest.keys():
-        # Append all keys which are not body/clothing/hair
-        if "be_actor_" not in key:
-            mask_names.append(key)
-
-    print(mask_names, export_path)
-    status = export_mask(exr, mask_names, manifest, data_id, image_size, export_path)
-    if not status:
+    # Decode object IDs of all pixels once, all masks are derived from the resulting mask value image
+    labels = decode_labels(data_id, object_ids, object_labels)
+    mask_image = mask_lut[labels].reshape( (image_size[1], image_size[0]) )
+    mask_present = np.bincount(mask_image.ravel(), minlength=max(int(mask_lut.max()), ENV_MASK_VALUE) + 1) > 0
+
+    (env_mask_value, env_mask_names) = masks[0]
+    if (not mask_present[env_mask_value]) and ("default" not in env_mask_names):
         # Default mask should always be generated even if body/clothing fully covers camera which leads to fully black mask.
-        print(f"ERROR: Cannot find data for desired mask names: {mask_names}, {output_path}", file=sys.stderr)
+        print(f"ERROR: Cannot find data for desired mask names: {env_mask_names}, {output_path}", file=sys.stderr)
         return False
 
+    if output_labels:
+        # One label map with mask values instead of binary PNG per mask, see exr_label_masks.py
+        print(f"  Exporting: {export_path}")
+        cv2.imwrite(export_path, mask_image, [cv2.IMWRITE_PNG_COMPRESSION, 9]) # write as greyscale PNG with max compression
+        return True
+
+    # Export environment mask
+    status = export_mask(mask_image, mask_present, env_mask_value, export_path)
+    if not status:
+        # Environment mask might be zero if body/clothing fully covers it. Write black image in this case to ensure that we always have an environment mask.
+        image_data = np.zeros((image_size[1], image_size[0]), dtype=np.uint8)
+        cv2.imwrite(export_path, image_data, [cv2.IMWRITE_PNG_COMPRESSION, 9]) # write as greyscale PNG with max compression
+
     # Export actor masks for body, clothing (optional), hair (optional)
-    for index, actor_name in enumerate(actor_names):
-        for item in ["body", "clothing", "hair"]:
-            mask_name = f"{actor_name}_{item}"
-            folder_mask_name = f"{FOLDER_MASK_PREFIX}{mask_name}"
-            if mask_name in manifest.keys() or folder_mask_name in manifest.keys():
-                if mask_name in manifest.keys():
-                    target_mask_name = mask_name
-                else:
-                    target_mask_name = folder_mask_name
-
-                export_path = str(output_path).replace(".exr", f"_{index:02}_{item}.png")
-                status = export_mask(exr, [target_mask_name], manifest, data_id, image_size, export_path)
-                if not status:
-                    # Actor mask will not exist if actor is out of camera frame. We just issue a warning instead of aborting.
-                    print(f"WARNING: Cannot find body/clothing data for desired mask name (out of camera frame): {target_mask_name}, {output_path}")
+    for (mask_value, mask_names) in masks[1:]:
+        export_path = str(output_path).replace(".exr", f"_{get_mask_name(mask_value)}.png")
+        status = export_mask(mask_image, mask_present, mask_value, export_path)
+        if not status:
+            # Actor mask will not exist if actor is out of camera frame. We just issue a warning instead of aborting.
+            print(f"WARNING: Cannot find body/clothing data for desired mask name (out of camera frame): {mask_names[0]}, {output_path}")
 
     return True
 
-def export_mask(exr, mask_names, manifest, data_id, image_size, output_path):
+def get_label_table(manifest):
+    """
+    Label lookup table for cryptomatte manifest
+      masks: (mask value, manifest names) of environment mask followed by actor masks, mask values see exr_label_masks.py
+      actor_names: sorted actor names, index in list is actor index
+      mask_lut: (num_labels + 1,) uint8/uint16, label => mask value, 0 denotes pixels without known object ID or mask
+      object_ids: sorted float32 bit patterns (uint32) of manifest object IDs for np.searchsorted
+      object_labels: label of each sorted object ID, labels start at 1
+    """
+    manifest_names = list(manifest.keys())
 
-    rank_objectid_binary_mask = None
-    for mask_name in mask_names:
-        print(f"  Exporting: {mask_name}: {output_path}")
+    actor_names = []
+    for key in manifest_names:
+        key = key.replace(FOLDER_MASK_PREFIX, "") # Remove folder name prefix for generated masks from World Partition maps
+        if key.startswith("be_actor_"):
+            actor_name = key.rsplit("_", maxsplit=1)[0]
+            if actor_name not in actor_names:
+                actor_names.append(actor_name)
 
-        # Get object ID in float32 format
-        # Note: Object ID needs to be interpreted as big-endian so that resulting float matches the data in the ID ranks.
-        #       This differs from official spec which uses platform byte-order which would be little-endian.
-        #       A similar approach is taken here: https://github.com/Synthesis-AI-Dev/exr-info/blob/04a51b3b943c05db6a94774c710258070d19e69a/exr_info/cryptomatte.py#L51
-        object_id_hex = manifest[mask_name]
-        object_id_float = struct.unpack(">f", bytes.fromhex(object_id_hex))[0]
+    actor_names.sort()
 
-        num_ranks = len(data_id)
-        for rank_index in range(num_ranks):
-            rank_data_id = data_id[rank_index]
+    # Environment mask contains all keys which are not body/clothing/hair
+    masks = [ (ENV_MASK_VALUE, [key for key in manifest_names if "be_actor_" not in key]) ]
+    mask_values = { key: ENV_MASK_VALUE for key in masks[0][1] }
 
-            # Skip checks if current rank has no data
-            if not np.any(rank_data_id):
+    for index, actor_name in enumerate(actor_names):
+        for item in MASK_ITEMS:
+            mask_name = f"{actor_name}_{item}"
+            folder_mask_name = f"{FOLDER_MASK_PREFIX}{mask_name}"
+            if mask_name in manifest:
+                target_mask_name = mask_name
+            elif folder_mask_name in manifest:
+                target_mask_name = folder_mask_name
+            else:
                 continue
 
-            rank_objectid_found = rank_data_id[:] == object_id_float # Generate binary mask, True if pixel float value matches object id float
+            mask_value = get_mask_value(index, item)
+            masks.append( (mask_value, [target_mask_name]) )
+            mask_values[target_mask_name] = mask_value
 
-            if np.any(rank_objectid_found):
-                if rank_objectid_binary_mask is None:
-                    rank_objectid_binary_mask = rank_objectid_found
-                else:
-                    # OR with current data
-                    rank_objectid_binary_mask = np.logical_or(rank_objectid_binary_mask, rank_objectid_found)
+    # Object ID in float32 format
+    # Note: Object ID needs to be interpreted as big-endian so that resulting float matches the data in the ID ranks.
+    #       This differs from official spec which uses platform byte-order which would be little-endian.
+    #       A similar approach is taken here: https://github.com/Synthesis-AI-Dev/exr-info/blob/04a51b3b943c05db6a94774c710258070d19e69a/exr_info/cryptomatte.py#L51
+    #       Big-endian hex of the float is its bit pattern, so pixel floats are matched by their uint32 view.
+    object_ids = np.array([int(manifest[key], 16) for key in manifest_names], dtype=np.uint32)
+    order = np.argsort(object_ids, kind="stable")
+    object_ids = object_ids[order]
+    object_labels = (order + 1).astype(np.uint32)
 
-                break # we don't process other ranks if we found one since we only handle binary masks
+    mask_dtype = np.uint8 if max(mask_value for (mask_value, _mask_names) in masks) < 256 else np.uint16
+    mask_lut = np.zeros(len(manifest_names) + 1, dtype=mask_dtype)
+    for (label, key) in enumerate(manifest_names, start=1):
+        mask_lut[label] = mask_values.get(key, 0)
 
-    if rank_objectid_binary_mask is not None:
-        image_data = rank_objectid_binary_mask.reshape( (image_size[1], image_size[0]) )
-        image_data = image_data.astype(np.uint8)
-        image_data *= 255
-        cv2.imwrite(output_path, image_data, [cv2.IMWRITE_PNG_COMPRESSION, 9]) # write as greyscale PNG with max compression
-        return True
+    return (masks, actor_names, mask_lut, object_ids, object_labels)
 
-    # Environment mask might be zero if body/clothing fully covers it. Write black image in this case to ensure that we always have an environment mask.
-    if "default" in mask_names:
-        image_data = np.zeros((image_size[1], image_size[0]), dtype=np.uint8)
-        cv2.imwrite(output_path, image_data, [cv2.IMWRITE_PNG_COMPRESSION, 9]) # write as greyscale PNG with max compression
-        return True
+def decode_labels(data_id, object_ids, object_labels):
+    """
+    Label of every pixel from ID ranks, pixels take the label of the first rank with a known object ID
+    """
+    num_pixels = len(data_id[0])
+    labels = np.zeros(num_pixels, dtype=np.uint32)
+    if len(object_ids) == 0:
+        return labels
+
+    unlabeled = None
+    for rank_data_id in data_id:
+        # Skip checks if current rank has no data
+        if not np.any(rank_data_id):
+            continue
+
+        rank_bits = rank_data_id.view(np.uint32)
+        if unlabeled is not None:
+            rank_bits = rank_bits[unlabeled]
+
+        indices = np.searchsorted(object_ids, rank_bits)
+        np.minimum(indices, len(object_ids) - 1, out=indices)
+        found = object_ids[indices] == rank_bits
+
+        if unlabeled is None:
+            labels[found] = object_labels[indices[found]]
+            unlabeled = np.flatnonzero(~found)
+        else:
+            labels[unlabeled[found]] = object_labels[indices[found]]
+            unlabeled = unlabeled[~found]
+
+        if len(unlabeled) == 0:
+            break
+
+    return labels
+
+def export_mask(mask_image, mask_present, mask_value, output_path):
+    if not mask_present[mask_value]:
+        return False
 
-    return False
+    print(f"  Exporting: {output_path}")
+    image_data = (mask_image == mask_value).astype(np.uint8)
+    image_data *= 255
+    cv2.imwrite(output_path, image_data, [cv2.IMWRITE_PNG_COMPRESSION, 9]) # write as greyscale PNG with max compression
+    return True
 
 def print_usage():
-    print("Usage: %s INPUT_EXR" % (sys.argv[0]), file=sys.stderr) # single file mode, input ends with .exr
-    print("Usage: %s INPUT_EXR_DIR [NUM_PROCESSES]" % (sys.argv[0]), file=sys.stderr) # batch mode
+    print("Usage: %s INPUT_EXR [labels]" % (sys.argv[0]), file=sys.stderr) # single file mode, input ends with .exr
+    print("Usage: %s INPUT_EXR_DIR [NUM_PROCESSES] [labels]" % (sys.argv[0]), file=sys.stderr) # batch mode
+    print("  labels: write one label map per frame and legend per sequence instead of binary PNG per mask, see exr_label_masks.py", file=sys.stderr)
 
 ################################################################################
 # Main
 ################################################################################
 if __name__ == "__main__":
-    if (len(sys.argv) < 2) or (len(sys.argv) > 3):
+    if (len(sys.argv) < 2) or (len(sys.argv) > 4):
         print_usage()
         sys.exit(1)
 
@@ -224,8 +318,12 @@ if __name__ == "__main__":
     input_exr = Path(sys.argv[1])
 
     processes = DEFAULT_PROCESSES
-    if len(sys.argv) >= 3:
-        processes = int(sys.argv[2])
+    output_labels = False
+    for arg in sys.argv[2:]:
+        if arg == "labels":
+            output_labels = True
+        else:
+            processes = int(arg)
 
     batch_mode = False
     if input_exr.is_dir():
@@ -235,17 +333,21 @@ if __name__ == "__main__":
 
     if not batch_mode:
         # Process single EXR file
-        results = [process(input_exr, mask_type)]
+        results = [process_sequence([input_exr], mask_type, output_labels)]
     else:
-        # Batch mode
+        # Batch mode, each worker processes all frames of a sequence directory
         input_exr_files = sorted(input_exr.rglob("*.exr"))
-        tasklist = []
+        sequences = {} # sequence directory => EXR files
         for input_exr_file in input_exr_files:
-            tasklist.append( (input_exr_file, mask_type) )
+            sequences.setdefault(input_exr_file.parent, []).append(input_exr_file)
+
+        tasklist = []
+        for sequence_exr_files in sequences.values():
+            tasklist.append( (sequence_exr_files, mask_type, output_labels) )
 
         print(f"Starting pool with {processes} processes\n")
         pool = Pool(processes)
-        results = pool.map(process_args, tasklist)
+        results = pool.map(process_sequence_args, tasklist, chunksize=1)
 
     if False not in results:
         print("EXR processing finished successfully.", file=sys.stderr)
@@ -0,0 +1,208 @@
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Continuous geometry collision tests for body ground trajectories
+#
+# Ground trajectories are represented as simplified 2D polylines where every
+# segment is a capsule with the body radius. Placed capsules are stored in a
+# uniform grid spatial hash so that collision tests are independent of image
+# resolution and stage size.
+#
+# Coordinates: Unreal ground plane (X, Y) [cm]
+#
+import cv2
+import numpy as np
+
+################################################################################
+# Helper functions
+################################################################################
+
+def simplify_polyline(points, tolerance):
+    """
+    Ramer-Douglas-Peucker simplification of (N, 2) polyline. Every removed point is within tolerance of the simplified polyline.
+    """
+    if len(points) < 3:
+        return points
+
+    keep = np.zeros(len(points), dtype=bool)
+    keep[0] = True
+    keep[-1] = True
+    stack = [ (0, len(points) - 1) ]
+    while len(stack) > 0:
+        (start, end) = stack.pop()
+        if end - start < 2:
+            continue
+
+        distances = get_point_segment_distances(points[start+1:end], points[start], points[end])
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = start + 1 + index
+            keep[split] = True
+            stack.append( (start, split) )
+            stack.append( (split, end) )
+
+    return points[keep]
+
+def get_point_segment_distances(points, segments_start, segments_end):
+    """
+    Elementwise distances between points and segments, arguments are broadcast (..., 2) arrays
+    """
+    direction = segments_end - segments_start
+    length_squared = np.sum(direction * direction, axis=-1)
+    length_squared = np.where(length_squared > 0, length_squared, 1.0)
+
+    t = np.clip(np.sum((points - segments_start) * direction, axis=-1) / length_squared, 0.0, 1.0)
+    closest = segments_start + t[..., np.newaxis] * direction
+    return np.linalg.norm(points - closest, axis=-1)
+
+def get_orientations(a, b, c):
+    return (b[..., 0] - a[..., 0]) * (c[..., 1] - a[..., 1]) - (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0])
+
+def get_segment_distances(a_start, a_end, b_start, b_end):
+    """
+    Elementwise minimum distances between segments A and segments B, arguments are broadcast (..., 2) arrays
+    """
+    distances = np.minimum(
+        np.minimum(get_point_segment_distances(a_start, b_start, b_end), get_point_segment_distances(a_end, b_start, b_end)),
+        np.minimum(get_point_segment_distances(b_start, a_start, a_end), get_point_segment_distances(b_end, a_start, a_end))
+    )
+
+    # Proper intersections have distance zero but endpoints can be far away from other segment
+    intersecting = ( (get_orientations(a_start, a_end, b_start) * get_orientations(a_start, a_end, b_end) < 0) &
+                     (get_orientations(b_start, b_end, a_start) * get_orientations(b_start, b_end, a_end) < 0) )
+    return np.where(intersecting, 0.0, distances)
+
+def transform_polyline(points, x, y, yaw):
+    """
+    Rotate body local polyline (N, 2) by Unreal yaw [deg] around origin and translate to (x, y) [cm].
+    Unreal yaw is left-handed, positive yaw rotates X-axis towards Y-axis.
+    """
+    yaw = np.radians(yaw)
+    cos_yaw = np.cos(yaw)
+    sin_yaw = np.sin(yaw)
+    R = np.array([[cos_yaw, -sin_yaw],
+                  [sin_yaw,  cos_yaw]])
+    return points @ R.T + np.array([x, y])
+
+def get_polyline_segments(points):
+    if len(points) == 1:
+        return (points, points)
+    return (points[:-1], points[1:])
+
+def is_inside_rectangle(points, radius, x_min, x_max, y_min, y_max):
+    """
+    Check if all capsules of polyline are inside axis-aligned rectangle. Rectangle is convex so testing vertices is sufficient.
+    """
+    (points_min, points_max) = (points.min(axis=0), points.max(axis=0))
+    return bool( (points_min[0] - radius >= x_min) and (points_max[0] + radius <= x_max) and
+                 (points_min[1] - radius >= y_min) and (points_max[1] + radius <= y_max) )
+
+def densify_polyline(points, spacing):
+    """
+    Insert points so that consecutive polyline points are at most spacing apart
+    """
+    if len(points) < 2:
+        return points
+
+    (segments_start, segments_end) = get_polyline_segments(points)
+    lengths = np.linalg.norm(segments_end - segments_start, axis=1)
+    steps = np.maximum(np.ceil(lengths / spacing).astype(int), 1)
+    segment_indices = np.repeat(np.arange(len(steps)), steps)
+    t = (np.arange(len(segment_indices)) - np.repeat(np.cumsum(steps) - steps, steps)) / steps[segment_indices]
+    densified = segments_start[segment_indices] + t[:, np.newaxis] * (segments_end - segments_start)[segment_indices]
+    return np.concatenate((densified, points[-1:]))
+
+class MaskDistanceField:
+    """
+    Distance field of occupied pixels in stage occupancy mask. Image rows correspond to Unreal -X, columns to Unreal Y, image center is stage origin.
+    """
+    def __init__(self, mask, pixel_size):
+        self.pixel_size = pixel_size
+        self.center = ( (mask.shape[0] - 1) / 2, (mask.shape[1] - 1) / 2 )
+        # Distance of free pixel centers to nearest occupied pixel border
+        self.distances = cv2.distanceTransform((mask == 0).astype(np.uint8), cv2.DIST_L2, cv2.DIST_MASK_PRECISE) * pixel_size - pixel_size / 2
+        self.distances[mask > 0] = -pixel_size / 2
+
+    def intersects(self, points, radius):
+        points = densify_polyline(points, self.pixel_size / 2)
+        rows = np.round(self.center[0] - points[:, 0] / self.pixel_size).astype(int)
+        columns = np.round(self.center[1] + points[:, 1] / self.pixel_size).astype(int)
+        inside = (rows >= 0) & (rows < self.distances.shape[0]) & (columns >= 0) & (columns < self.distances.shape[1])
+        return bool(np.any(self.distances[rows[inside], columns[inside]] < radius))
+
+class CapsuleSpatialHash:
+    """
+    Uniform grid spatial hash of capsules (segment + radius).
+    Capsules can optionally be assigned to a time bucket, capsules in different time buckets never intersect.
+    """
+    def __init__(self, cell_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.segments_start = np.zeros((0, 2))
+        self.segments_end = np.zeros((0, 2))
+        self.radii = np.zeros(0)
+
+    def __len__(self):
+        return len(self.radii)
+
+    def get_cell_ranges(self, segments_start, segments_end, radius):
+        cell_min = np.floor((np.minimum(segments_start, segments_end) - radius) / self.cell_size).astype(int)
+        cell_max = np.floor((np.maximum(segments_start, segments_end) + radius) / self.cell_size).astype(int)
+        return (cell_min, cell_max)
+
+    def insert(self, segments_start, segments_end, radius, time_bucket=None):
+        (cell_min, cell_max) = self.get_cell_ranges(segments_start, segments_end, radius)
+        offset = len(self.radii)
+        for index in range(len(segments_start)):
+            for cell_x in range(cell_min[index, 0], cell_max[index, 0] + 1):
+                for cell_y in range(cell_min[index, 1], cell_max[index, 1] + 1):
+                    self.cells.setdefault( (cell_x, cell_y, time_bucket), []).append(offset + index)
+
+        self.segments_start = np.concatenate((self.segments_start, segments_start))
+        self.segments_end = np.concatenate((self.segments_end, segments_end))
+        self.radii = np.concatenate((self.radii, np.full(len(segments_start), radius, dtype=float)))
+
+    def get_candidates(self, segments_start, segments_end, radius, time_bucket=None):
+        (cell_min, cell_max) = self.get_cell_ranges(segments_start, segments_end, radius)
+
+        # Unique cells covered by query capsules, capsules usually only cover few neighboring cells
+        (span_x, span_y) = np.max(cell_max - cell_min, axis=0)
+        cells = []
+        for offset_x in range(span_x + 1):
+            for offset_y in range(span_y + 1):
+                cell = cell_min + (offset_x, offset_y)
+                cells.append(cell[np.all(cell <= cell_max, axis=1)])
+        cells = np.unique(np.concatenate(cells), axis=0)
+
+        candidates = [ self.cells[key] for key in ( (cell_x, cell_y, time_bucket) for (cell_x, cell_y) in cells.tolist() ) if key in self.cells ]
+        if len(candidates) == 0:
+            return np.zeros(0, dtype=int)
+        return np.unique(np.concatenate(candidates))
+
+    def intersects(self, segments_start, segments_end, radius, time_bucket=None):
+        """
+        Check if any of the given capsules overlaps with stored capsules of same time bucket
+        """
+        candidates = self.get_candidates(segments_start, segments_end, radius, time_bucket)
+        if len(candidates) == 0:
+            return False
+
+        # Exact distance tests only for capsule pairs with overlapping bounding boxes
+        query_min = (np.minimum(segments_start, segments_end) - radius)[:, np.newaxis, :]
+        query_max = (np.maximum(segments_start, segments_end) + radius)[:, np.newaxis, :]
+        candidates_radius = self.radii[candidates][:, np.newaxis]
+        candidates_min = (np.minimum(self.segments_start[candidates], self.segments_end[candidates]) - candidates_radius)[np.newaxis, :, :]
+        candidates_max = (np.maximum(self.segments_start[candidates], self.segments_end[candidates]) + candidates_radius)[np.newaxis, :, :]
+        (query_indices, candidate_indices) = np.nonzero(np.all((query_min <= candidates_max) & (candidates_min <= query_max), axis=2))
+        if len(query_indices) == 0:
+            return False
+
+        candidate_indices = candidates[candidate_indices]
+        distance_min = radius + self.radii[candidate_indices]
+
+        # Overlapping segment start points are a cheap early out for dense placements
+        if np.any(np.linalg.norm(segments_start[query_indices] - self.segments_start[candidate_indices], axis=1) < distance_min):
+            return True
+
+        distances = get_segment_distances(segments_start[query_indices], segments_end[query_indices], self.segments_start[candidate_indices], self.segments_end[candidate_indices])
+        return bool(np.any(distances < distance_min))
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Binary cache of parsed configuration files for sequence generation tools
+#
+# Parsed whitelists, texture lists, statistics CSVs and stage occupancy masks
+# are stored together in one pickle file which is read once on startup.
+# Entries are keyed by source path and parser and are invalidated when the
+# source file content changes. Modification time and size are checked first,
+# the content hash is only computed if they differ.
+#
+# Usage:
+#   python be_config_cache.py CACHE_PATH      # show cache entries
+#   python be_config_cache.py CACHE_PATH clear
+#
+import csv
+import hashlib
+import json
+import os
+from pathlib import Path
+import pickle
+import sys
+
+CONFIG_CACHE_VERSION = 1
+
+################################################################################
+# Parsers
+################################################################################
+
+def read_json(path):
+    with open(path) as f:
+        return json.load(f)
+
+def read_lines(path):
+    with open(path) as f:
+        return f.read().splitlines()
+
+def read_csv_dicts(path):
+    with open(path, mode="r") as f:
+        return list(csv.DictReader(f))
+
+def read_csv_rows(path):
+    with open(path, mode="r") as f:
+        return list(csv.reader(f))
+
+def read_image_grayscale(path):
+    import cv2 # only needed for stage occupancy masks, camera tools do not depend on OpenCV
+    return cv2.imread(str(path), cv2.IMREAD_GRAYSCALE)
+
+################################################################################
+# Cache
+################################################################################
+
+def get_file_digest(path):
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+class ConfigCache:
+    """
+    Parsed configuration data keyed by (source path, parser name). Values are stored pickled so that
+    callers can modify returned data without changing the cached entry.
+    """
+    def __init__(self, cache_path):
+        self.cache_path = Path(cache_path)
+        self.entries = {}
+        self.modified = False
+
+        if self.cache_path.exists():
+            try:
+                with open(self.cache_path, "rb") as f:
+                    cache = pickle.load(f)
+                if cache.get("version") == CONFIG_CACHE_VERSION:
+                    self.entries = cache["entries"]
+            except Exception as e:
+                print(f"WARNING: Ignoring invalid config cache: {self.cache_path} ({e})", file=sys.stderr)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def load(self, path, parser):
+        """
+        Return parsed data of source file, source is only parsed if it is not cached or has changed
+        """
+        path = Path(path)
+        key = f"{path.resolve()}:{parser.__name__}"
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+
+        entry = self.entries.get(key, None)
+        if entry is not None:
+            (entry_signature, entry_digest, data) = entry
+            if entry_signature == signature:
+                return pickle.loads(data)
+
+            # Modification time changed, check if content changed as well
+            digest = get_file_digest(path)
+            if digest == entry_digest:
+                self.entries[key] = (signature, digest, data)
+                self.modified = True
+                return pickle.loads(data)
+
+        value = parser(path)
+        self.entries[key] = (signature, get_file_digest(path), pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        self.modified = True
+        return value
+
+    def save(self):
+        if not self.modified:
+            return
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write to temporary file first so that concurrent runs never read partial cache
+        temp_path = self.cache_path.with_name(f"{self.cache_path.name}.{os.getpid()}.tmp")
+        with open(temp_path, "wb") as f:
+            pickle.dump({ "version": CONFIG_CACHE_VERSION, "entries": self.entries }, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, self.cache_path)
+        self.modified = False
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if (len(sys.argv) < 2) or (len(sys.argv) > 3) or ((len(sys.argv) == 3) and (sys.argv[2] != "clear")):
+        print(f"Usage: {sys.argv[0]} CACHE_PATH [clear]", file=sys.stderr)
+        sys.exit(1)
+
+    cache_path = Path(sys.argv[1])
+
+    if len(sys.argv) == 3:
+        if cache_path.exists():
+            print(f"Removing: {cache_path}", file=sys.stderr)
+            cache_path.unlink()
+        sys.exit(0)
+
+    cache = ConfigCache(cache_path)
+    for (key, (signature, digest, data)) in sorted(cache.entries.items()):
+        print(f"{key}: {len(data)} bytes, sha1={digest}")
+    print(f"[INFO] {len(cache)} entries", file=sys.stderr)
+
+    sys.exit(0)
@@ -5,204 +5,147 @@
 # Generate keyframes for camera movement during sequence
 #
 
-import csv
 import json
 from math import sin, cos, tan, radians, atan, degrees
+import numpy as np
 from pathlib import Path
 import random
 import sys
 
 from be_generate_camera_animations_config import *
+from be_config_cache import ConfigCache, read_csv_dicts
+from be_keyframe_reduction import reduce_keyframes
+from be_seq_csv import read_be_seq
+from be_validate_camera_visibility import get_animation_cache, get_invisible_sequences, validate_camera_visibility
+from be_validate_camera_visibility_config import SMPLX_NPZ_ANIMATION_FOLDER, TRAJECTORY_INDEX_PATH
+from be_sampling import ParameterSampler, get_range_index, get_range_value, print_coverage_report
+from be_vcam_store import VCamCaptureStore
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "unreal" / "render" / "Core" / "Python"))
+from be_camera_animations_bin import write_camera_animations_sidecar
 
 ################################################################################
 
-def read_csv(csv_path):
+# Unit hypercube dimensions of sampled camera parameters, see be_sampling.py
+SAMPLING_PARAMETERS = ["hfov", "camera_height", "follow_camera_yaw_offset", "distance", "theta", "phi", "camera_local_y", "camera_local_z"]
+
+def read_csv(be_seq):
     sequences = {}
 
-    with open(csv_path, mode="r") as csv_file:
-        csv_reader = csv.DictReader(csv_file)
-        csv_rows = list(csv_reader)
-
-        use_body = False
-        sequence_name = None
-
-        for row in csv_rows:
-            sequence_frames = 0
-            camera_hfov = 0.0
-            cameraroot_x = 0.0
-            cameraroot_y = 0.0
-            cameraroot_z = 0.0
-            cameraroot_yaw = 0.0
-            ground_height_world = 0.0
-
-            if row["Type"] == "Body":
-                if use_body:
-                    body = row["Body"]
-                    yaw = float(row["Yaw"])
-                    sequence = sequences[sequence_name]
-                    sequence["body"] = body
-                    sequence["body_yaw"] = yaw
-                    use_body = False # record only first body
-
-            if row["Type"] == "Group":
-                # Parse group configuration
-                values = row["Comment"].split(";")
-                dict_keys = []
-                dict_values = []
-                for value in values:
-                    dict_keys.append(value.split("=")[0])
-                    dict_values.append(value.split("=")[1])
-                group_config = dict(zip(dict_keys, dict_values))
-
-                sequence_name = group_config["sequence_name"]
-                sequence_frames = int(group_config["frames"])
-                camera_hfov = float(group_config["camera_hfov"])
-
-                if "cameraroot_x" in group_config:
-                    cameraroot_x = float(group_config["cameraroot_x"])
-                    cameraroot_y = float(group_config["cameraroot_y"])
-                    cameraroot_z = float(group_config["cameraroot_z"])
-
-                if "cameraroot_yaw" in group_config:
-                    cameraroot_yaw = float(group_config["cameraroot_yaw"])
-
-                if "ground_height_world" in group_config:
-                    ground_height_world = float(group_config["ground_height_world"])
-
-                sequence = {}
-                sequence["frames"] = sequence_frames
-                sequence["hfov"] = camera_hfov
-                sequence["cameraroot"] = { "x": cameraroot_x, "y": cameraroot_y, "z": cameraroot_z, "yaw": cameraroot_yaw }
-                sequence["ground_height_world"] = ground_height_world
-                x = float(row["X"])
-                y = float(row["Y"])
-                z = float(row["Z"])
-                yaw = float(row["Yaw"])
-                pitch = float(row["Pitch"])
-                roll = float(row["Roll"])
-                sequence["camera"] = { "x": x, "y": y, "z": z, "yaw": yaw, "pitch": pitch, "roll": roll }
-
-                camera_range_max = -1.0
-                if "camera_radius_max" in group_config:
-                    camera_range_max = float(group_config["camera_radius_max"])
-                sequence["camera_radius_max"] = camera_range_max
-
-                camera_height_min = -1.0
-                if "camera_height_min" in group_config:
-                    camera_height_min = float(group_config["camera_height_min"])
-                sequence["camera_height_min"] = camera_height_min
-
-                camera_height_max = -1.0
-                if "camera_height_max" in group_config:
-                    camera_height_max = float(group_config["camera_height_max"])
-                sequence["camera_height_max"] = camera_height_max
-
-                if "theta_min" in group_config:
-                    theta_min = float(group_config["theta_min"])
-                    sequence["theta_min"] = theta_min
-                    theta_max = float(group_config["theta_max"])
-                    sequence["theta_max"] = theta_max
-
-                sequences[sequence_name] = sequence
-
-                use_body = True # log data of first body
+    # Only Group rows and first Body rows are converted
+    group_poses = be_seq.get_row_poses(be_seq.groups).tolist()
+    body_rows = [be_seq.body_rows[group_row] for group_row in be_seq.groups]
+    body_yaws = be_seq.get_row_poses([rows.start for rows in body_rows if len(rows) > 0])[:, 3].tolist()
+    body_index = 0
 
-    return sequences
+    for (group_row, (x, y, z, yaw, pitch, roll), rows) in zip(be_seq.groups, group_poses, body_rows):
+        # Group configuration
+        group_config = be_seq.attributes[group_row]
 
-def get_random_location(config, last_distance=None, last_theta=None, last_phi=None, last_camera_local_y=None, last_camera_local_z=None):
-    c = config
-    if last_distance is None:
-        distance = random.uniform(c.distance_min, c.distance_max)
-
-        theta_min = None
-        theta_max = None
-        if len(c.theta_ranges) == 0:
-            theta_min = c.theta_min
-            theta_max = c.theta_max
-        else:
-            (theta_min, theta_max) = random.choice(c.theta_ranges)
-        theta = random.uniform(theta_min, theta_max)
+        sequence_name = group_config["sequence_name"]
 
-        phi = random.uniform(c.phi_min, c.phi_max)
-        camera_local_y = random.uniform(c.camera_local_y_min, c.camera_local_y_max)
-        camera_local_z = random.uniform(c.camera_local_z_min, c.camera_local_z_max)
-    else:
+        sequence = {}
+        sequence["frames"] = int(group_config["frames"])
+        sequence["hfov"] = float(group_config["camera_hfov"])
+        sequence["cameraroot"] = { "x": float(group_config.get("cameraroot_x", 0.0)), "y": float(group_config.get("cameraroot_y", 0.0)), "z": float(group_config.get("cameraroot_z", 0.0)), "yaw": float(group_config.get("cameraroot_yaw", 0.0)) }
+        sequence["ground_height_world"] = float(group_config.get("ground_height_world", 0.0))
+        sequence["camera"] = { "x": x, "y": y, "z": z, "yaw": yaw, "pitch": pitch, "roll": roll }
 
-        valid_distance = False
-        while not valid_distance:
-            delta = random.uniform(c.distance_mindelta, c.distance_maxdelta) * random.choice([-1.0, 1.0])
-
-            distance = last_distance + delta
-            if c.distance_min <= distance <= c.distance_max:
-                valid_distance = True
-
-        delta = random.uniform(c.theta_mindelta, c.theta_maxdelta) * random.choice([-1.0, 1.0])
-        theta = last_theta + delta
-
-        valid_phi = False
-        while not valid_phi:
-            delta = random.uniform(c.phi_mindelta, c.phi_maxdelta) * random.choice([-1.0, 1.0])
-            phi = last_phi + delta
-            if c.phi_min <= phi <= c.phi_max:
-                valid_phi = True
-
-        valid_camera_local_y = False
-        while not valid_camera_local_y:
-            delta = random.uniform(c.camera_local_y_mindelta, c.camera_local_y_maxdelta) * random.choice([-1.0, 1.0])
-            camera_local_y = last_camera_local_y + delta
-            if c.camera_local_y_min <= camera_local_y <= c.camera_local_y_max:
-                valid_camera_local_y = True
-
-        valid_camera_local_z = False
-        while not valid_camera_local_z:
-            delta = random.uniform(c.camera_local_z_mindelta, c.camera_local_z_maxdelta) * random.choice([-1.0, 1.0])
-            camera_local_z = last_camera_local_z + delta
-            if c.camera_local_z_min <= camera_local_z <= c.camera_local_z_max:
-                valid_camera_local_z = True
-
-    return (distance, theta, phi, camera_local_y, camera_local_z)
-
-def get_random_hfov(config, last_hfov=None):
-    c = config
-    (hfov_min, hfov_max) = c.hfov_ranges[0]
+        sequence["camera_radius_max"] = float(group_config.get("camera_radius_max", -1.0))
+        sequence["camera_height_min"] = float(group_config.get("camera_height_min", -1.0))
+        sequence["camera_height_max"] = float(group_config.get("camera_height_max", -1.0))
 
-    if last_hfov is None:
-        hfov = random.uniform(hfov_min, hfov_max)
-    else:
-        valid_hfov = False
-        while not valid_hfov:
-            delta = random.uniform(c.hfov_mindelta, c.hfov_maxdelta) * random.choice([-1.0, 1.0])
+        if "theta_min" in group_config:
+            sequence["theta_min"] = float(group_config["theta_min"])
+            sequence["theta_max"] = float(group_config["theta_max"])
 
-            hfov = last_hfov + delta
-            if hfov_min <= hfov <= hfov_max:
-                valid_hfov = True
+        # Log data of first body
+        if len(rows) > 0:
+            sequence["body"] = be_seq.body[rows.start]
+            sequence["body_yaw"] = body_yaws[body_index]
+            body_index += 1
 
-    return hfov
+        sequences[sequence_name] = sequence
 
+    return sequences
 
-def get_vcam_keyframes(config, sequence, hfov, body_yaw, vcam_focallength, vcam_capture, info):
+def get_truncated_delta(rng, last, mindelta, maxdelta, value_min, value_max):
+    """
+    Batched last + uniform(mindelta, maxdelta) * random sign, restricted to [value_min, value_max].
+    Samples directly from the valid part of both delta intervals, which gives the same distribution
+    as repeating the draw until the value is in range but never loops.
+    If no delta can reach the valid range the value is clamped to it.
+    """
+    last = np.asarray(last, dtype=np.float64)
+    delta_min = np.minimum(mindelta, maxdelta)
+    delta_max = np.maximum(mindelta, maxdelta)
+
+    # Valid intervals for positive and negative delta
+    positive_min = np.maximum(last + delta_min, value_min)
+    positive_max = np.minimum(last + delta_max, value_max)
+    negative_min = np.maximum(last - delta_max, value_min)
+    negative_max = np.minimum(last - delta_min, value_max)
+    positive_length = np.maximum(positive_max - positive_min, 0.0)
+    negative_length = np.maximum(negative_max - negative_min, 0.0)
+
+    offset = rng.random(last.shape) * (positive_length + negative_length)
+    value = np.where(offset < positive_length, positive_min + offset, negative_min + (offset - positive_length))
+
+    # Zero length intervals (fixed delta or no valid delta)
+    positive_valid = positive_min <= positive_max
+    negative_valid = negative_min <= negative_max
+    use_positive = np.where(positive_valid & negative_valid, rng.random(last.shape) < 0.5, positive_valid)
+    fallback = np.where(use_positive, positive_min, np.where(negative_valid, negative_min, np.clip(last, value_min, value_max)))
+
+    return np.where((positive_length + negative_length) > 0.0, value, fallback)
+
+def get_sampled_value(unit, parameter, sequence_samples, value_min, value_max):
+    """
+    Map unit value to [value_min, value_max], unit is stored in sequence_samples if the range is not empty.
+    """
+    if value_max > value_min:
+        sequence_samples[parameter] = unit
+    return value_min + unit * (value_max - value_min)
+
+def get_theta_ranges(c):
+    if len(c.theta_ranges) > 0:
+        return c.theta_ranges
+    return [(c.theta_min, c.theta_max)]
+
+def get_random_locations(rng, configs, units):
+    """
+    Batched start and end camera locations (distance, theta, phi, camera_local_y, camera_local_z) for list of sequence configurations.
+    Start locations are mapped from unit samples, end locations are random deltas.
+    """
+    def get_values(name):
+        return np.array([getattr(c, name) for c in configs], dtype=np.float64)
+
+    def get_start_values(name):
+        return get_values(f"{name}_min") + units[name] * (get_values(f"{name}_max") - get_values(f"{name}_min"))
+
+    num_sequences = len(configs)
+
+    distance = get_start_values("distance")
+    theta = np.array([get_range_value(unit, get_theta_ranges(c)) for (unit, c) in zip(units["theta"], configs)], dtype=np.float64).reshape(num_sequences) # theta range choice if theta_ranges is set
+    phi = get_start_values("phi")
+    camera_local_y = get_start_values("camera_local_y")
+    camera_local_z = get_start_values("camera_local_z")
+    start = (distance, theta, phi, camera_local_y, camera_local_z)
+
+    distance = get_truncated_delta(rng, distance, get_values("distance_mindelta"), get_values("distance_maxdelta"), get_values("distance_min"), get_values("distance_max"))
+    theta = theta + rng.uniform(get_values("theta_mindelta"), get_values("theta_maxdelta")) * rng.choice([-1.0, 1.0], num_sequences) # theta is not bounded
+    phi = get_truncated_delta(rng, phi, get_values("phi_mindelta"), get_values("phi_maxdelta"), get_values("phi_min"), get_values("phi_max"))
+    camera_local_y = get_truncated_delta(rng, camera_local_y, get_values("camera_local_y_mindelta"), get_values("camera_local_y_maxdelta"), get_values("camera_local_y_min"), get_values("camera_local_y_max"))
+    camera_local_z = get_truncated_delta(rng, camera_local_z, get_values("camera_local_z_mindelta"), get_values("camera_local_z_maxdelta"), get_values("camera_local_z_min"), get_values("camera_local_z_max"))
+    end = (distance, theta, phi, camera_local_y, camera_local_z)
+
+    return (start, end)
+
+def get_vcam_keyframes(config, sequence, hfov, body_yaw, vcam_store, vcam_focallength, vcam_capture, info):
     c = config
-    data_json = None
-    vcam_path = VCAM_ROOT / c.vcam_type[0] / c.vcam_type[1] / vcam_focallength / vcam_capture # Example: C:\bedlam2\render\config\vcam\stand\landscape\14\vcam_stand_20240723_0014.json
 
     num_frames = sequence["frames"] + 2 # motion blur requires extra keyframes at beginning and end
-    extrinsics = []
-    with open(vcam_path, "r") as f:
-        data_json = json.load(f)
-
-        extrinsics = data_json["extrinsics"]
-
-        # Trim off frames at start and end of raw captures
-        extrinsics = extrinsics[VCAM_TRIM_FRAMES:-VCAM_TRIM_FRAMES]
-
-        if c.vcam_reverse:
-            extrinsics.reverse()
-
-        # Sample sublist of length num_frames from extrinsics
-        start_index_max = len(extrinsics) - num_frames
-        start_index = random.randint(0, start_index_max)
-        end_index = start_index + num_frames
-        extrinsics = extrinsics[start_index:end_index]
+    extrinsics = vcam_store.get_keyframe_window(c.vcam_type[0], c.vcam_type[1], vcam_focallength, vcam_capture, num_frames, VCAM_TRIM_FRAMES, c.vcam_reverse)
 
     sequence_body = sequence["body"]
     sequence_body_yaw = sequence["body_yaw"]
@@ -243,88 +186,77 @@ def get_vcam_keyframes(config, sequence, hfov, body_yaw, vcam_focallength, vcam_
     vcam_pitch_offset = random.uniform(c.vcam_pitch_offset_min, c.vcam_pitch_offset_max)
     info["vcam_pitch_offset"] = vcam_pitch_offset
 
-    keyframes = []
+    # Apply offsets to all frames at once, keyframe dictionaries are only built for output
+    camera_local = extrinsics.copy()
+    camera_local[:, 0] += vcam_x_offset
+    camera_local[:, 2] += vcam_height_offset
+    camera_local[:, 4] += vcam_pitch_offset
+
+    cameraroot = sequence["cameraroot"]
 
-    for keyframe_index in range(num_frames):
+    keyframes = []
+    for (keyframe_index, (camera_local_x, camera_local_y, camera_local_z, camera_local_yaw, camera_local_pitch, camera_local_roll)) in enumerate(camera_local.tolist()):
         keyframe = {}
         keyframe["frame_index"] = -1 + keyframe_index # start at frame -1 for proper motion blur at frame 0
         keyframe["hfov"] = hfov
 
         # Place cameraroot at desired height above ground
-        cameraroot = {}
-        cameraroot["x"] = sequence["cameraroot"]["x"]
-        cameraroot["y"] = sequence["cameraroot"]["y"]
-        cameraroot["z"] = sequence["cameraroot"]["z"]
-
-        cameraroot["yaw"] = cameraroot_yaw
-        cameraroot["pitch"] = 0
-        cameraroot["roll"] = 0
-        keyframe["cameraroot"] = cameraroot
-
-        camera_local_x = extrinsics[keyframe_index][0] + vcam_x_offset
-        camera_local_y = extrinsics[keyframe_index][1]
-        camera_local_z = extrinsics[keyframe_index][2] + vcam_height_offset
-        camera_local_yaw = extrinsics[keyframe_index][3]
-        camera_local_pitch = extrinsics[keyframe_index][4] + vcam_pitch_offset
-        camera_local_roll = extrinsics[keyframe_index][5]
-
+        keyframe["cameraroot"] = { "x": cameraroot["x"], "y": cameraroot["y"], "z": cameraroot["z"], "yaw": cameraroot_yaw, "pitch": 0, "roll": 0 }
         keyframe["camera_local"] = { "x": camera_local_x, "y": camera_local_y, "z": camera_local_z, "yaw": camera_local_yaw, "pitch": camera_local_pitch, "roll": camera_local_roll }
         keyframe["type"] = "auto"
 
         keyframes.append(keyframe)
 
-    return keyframes
-
+    if VCAM_KEYFRAME_REDUCTION:
+        keyframes = reduce_keyframes(keyframes)
 
-def generate_camera_movement(csv_path, config_camera_movement, config_type):
+    return keyframes
 
-    c_default = config_camera_movement
 
-    sequences = read_csv(csv_path)
+def generate_sequence_cameras(sequences, sequence_names, c_default, rng, body_yaw, vcam_store, cycles, units, samples):
+    """
+    Random camera keyframes and info for given sequences, returns dictionary sequence_name => { "keyframes", "info" }
+      cycles: shuffled dolly types and look-at body parts which are not used yet, state is kept between calls
+      units: SAMPLING_PARAMETERS => (len(sequence_names),) unit values from ParameterSampler
+      samples: sequence_name => { parameter: unit value } is stored for all parameters sampled from a non-empty range
+    """
     output = {}
-    output["info"] = {}
-    output["info"]["fps"] = 30
-    output["info"]["config_type"] = config_type
-    output["info"]["config"] = config_camera_movement._asdict()
 
-    dolly_types_current = []
-    look_at_target_bodyparts_current = []
-
-    body_yaw = {}
-    if c_default.theta_front or c_default.vcam_theta_front:
-        # Load body yaw reference
-        with open(MOTION_STATS_PATH, 'r') as f:
-            csv_reader = csv.DictReader(f)
-            for row in csv_reader:
-                body_id = row["body_id"]
-                motion_id = row["motion_id"]
-                body = f"{body_id}_{motion_id}"
-                yaw =row["pelvis_world_yaw_deg"]
-                body_yaw[body] = float(yaw)
-
-    vcam_captures = {}
-    if c_default.vcam:
-        # Load VCam captures information
-        with open(VCAM_CAPTURES, "r") as f:
-            vcam_captures = json.load(f)
+    def get_unit(parameter, sequence_index):
+        return float(units[parameter][sequence_index])
 
-    for sequence_name, sequence in sequences.items():
+    # HFOV
+    hfov_range_indices = [None] * len(sequence_names)
+    hfov_sampled = False
+    if len(c_default.hfov_ranges) == 0:
+        hfovs = [sequences[sequence_name]["hfov"] for sequence_name in sequence_names] # use HFOV from sequence
+    else:
+        hfov_ranges = np.array(c_default.hfov_ranges, dtype=np.float64).reshape(-1, 2)
+        hfov_sampled = (len(hfov_ranges) > 1) or (hfov_ranges[0, 1] > hfov_ranges[0, 0])
+        hfovs = get_range_value(units["hfov"], hfov_ranges).tolist()
+        hfov_range_indices = get_range_index(units["hfov"], len(hfov_ranges)).tolist()
+
+    dolly_types_current = cycles["dolly_types"]
+    look_at_target_bodyparts_current = cycles["look_at_target_bodyparts"]
+
+    # Per-sequence configuration, keyframes are generated for all sequences at once afterwards
+    setups = []
+    for (sequence_index, sequence_name) in enumerate(sequence_names):
+        sequence = sequences[sequence_name]
         c = c_default._replace() # make shallow copy since we might modify its values later for this sequence
         output_sequence = {}
+        output[sequence_name] = output_sequence
         info = {}
+        sequence_samples = {}
+        samples[sequence_name] = sequence_samples
         #camera_world_height = sequence["camera"]["z"]
         info["cameraroot_yaw_reference"] = sequence["cameraroot"]["yaw"]
         info["ground_height_world"] = sequence["ground_height_world"]
 
-        # HFOV
-        hfov_range_index = None
-        if len(c.hfov_ranges) == 0:
-            hfov = sequence["hfov"] # use HFOV from sequence
-        else:
-            hfov_range_index = random.randint(0, len(c.hfov_ranges) - 1)
-
-            (hfov_min, hfov_max) = c.hfov_ranges[hfov_range_index]
-            hfov = random.uniform(hfov_min, hfov_max)
+        hfov = hfovs[sequence_index]
+        hfov_range_index = hfov_range_indices[sequence_index]
+        if hfov_sampled:
+            sequence_samples["hfov"] = float(units["hfov"][sequence_index])
 
         # Use keyframed VCam if specified
         if c.vcam:
@@ -332,13 +264,12 @@ def generate_camera_movement(csv_path, config_camera_movement, config_type):
             info["vcam_focallength"] = vcam_focallength
 
             # Get random capture file
-            vcam_capture = random.choice(vcam_captures[c.vcam_type[0]][c.vcam_type[1]][vcam_focallength])
+            vcam_capture = random.choice(vcam_store.get_captures(c.vcam_type[0], c.vcam_type[1], vcam_focallength))
             info["vcam_capture"] = vcam_capture
 
-            keyframes = get_vcam_keyframes(c, sequence, hfov, body_yaw, vcam_focallength, vcam_capture, info)
+            keyframes = get_vcam_keyframes(c, sequence, hfov, body_yaw, vcam_store, vcam_focallength, vcam_capture, info)
             output_sequence["keyframes"] = keyframes
             output_sequence["info"] = info
-            output[sequence_name] = output_sequence
             continue
 
         # Check for camera height range overrides
@@ -354,7 +285,7 @@ def generate_camera_movement(csv_path, config_camera_movement, config_type):
             info["camera_height_max"] = camera_height_max
 
         if camera_height_min > 0:
-            info["camera_height"] = random.uniform(camera_height_min, camera_height_max)
+            info["camera_height"] = get_sampled_value(get_unit("camera_height", sequence_index), "camera_height", sequence_samples, camera_height_min, camera_height_max)
         else:
             info["camera_height"] = sequence["camera"]["z"]
         camera_world_height =  info["ground_height_world"] + info["camera_height"]
@@ -382,7 +313,7 @@ def generate_camera_movement(csv_path, config_camera_movement, config_type):
                 follow_camera_distance = c.follow_camera_distance
 
             info["follow_camera_distance"] = follow_camera_distance
-            info["follow_camera_yaw_offset"] = random.uniform(c.follow_camera_yaw_offset_min, c.follow_camera_yaw_offset_max)
+            info["follow_camera_yaw_offset"] = get_sampled_value(get_unit("follow_camera_yaw_offset", sequence_index), "follow_camera_yaw_offset", sequence_samples, c.follow_camera_yaw_offset_min, c.follow_camera_yaw_offset_max)
 
         if len(c.camera_shake) > 0:
             variation = random.randint(0, 249)
@@ -392,7 +323,7 @@ def generate_camera_movement(csv_path, config_camera_movement, config_type):
 
         if len(c.look_at_target_bodyparts) > 0:
             if len(look_at_target_bodyparts_current) == 0:
-                look_at_target_bodyparts_current = list(c.look_at_target_bodyparts)
+                look_at_target_bodyparts_current.extend(c.look_at_target_bodyparts)
                 random.shuffle(look_at_target_bodyparts_current)
 
             look_at_bodypart = look_at_target_bodyparts_current.pop(0)
@@ -404,6 +335,8 @@ def generate_camera_movement(csv_path, config_camera_movement, config_type):
         if (c.camera_roll_min != 0.0) or (c.camera_roll_max != 0.0):
             info["camera_roll"] = random.uniform(c.camera_roll_min, c.camera_roll_max)
 
+        cameraroot_x = None
+        cameraroot_y = None
         if c.randomize_location:
             # Randomize cameraroot xy stage location
             cameraroot_x = sequence["cameraroot"]["x"] + random.uniform(-25.0, 25.0)
@@ -449,7 +382,7 @@ def generate_camera_movement(csv_path, config_camera_movement, config_type):
 
         if len(c.dolly_types) > 0:
             if len(dolly_types_current) == 0:
-                dolly_types_current = list(c.dolly_types)
+                dolly_types_current.extend(c.dolly_types)
                 random.shuffle(dolly_types_current)
 
             dolly_type = dolly_types_current.pop(0)
@@ -462,7 +395,7 @@ def generate_camera_movement(csv_path, config_camera_movement, config_type):
                 c = c._replace(camera_local_y_maxdelta = 0.0)
             elif dolly_type == "y":
                 # Use fixed X offset
-                distance = random.uniform(c.distance_min, c.distance_max)
+                distance = get_sampled_value(get_unit("distance", sequence_index), "distance", sequence_samples, c.distance_min, c.distance_max)
                 c = c._replace(distance_min = distance)
                 c = c._replace(distance_max = distance)
                 c = c._replace(distance_mindelta = 0.0)
@@ -484,82 +417,211 @@ def generate_camera_movement(csv_path, config_camera_movement, config_type):
                     c = c._replace(camera_local_y_maxdelta = 2 * camera_local_y_offset_max)
                     c = c._replace(camera_local_y_mindelta = 0.75 * camera_local_y_offset_max)
 
-        distance = 0.0
-        theta = 0.0
-        phi = 0.0
-        camera_local_y = 0.0
-        camera_local_z = 0.0
-        camera_local_pitch = None
+        setup = { "sequence_index": sequence_index, "sequence_samples": sequence_samples, "sequence": sequence, "config": c, "info": info, "output_sequence": output_sequence, "hfov": hfov, "camera_autodistance_ref": camera_autodistance_ref,
+                  "cameraroot_x": cameraroot_x, "cameraroot_y": cameraroot_y, "camera_world_height": camera_world_height }
+        setups.append(setup)
+
+    # Zoom in/out
+    hfov_start = np.array([setup["hfov"] for setup in setups], dtype=np.float64)
+    hfov_end = hfov_start
+    if c_default.hfov_mindelta >= 0 and (len(c_default.hfov_ranges) > 0):
+        (hfov_min, hfov_max) = c_default.hfov_ranges[0]
+        hfov_end = get_truncated_delta(rng, hfov_start, c_default.hfov_mindelta, c_default.hfov_maxdelta, hfov_min, hfov_max)
+
+    # Camera locations
+    locations = None
+    if c_default.randomize_location:
+        setup_indices = [setup["sequence_index"] for setup in setups]
+        setup_units = { parameter: values[setup_indices] for (parameter, values) in units.items() }
+        locations = get_random_locations(rng, [setup["config"] for setup in setups], setup_units)
+
+        for (setup_index, setup) in enumerate(setups):
+            c = setup["config"]
+            for parameter in ["distance", "phi", "camera_local_y", "camera_local_z"]:
+                if getattr(c, f"{parameter}_max") > getattr(c, f"{parameter}_min"):
+                    setup["sequence_samples"][parameter] = float(setup_units[parameter][setup_index])
+            if any((theta_max > theta_min) for (theta_min, theta_max) in get_theta_ranges(c)) or (len(get_theta_ranges(c)) > 1):
+                setup["sequence_samples"]["theta"] = float(setup_units["theta"][setup_index])
+
+    # Keyframe values of all sequences are computed as arrays, keyframe dictionaries are only built for output
+    frame_indices = [ [-1] * len(setups), [setup["sequence"]["frames"] for setup in setups] ] # first keyframe at -1 for proper motion blur at frame 0
+    hfovs = [ hfov_start.tolist(), hfov_end.tolist() ]
+
+    cameraroot_values = None
+    camera_local_values = None
+    camera_local_pitch = None
+    if c_default.randomize_location:
+        cameraroot_yaw_reference = []
+        for setup in setups:
+            sequence = setup["sequence"]
+            if not setup["config"].theta_front:
+                cameraroot_yaw_reference.append(sequence["cameraroot"]["yaw"])
+            else:
+                # Use theta as relative offset to first body front
+                body_yaw_offset = -body_yaw[sequence["body"]] # convert right-hand rule yaw to Unreal left-hand rule yaw
+
+                # Unreal default body is facing positive Y axis, camera is along negative X axis
+                # -90 yaw rotates cameraroot so that camera is looking along negative Y axis
+                cameraroot_yaw_reference.append(-90.0 + sequence["body_yaw"] + body_yaw_offset)
+
+        cameraroot_x = np.array([setup["cameraroot_x"] for setup in setups], dtype=np.float64)
+        cameraroot_y = np.array([setup["cameraroot_y"] for setup in setups], dtype=np.float64)
+        camera_world_height = np.array([setup["camera_world_height"] for setup in setups], dtype=np.float64)
+        cameraroot_yaw_reference = np.array(cameraroot_yaw_reference, dtype=np.float64)
+        camera_autodistance_ref = np.array([setup["camera_autodistance_ref"] for setup in setups], dtype=np.float64)
+
+        # Place cameraroot at desired height above ground, if camera_autodistance is used then distance denotes offset relative to autodistance point (along negative X)
+        cameraroot_values = []
+        camera_local_values = []
+        for (distance, theta, phi, camera_local_y, camera_local_z) in locations:
+            cameraroot_values.append(np.stack([cameraroot_x, cameraroot_y, camera_world_height, cameraroot_yaw_reference + theta, phi], axis=1).tolist())
+            camera_local_values.append(np.stack([-(camera_autodistance_ref + distance), camera_local_y, camera_local_z], axis=1).tolist())
+
+        if c_default.camera_local_autopitch:
+            camera_local_pitch = [ -degrees(atan( (setup["info"]["camera_height"] - setup["info"]["look_at_offset_z"]) / abs(reference + distance))) for (setup, reference, distance) in zip(setups, camera_autodistance_ref.tolist(), locations[0][0].tolist()) ]
+
+    for (setup_index, setup) in enumerate(setups):
+        c = setup["config"]
+        info = setup["info"]
 
         keyframes = []
         for keyframe_index in range(c.keyframes):
-            keyframe = {}
-            if keyframe_index == 0:
-                keyframe["frame_index"] = -1 # set at -1 for proper motion blur at frame 0
-                if c.randomize_location:
-                    (distance, theta, phi, camera_local_y, camera_local_z) = get_random_location(c)
-
-                    if c.camera_local_autopitch:
-                        camera_local_pitch = -degrees(atan( (info["camera_height"] - info["look_at_offset_z"]) / abs(camera_autodistance_ref + distance)))
-            elif keyframe_index == (c.keyframes - 1):
-                keyframe["frame_index"] = sequence["frames"]
-
-                if c.hfov_mindelta >= 0:
-                    # Zoom in/out
-                    hfov = get_random_hfov(c, hfov)
-
-                if c.randomize_location:
-                    (distance, theta, phi, camera_local_y, camera_local_z) = get_random_location(c, distance, theta, phi, camera_local_y, camera_local_z)
-            else:
-                print("ERROR: Currently only 2 keyframes supported", file=sys.stderr)
-                sys.exit(1)
-
-            keyframe["hfov"] = hfov
+            keyframe = { "frame_index": frame_indices[keyframe_index][setup_index], "hfov": hfovs[keyframe_index][setup_index] }
 
             if c.randomize_location:
-                # Place cameraroot at desired height above ground
-                cameraroot = {}
-                cameraroot["x"] = cameraroot_x
-                cameraroot["y"] = cameraroot_y
-                cameraroot["z"] = camera_world_height
-
-                if not c.theta_front:
-                    cameraroot["yaw"] = sequence["cameraroot"]["yaw"] + theta
-                else:
-                    # Use theta as relative offset to first body front
-                    sequence_body = sequence["body"]
-                    sequence_body_yaw = sequence["body_yaw"]
-                    body_yaw_offset = -body_yaw[sequence_body] # convert right-hand rule yaw to Unreal left-hand rule yaw
-
-                    # Unreal default body is facing positive Y axis, camera is along negative X axis
-                    # -90 yaw rotates cameraroot so that camera is looking along negative Y axis
-                    cameraroot_yaw = -90.0 + sequence_body_yaw + body_yaw_offset
-                    cameraroot["yaw"] = cameraroot_yaw + theta
-                    info["theta"] = theta
-
-                cameraroot["pitch"] = phi
-                keyframe["cameraroot"] = cameraroot
-
-                camera_local_x = -(camera_autodistance_ref + distance) # if camera_autodistance is used then distance denotes offset relative to autodistance point
-                keyframe["camera_local"] = { "x": camera_local_x, "y": camera_local_y, "z": camera_local_z } # distance is along negative X
+                (x, y, z, yaw, pitch) = cameraroot_values[keyframe_index][setup_index]
+                keyframe["cameraroot"] = { "x": x, "y": y, "z": z, "yaw": yaw, "pitch": pitch }
+
+                (x, y, z) = camera_local_values[keyframe_index][setup_index]
+                keyframe["camera_local"] = { "x": x, "y": y, "z": z }
                 if c.camera_local_autopitch:
-                    keyframe["camera_local"]["pitch"] = camera_local_pitch
+                    keyframe["camera_local"]["pitch"] = camera_local_pitch[setup_index]
+
+                if c.theta_front:
+                    info["theta"] = float(locations[keyframe_index][1][setup_index])
 
             keyframe["type"] = "linear"
 
             keyframes.append(keyframe)
 
-        output_sequence["keyframes"] = keyframes
-        output_sequence["info"] = info
-        output[sequence_name] = output_sequence
+        setup["output_sequence"]["keyframes"] = keyframes
+        setup["output_sequence"]["info"] = info
+
+    return output
+
+def resample_invisible_cameras(output, be_seq, sequences, c_default, rng, body_yaw, vcam_store, cycles, sampler, units, samples):
+    """
+    Validate body visibility of all cameras and resample cameras of sequences below the visibility thresholds.
+    Resampled cameras replace the current ones only if they improve visibility.
+      units: unit values of all sequences, resampled sequences are redrawn inside the strata of their original samples
+    """
+    animation_cache = get_animation_cache()
+    if animation_cache is None:
+        print(f"WARNING: Neither trajectory index ({TRAJECTORY_INDEX_PATH}) nor animation folder ({SMPLX_NPZ_ANIMATION_FOLDER}) found, camera visibility not validated", file=sys.stderr)
+        return
+
+    results = validate_camera_visibility(output, be_seq, animation_cache)
+    invisible_sequences = get_invisible_sequences(results)
+    sequence_names = list(sequences.keys())
+    for attempt in range(c_default.visibility_resample_attempts):
+        if len(invisible_sequences) == 0:
+            break
+
+        print(f"[INFO] Resampling cameras of {len(invisible_sequences)} sequences below visibility thresholds ({attempt + 1}/{c_default.visibility_resample_attempts})", file=sys.stderr)
+        resampled_samples = {}
+        sequence_indices = [sequence_names.index(sequence_name) for sequence_name in invisible_sequences]
+        resampled_units = sampler.redraw({ parameter: values[sequence_indices] for (parameter, values) in units.items() })
+        resampled = generate_sequence_cameras(sequences, invisible_sequences, c_default, rng, body_yaw, vcam_store, cycles, resampled_units, resampled_samples)
+        resampled_results = validate_camera_visibility({ "info": output["info"], **resampled }, be_seq, animation_cache)
+        for sequence_name in invisible_sequences:
+            if np.nan_to_num(resampled_results[sequence_name]).tolist() > np.nan_to_num(results[sequence_name]).tolist():
+                output[sequence_name] = resampled[sequence_name]
+                samples[sequence_name] = resampled_samples[sequence_name]
+                results[sequence_name] = resampled_results[sequence_name]
+
+        invisible_sequences = get_invisible_sequences({ sequence_name: results[sequence_name] for sequence_name in invisible_sequences })
+
+    for (sequence_name, (frame_ratio, body_ratio)) in results.items():
+        output[sequence_name]["info"]["visibility_frame_ratio"] = frame_ratio
+        output[sequence_name]["info"]["visibility_body_ratio"] = body_ratio
+
+    for sequence_name in invisible_sequences:
+        (frame_ratio, body_ratio) = results[sequence_name]
+        print(f"WARNING: {sequence_name}: camera below visibility thresholds after resampling (frame_ratio={frame_ratio:.3f}, body_ratio={body_ratio:.3f})", file=sys.stderr)
 
-    print(json.dumps(output, indent=4))
+    return
+
+def generate_camera_movement(csv_path, config_camera_movement, config_type):
+
+    c_default = config_camera_movement
+
+    be_seq = read_be_seq(csv_path)
+    sequences = read_csv(be_seq)
+    output = {}
+    output["info"] = {}
+    output["info"]["fps"] = 30
+    output["info"]["config_type"] = config_type
+    output["info"]["config"] = config_camera_movement._asdict()
+
+    # Parsed configuration files are cached in binary format, sources are only parsed again if they change
+    config_cache = ConfigCache(CONFIG_CACHE_PATH)
+
+    body_yaw = {}
+    if c_default.theta_front or c_default.vcam_theta_front:
+        # Load body yaw reference
+        for row in config_cache.load(MOTION_STATS_PATH, read_csv_dicts):
+            body_id = row["body_id"]
+            motion_id = row["motion_id"]
+            body = f"{body_id}_{motion_id}"
+            yaw =row["pelvis_world_yaw_deg"]
+            body_yaw[body] = float(yaw)
+
+    vcam_store = None
+    if c_default.vcam:
+        # Load extrinsics of VCam captures used by this configuration
+        vcam_keys = [(c_default.vcam_type[0], c_default.vcam_type[1], vcam_focallength) for vcam_focallength in c_default.vcam_focallength_ranges]
+        vcam_store = VCamCaptureStore.load(VCAM_STORE_PATH, VCAM_ROOT, VCAM_CAPTURES, vcam_keys)
+        for vcam_key in vcam_keys:
+            if len(vcam_store.get_captures(*vcam_key)) == 0:
+                print(f"ERROR: No VCam captures available: {'/'.join(vcam_key)} (see {VCAM_ROOT / 'readme.md'})", file=sys.stderr)
+                sys.exit(1)
+
+    config_cache.save()
+
+    if c_default.keyframes > 2:
+        print("ERROR: Currently only 2 keyframes supported", file=sys.stderr)
+        sys.exit(1)
+
+    if (c_default.keyframes == 2) and (c_default.hfov_mindelta >= 0) and (len(c_default.hfov_ranges) == 0) and (not c_default.vcam):
+        print("ERROR: Zoom (hfov_mindelta >= 0) needs hfov_ranges", file=sys.stderr)
+        sys.exit(1)
+
+    # Camera parameters of all sequences are drawn from one point set over the whole job (independent uniform points for SAMPLING_METHOD random),
+    # end locations and zoom are sampled in batches. Generator is seeded from Python random state so that seeded runs are reproducible.
+    rng = np.random.default_rng(random.getrandbits(128))
+    sampler = ParameterSampler(SAMPLING_METHOD, SAMPLING_PARAMETERS, rng, block_size=len(sequences))
+    units = sampler.sample(len(sequences))
+    samples = {}
+
+    cycles = { "dolly_types": [], "look_at_target_bodyparts": [] }
+    output.update(generate_sequence_cameras(sequences, list(sequences.keys()), c_default, rng, body_yaw, vcam_store, cycles, units, samples))
+
+    # Validate before rendering so that cameras which do not show the bodies are never queued
+    if (c_default.visibility_resample_attempts > 0) and (not c_default.static_world_location):
+        resample_invisible_cameras(output, be_seq, sequences, c_default, rng, body_yaw, vcam_store, cycles, sampler, units, samples)
+
+    print_coverage_report(SAMPLING_METHOD, [sequence_samples for sequence_samples in samples.values() if len(sequence_samples) > 0], COVERAGE_BINS)
 
     json_output_path = csv_path.parent / "be_camera_animations.json"
     print(f"Saving camera animations: {json_output_path}")
     with open(json_output_path, "w") as f:
         json.dump(output, f, indent=4)
 
+    # Binary sidecar for random access by sequence name, see be_camera_animations_bin.py
+    bin_output_path = json_output_path.with_suffix(".bin")
+    print(f"Saving camera animations: {bin_output_path}")
+    write_camera_animations_sidecar(bin_output_path, output)
+
     return
 
 def print_usage():
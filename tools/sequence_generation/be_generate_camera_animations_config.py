@@ -11,9 +11,15 @@ STATS_ROOT = Path("../../stats")
 
 VCAM_ROOT = CONFIG_ROOT / "vcam"
 VCAM_CAPTURES = VCAM_ROOT / "vcam_captures.json"
+VCAM_STORE_PATH = STATS_ROOT / "vcam_captures.npz" # Preloaded extrinsics of requested VCam captures, see be_vcam_store.py
 
 VCAM_TRIM_FRAMES = 30 # trim 1s at start+end
+VCAM_KEYFRAME_REDUCTION = True # Reduce per-frame VCam keyframes to linear keys per channel within tolerance, see be_keyframe_reduction.py
 MOTION_STATS_PATH = STATS_ROOT / "motion_stats_training.csv" # body yaw
+CONFIG_CACHE_PATH = STATS_ROOT / "config_cache.pkl" # Binary cache of parsed configuration files, see be_config_cache.py
+VISIBILITY_RESAMPLE_ATTEMPTS = 0 # Default of ConfigCamera.visibility_resample_attempts, validation is enabled per configuration
+SAMPLING_METHOD = "random" # random | sobol | halton | lhs, stratified sampling of camera parameters over all sequences, see be_sampling.py
+COVERAGE_BINS = 10 # Histogram bins per parameter for sampling coverage report
 
 # Predefined configurations, polar coordinates
 # Notes:
@@ -71,6 +77,7 @@ class ConfigCamera(NamedTuple):
     dolly_types:                    list = [] # x | y | xy
     camera_roll_min:                float = 0.0
     camera_roll_max:                float = 0.0
+    visibility_resample_attempts:   int = VISIBILITY_RESAMPLE_ATTEMPTS # Resample cameras of sequences below body visibility thresholds (be_validate_camera_visibility_config.py), 0 disables validation
     vcam:                           bool = False
     vcam_type:                      list = [] # ["stand", "landscape"]
     vcam_focallength_ranges:        list = [] # ["14", "14-28", "28"]
@@ -7,23 +7,96 @@
 # Temporal sample count affects the behavior of those low pass filters.
 #
 
-import csv
 import json
+from multiprocessing import Pool
 from pathlib import Path
 import sys
 
-################################################################################
+import numpy as np
 
-def load_camera_gt(camera_gt_path):
-    csv_rows = []
-    with open(camera_gt_path, mode="r") as csv_file:
-        csv_reader = csv.DictReader(csv_file)
-        csv_rows = list(csv_reader)
+from be_keyframe_reduction import get_reduced_keyframes
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "unreal" / "render" / "Core" / "Python"))
+from be_camera_animations_bin import write_camera_animations_sidecar
+
+KEYFRAME_REDUCTION = False # Reduce per-frame keyframes to linear keys per channel within tolerance (lossy), see be_keyframe_reduction.py. Off so that the depth pass reproduces the rendered camera exactly.
+PROCESSES = 8 # Number of camera ground truth loader processes
 
-    return csv_rows
+# Camera ground truth columns in keyframe channel order, (group, key, CSV column)
+CAMERA_GT_CHANNELS = [ (None, "hfov", "hfov"),
+                       ("camera_local", "x", "x"), ("camera_local", "y", "y"), ("camera_local", "z", "z"),
+                       ("camera_local", "yaw", "yaw"), ("camera_local", "pitch", "pitch"), ("camera_local", "roll", "roll") ]
 
+################################################################################
 
-def generate_camera_animations(camera_animations_path, camera_gt_root, camera_animations_depth_path):
+def load_camera_gt(camera_gt_path):
+    """
+    Load camera ground truth CSV into (num_frames, len(CAMERA_GT_CHANNELS)) float64 array
+    """
+    with open(camera_gt_path, mode="r") as csv_file:
+        header = csv_file.readline().strip().split(",")
+        usecols = [header.index(column) for (_group, _key, column) in CAMERA_GT_CHANNELS]
+        values = np.loadtxt(csv_file, delimiter=",", usecols=usecols, dtype=np.float64, ndmin=2)
+
+    return values
+
+def load_camera_gt_args(args):
+    (sequence_name, camera_gt_path) = args
+    try:
+        return (sequence_name, load_camera_gt(camera_gt_path))
+    except (OSError, ValueError) as e:
+        print(f"ERROR: Cannot load camera ground truth: {camera_gt_path}: {e}", file=sys.stderr)
+        return (sequence_name, None)
+
+def load_camera_gt_sequences(camera_gt_root, sequence_names, processes=PROCESSES):
+    """
+    Load camera ground truth of all sequences in parallel, returns dict sequence name => array
+    """
+    tasklist = [ (sequence_name, camera_gt_root / f"{sequence_name}_camera.csv") for sequence_name in sequence_names ]
+    if (processes <= 1) or (len(tasklist) <= 1):
+        results = list(map(load_camera_gt_args, tasklist))
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(load_camera_gt_args, tasklist, chunksize=max(1, len(tasklist) // (4 * processes)))
+
+    return dict(results)
+
+def get_camera_keyframes(camera_gt):
+    """
+    Keyframes from camera ground truth array, built per channel
+    """
+    # duplicate first and last item since we keyframe rendering at frame -1
+    camera_gt = np.concatenate((camera_gt[:1], camera_gt, camera_gt[-1:]))
+    num_frames = len(camera_gt)
+
+    frame_indices = list(range(-1, num_frames - 1)) # start at frame -1 for proper motion blur at frame 0
+
+    # Camera is in world space so cameraroot must be at world space origin
+    channels = { ("cameraroot", "x"): [0.0] * num_frames, ("cameraroot", "y"): [0.0] * num_frames, ("cameraroot", "z"): [0.0] * num_frames,
+                 ("cameraroot", "yaw"): [0] * num_frames, ("cameraroot", "pitch"): [0] * num_frames, ("cameraroot", "roll"): [0] * num_frames }
+    for (index, (group, key, _column)) in enumerate(CAMERA_GT_CHANNELS):
+        channels[(group, key)] = camera_gt[:, index].tolist()
+
+    if KEYFRAME_REDUCTION:
+        return get_reduced_keyframes(frame_indices, channels, sources=channels)
+
+    hfov = channels[(None, "hfov")]
+    cameraroot = [ channels[("cameraroot", key)] for key in ["x", "y", "z", "yaw", "pitch", "roll"] ]
+    camera_local = [ channels[("camera_local", key)] for key in ["x", "y", "z", "yaw", "pitch", "roll"] ]
+
+    keyframes = []
+    for (keyframe_index, frame_index) in enumerate(frame_indices):
+        keyframe = {}
+        keyframe["frame_index"] = frame_index
+        keyframe["hfov"] = hfov[keyframe_index]
+        keyframe["cameraroot"] = dict(zip(["x", "y", "z", "yaw", "pitch", "roll"], [values[keyframe_index] for values in cameraroot]))
+        keyframe["camera_local"] = dict(zip(["x", "y", "z", "yaw", "pitch", "roll"], [values[keyframe_index] for values in camera_local]))
+        keyframe["type"] = "auto"
+        keyframes.append(keyframe)
+
+    return keyframes
+
+def generate_camera_animations(camera_animations_path, camera_gt_root, camera_animations_depth_path, processes=PROCESSES):
 
     camera_animations = {}
     with open(camera_animations_path, "r") as f:
@@ -40,83 +113,58 @@ def generate_camera_animations(camera_animations_path, camera_gt_root, camera_an
     camera_animations_depth = {}
     camera_animations_depth["info"] = info_depth
 
-    for key in camera_animations:
-        if key == "info":
-            continue
-
-        sequence_name = key
-
-        camera_gt_path = camera_gt_root / f"{sequence_name}_camera.csv"
-        csv_rows = load_camera_gt(camera_gt_path)
+    sequence_names = [key for key in camera_animations if key != "info"]
+    camera_gt_sequences = load_camera_gt_sequences(camera_gt_root, sequence_names, processes)
 
-        # duplicate first and last item since we keyframe rendering at frame -1
-        csv_rows.insert(0, csv_rows[0])
-        csv_rows.append(csv_rows[-1])
+    for sequence_name in sequence_names:
+        camera_gt = camera_gt_sequences[sequence_name]
+        if (camera_gt is None) or (len(camera_gt) == 0):
+            print(f"ERROR: No camera ground truth for sequence: {sequence_name}", file=sys.stderr)
+            sys.exit(1)
 
-        num_frames = len(csv_rows)
-
-        keyframes = []
-        for keyframe_index in range(num_frames):
-            keyframe = {}
-            keyframe["frame_index"] = -1 + keyframe_index # start at frame -1 for proper motion blur at frame 0
-            keyframe["hfov"] = float(csv_rows[keyframe_index]["hfov"])
-
-            # Camera is in world space so cameraroot must be at world space origin
-            cameraroot = {}
-            cameraroot["x"] = 0.0
-            cameraroot["y"] = 0.0
-            cameraroot["z"] = 0.0
-
-            cameraroot["yaw"] = 0
-            cameraroot["pitch"] = 0
-            cameraroot["roll"] = 0
-            keyframe["cameraroot"] = cameraroot
-
-            camera_local_x = float(csv_rows[keyframe_index]["x"])
-            camera_local_y = float(csv_rows[keyframe_index]["y"])
-            camera_local_z = float(csv_rows[keyframe_index]["z"])
-            camera_local_yaw = float(csv_rows[keyframe_index]["yaw"])
-            camera_local_pitch = float(csv_rows[keyframe_index]["pitch"])
-            camera_local_roll = float(csv_rows[keyframe_index]["roll"])
-
-            keyframe["camera_local"] = { "x": camera_local_x, "y": camera_local_y, "z": camera_local_z, "yaw": camera_local_yaw, "pitch": camera_local_pitch, "roll": camera_local_roll }
-            keyframe["type"] = "auto"
-
-            keyframes.append(keyframe)
-
-        camera_animations_depth[sequence_name] = { "keyframes": keyframes, "info": {} }
+        camera_animations_depth[sequence_name] = { "keyframes": get_camera_keyframes(camera_gt), "info": {} }
 
     print(f"Saving: {camera_animations_depth_path}")
     with open(camera_animations_depth_path, "w") as f:
         json.dump(camera_animations_depth, f, indent=4)
 
+    # Binary sidecar for random access by sequence name, see be_camera_animations_bin.py
+    camera_animations_depth_bin_path = camera_animations_depth_path.with_suffix(".bin")
+    print(f"Saving: {camera_animations_depth_bin_path}")
+    write_camera_animations_sidecar(camera_animations_depth_bin_path, camera_animations_depth)
+
     return
 
 def print_usage():
-    print(f"Usage: {sys.argv[0]} RENDER_OUTPUT_DIRECTORY", file=sys.stderr)
+    print(f"Usage: {sys.argv[0]} RENDER_OUTPUT_DIRECTORY [NUM_PROCESSES]", file=sys.stderr)
     return
 
 ################################################################################
 # Main
 ################################################################################
 
-if len(sys.argv) != 2:
-    print_usage()
-    sys.exit(1)
+if __name__ == "__main__":
+    if (len(sys.argv) < 2) or (len(sys.argv) > 3):
+        print_usage()
+        sys.exit(1)
+
+    render_output_root = Path(sys.argv[1])
+    processes = PROCESSES
+    if len(sys.argv) >= 3:
+        processes = int(sys.argv[2])
 
-render_output_root = Path(sys.argv[1])
-camera_animations_path = render_output_root / "be_camera_animations.json"
-camera_gt_root = render_output_root / "ground_truth" / "meta_exr_csv"
-camera_animations_depth_path = render_output_root / "be_camera_animations_depth.json"
+    camera_animations_path = render_output_root / "be_camera_animations.json"
+    camera_gt_root = render_output_root / "ground_truth" / "meta_exr_csv"
+    camera_animations_depth_path = render_output_root / "be_camera_animations_depth.json"
 
-if not camera_animations_path.exists():
-    print(f"ERROR: Camera animations definition not found: {camera_animations_path}", file=sys.stderr)
-    sys.exit(1)
+    if not camera_animations_path.exists():
+        print(f"ERROR: Camera animations definition not found: {camera_animations_path}", file=sys.stderr)
+        sys.exit(1)
 
-if not camera_gt_root.exists():
-    print(f"ERROR: Camera ground truth files not found: {camera_gt_root}", file=sys.stderr)
-    sys.exit(1)
+    if not camera_gt_root.exists():
+        print(f"ERROR: Camera ground truth files not found: {camera_gt_root}", file=sys.stderr)
+        sys.exit(1)
 
-generate_camera_animations(camera_animations_path, camera_gt_root, camera_animations_depth_path)
+    generate_camera_animations(camera_animations_path, camera_gt_root, camera_animations_depth_path, processes)
 
-sys.exit(0)
+    sys.exit(0)
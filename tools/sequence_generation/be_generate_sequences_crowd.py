@@ -13,19 +13,32 @@
 #
 #
 import copy
-import csv
 import cv2
 from dataclasses import dataclass
-import json
 from math import radians, tan
+from multiprocessing import Pool
 import numpy as np
 import random
 import sys
 
 from be_generate_sequences_crowd_config import *
+from be_collision_capsules import CapsuleSpatialHash, MaskDistanceField, get_polyline_segments, is_inside_rectangle, simplify_polyline, transform_polyline
+from be_config_cache import ConfigCache, read_csv_dicts, read_csv_rows, read_image_grayscale, read_json, read_lines
+from be_sampling import ParameterSampler, get_range_index, print_coverage_report
+from be_trajectory_index import TrajectoryIndex, get_animation_npz_path, get_frame_rate_divisor, load_trajectory_index
 
 ################################################################################
 
+placement_statistics = { "trials": 0 } # number of exact location tests, used to compare placement engines
+
+# Ground trajectory color table (20 entries, generated with distinctipy)
+rgb_colors = [(0.9719224153972289, 0.0006387120046262851, 0.9572435498906621), (0.0, 1.0, 0.0), (0.0, 0.5, 1.0), (1.0, 0.5, 0.0), (0.5, 0.75, 0.5),
+              (0.30263956385061963, 0.02589151037218751, 0.6757257307743725), (0.8216012497248589, 0.0026428145851382645, 0.20847626796262153), (0.01267507572944171, 0.49697306807148534, 0.17396314179520123), (0.0, 1.0, 1.0), (0.9698728055826683, 0.5021762913810213, 0.7875501077376108),
+              (1.0, 1.0, 0.0), (0.0, 1.0, 0.5), (0.510314116241271, 0.3232218781514624, 0.09891582182150804), (0.520147512582225, 0.8462498714551937, 0.00708852231806234), (0.5022640147541273, 0.3238721132368306, 0.9748299235270517),
+              (0.5637646267468693, 0.7935494453374514, 0.9943913298776966), (0.9710018684130394, 0.8195424816067317, 0.46244870837979113), (0.26496132907909453, 0.38952992986967117, 0.5617810079535678), (0.0, 0.0, 1.0), (0.7026382639692401, 0.2676706088672629, 0.4941663340174245)]
+
+trajectory_index = None # TrajectoryIndex with packed root trajectories, fallback to .npz animation files if not available
+
 @dataclass
 class SubjectLocationData:
     subject_name: str
@@ -82,8 +95,623 @@ def transform_image(source_image, unreal_x, unreal_y, unreal_yaw):
 
     return source_image_r_t
 
+def apply_body_yaw(yaw, body_yaw):
+    if body_yaw is not None:
+        yaw = yaw + 90 + body_yaw # apply body yaw reference normalization, default Unreal body looks along Y-axis and needs yaw+=90 to face camera
+    return yaw
+
+def get_ground_trajectory_image(data):
+    radius = CV_BODY_RADIUS
+    current_location_image = np.zeros( (CV_IMAGESIZE, CV_IMAGESIZE), dtype=np.uint8)
+    trans = data.trans[data.start_frame : (data.start_frame + data.used_frames), :]
+    for position in trans:
+        # Mark occupied area
+        circle_center = get_image_coordinates_from_smplx(CV_IMAGESIZE, position[0], position[2])
+        cv2.circle(current_location_image, circle_center, radius, 255, -1)
+
+    # Debug image output
+    #cv2.imwrite(f"{data.subject_name}_{data.animation_name}.png", current_location_image)
+
+    return current_location_image
+
+def randomize_start_frame(data):
+    """
+    New random animation start frame for body relocation, used frame count is kept
+    """
+    if data.frames > data.used_frames:
+        data.start_frame = random.randint(0, data.frames - data.used_frames)
+
+def test_location(data, ground_trajectory_mask, area_boundary_mask, occupancy_image_mask, x, y, yaw, frustum_mask=None):
+    """
+    Check single body placement candidate against stage area boundary, camera frustum constraint and current ground occupancy.
+    Returns (status, target_image) where status is "valid", "boundary" or "occupied". Leaving the camera view counts as "boundary".
+    """
+    ground_trajectory_mask_r_t = transform_image(ground_trajectory_mask, x, y, yaw)
+
+    area_mask_test = cv2.bitwise_and(area_boundary_mask, ground_trajectory_mask_r_t)
+    #cv2.imwrite(f"test_r_t_{index}_masked.png", area_mask_test)
+
+    if np.any(area_mask_test):
+        return ("boundary", None)
+
+    if (frustum_mask is not None) and (not frustum_mask.test(get_frame_points(data, data.start_frame), x, y, yaw)):
+        return ("boundary", None)
+
+    # No overlap with outside boundary, we have valid area trajectory and can do occupancy overlap check next
+    target_image = transform_image(data.image, x, y, yaw)
+
+    occupancy_test = cv2.bitwise_and(occupancy_image_mask, target_image)
+    if np.any(occupancy_test):
+        return ("occupied", None)
+
+    return ("valid", target_image)
+
+def get_joint_location(c, data, ground_trajectory_mask, area_boundary_mask, stage_occupancy_mask, target_images, x_min, x_max, y_min, y_max, body_yaw, frustum_mask):
+    """
+    Joint placement: sample locations which only collide with already placed bodies and return the one colliding with the fewest bodies.
+    Returns (x, y, yaw, target_image, conflicts) where conflicts are the indices of colliding placed bodies, or None.
+    """
+    location = None
+    for _ in range(PLACEMENT_JOINT_TRIALS):
+        x = random.uniform(x_min, x_max)
+        y = random.uniform(y_min, y_max)
+        yaw = apply_body_yaw(random.uniform(c.yaw_min, c.yaw_max), body_yaw)
+
+        placement_statistics["trials"] += 1
+        (status, target_image) = test_location(data, ground_trajectory_mask, area_boundary_mask, stage_occupancy_mask, x, y, yaw, frustum_mask)
+        if status != "valid":
+            continue
+
+        conflicts = [ index for (index, placed_image) in enumerate(target_images) if (placed_image is not None) and np.any(cv2.bitwise_and(placed_image, target_image)) ]
+        if (location is None) or (len(conflicts) < len(location[4])):
+            location = (x, y, yaw, target_image, conflicts)
+            if len(conflicts) <= 1:
+                break
+
+    return location
+
+################################################################################
+# Camera frustum constraint
+################################################################################
+
+class FrustumMask:
+    """
+    Ground plane view coverage of the camera yaws of a sequence, rasterized in the top-down stage grid.
+    Each cell holds the ratio of sampled camera yaws which have the cell in view.
+    Image rows correspond to Unreal -X, columns to Unreal Y, image center is stage origin.
+    """
+    def __init__(self, mask, visible_ratio):
+        self.mask = mask
+        self.visible_ratio = visible_ratio
+
+    def get_visible_ratio(self, target_points):
+        """
+        Expected ratio of stage local points (N, 2) [cm] inside camera view over the sampled camera yaws, points outside of the grid are not visible
+        """
+        image_points = get_image_coordinates_from_unreal(self.mask.shape[0], target_points)
+        inside = np.all((image_points >= 0) & (image_points < self.mask.shape[0]), axis=1)
+        visible = np.zeros(len(target_points), dtype=np.float64)
+        visible[inside] = self.mask[image_points[inside, 1], image_points[inside, 0]]
+        return float(np.sum(visible)) / max(len(target_points), 1)
+
+    def test(self, frame_points, x, y, yaw):
+        """
+        Check if enough root locations of body local per-frame trajectory (N, 2) are expected in view after placement at (x, y, yaw)
+        """
+        return self.get_visible_ratio(transform_polyline(frame_points, x, y, yaw)) >= self.visible_ratio
+
+def get_frame_points(data, start_frame):
+    """
+    Body local ground plane root locations (N, 2) of used animation frames in Unreal coordinates [cm]
+    """
+    trans = data.trans[start_frame : (start_frame + data.used_frames), :]
+    # Animation X maps to Unreal X, animation Z maps to Unreal Y, see get_image_coordinates_from_smplx() and get_image_offset_from_unreal()
+    return 100.0 * np.stack((trans[:, 0], trans[:, 2]), axis=1).astype(np.float64)
+
+def get_frustum_mask(c, imagesize, cameraroot_x, cameraroot_y, cameraroot_yaw, camera_distance, theta_min, theta_max):
+    """
+    Rasterize view coverage of the horizontal camera view wedges of camera yaws (cameraroot_yaw + theta) sampled every FRUSTUM_THETA_STEP
+    in stage local coordinates. Cells hold the ratio of sampled yaws which have the cell in view, their union is the area visible for any yaw.
+    Camera is placed camera_distance [cm] behind the cameraroot and looks at it, like the cameras of be_generate_camera_animations.py.
+    Camera pitch is assumed to be zero. Body locations closer than the distance at which a full body at camera_height fits into
+    the vertical field of view are not in view. View is reduced by body radius at the wedge sides.
+    """
+    center = (imagesize - 1) / 2
+    (rows, columns) = np.mgrid[0:imagesize, 0:imagesize]
+    points_x = -(rows - center) * (100 / CV_M_TO_PIXELS)
+    points_y = (columns - center) * (100 / CV_M_TO_PIXELS)
+
+    tan_half_hfov = tan(radians(c.camera_hfov_deg / 2))
+    tan_half_vfov = tan_half_hfov / FRUSTUM_ASPECT_RATIO
+    near_distance = max(c.camera_height, FRUSTUM_BODY_HEIGHT - c.camera_height) / tan_half_vfov
+    body_radius = (CV_BODY_RADIUS / CV_M_TO_PIXELS) * 100
+    side_margin = body_radius * np.sqrt(1 + tan_half_hfov**2) # distance of wedge side to body center at body radius
+
+    num_thetas = 1
+    if theta_max != theta_min:
+        num_thetas = int(np.ceil(abs(theta_max - theta_min) / FRUSTUM_THETA_STEP)) + 1
+
+    mask = np.zeros((imagesize, imagesize), dtype=np.float32)
+    for theta in np.linspace(theta_min, theta_max, num_thetas):
+        yaw = np.radians(cameraroot_yaw + theta)
+        (direction_x, direction_y) = (np.cos(yaw), np.sin(yaw))
+        camera_x = cameraroot_x - camera_distance * direction_x
+        camera_y = cameraroot_y - camera_distance * direction_y
+
+        # Camera space: forward along view direction, right along Unreal Y rotated by yaw
+        forward = (points_x - camera_x) * direction_x + (points_y - camera_y) * direction_y
+        right = -(points_x - camera_x) * direction_y + (points_y - camera_y) * direction_x
+        mask += (forward >= near_distance) & (np.abs(right) <= (forward * tan_half_hfov - side_margin))
+
+    return mask / num_thetas
+
+################################################################################
+# Feasibility map placement
+################################################################################
+
+def get_offset_cells(value_min, value_max, sign):
+    """
+    Get all integer pixel offsets covered by the Unreal coordinate range [value_min, value_max] [cm].
+    sign=-1 for Unreal X (image rows), sign=1 for Unreal Y (image columns), see get_image_offset_from_unreal().
+    Returns list of (offset, cell_min, cell_max, weight) where weight is the length of the coordinate interval mapping to offset.
+    """
+    scale = CV_M_TO_PIXELS / 100
+    cells = []
+    offset_a = round(sign * value_min * scale)
+    offset_b = round(sign * value_max * scale)
+    for offset in range(min(offset_a, offset_b), max(offset_a, offset_b) + 1):
+        # Coordinate interval which rounds to current offset
+        cell_min = max(value_min, min(sign * (offset - 0.5) / scale, sign * (offset + 0.5) / scale))
+        cell_max = min(value_max, max(sign * (offset - 0.5) / scale, sign * (offset + 0.5) / scale))
+        if value_min == value_max:
+            cells.append( (offset, value_min, value_max, 1.0) )
+        elif cell_max > cell_min:
+            cells.append( (offset, cell_min, cell_max, cell_max - cell_min) )
+    return cells
+
+def get_rectangle_overlap_map(stamp_integral, rectangle, offsets_y, offsets_x):
+    """
+    Number of binary stamp pixels which are inside rectangle (y_min, y_max, x_min, x_max, inclusive) after stamp translation.
+    Uses summed area table (cv2.integral) lookups for all requested integer translations.
+    Returns array indexed by [offset_y_index, offset_x_index].
+    """
+    height = stamp_integral.shape[0] - 1
+    width = stamp_integral.shape[1] - 1
+    (y_min, y_max, x_min, x_max) = rectangle
+    integral = stamp_integral
+
+    offsets_y = np.asarray(offsets_y)
+    offsets_x = np.asarray(offsets_x)
+    start_y = np.clip(y_min - offsets_y, 0, height)[:, None]
+    end_y = np.clip(y_max + 1 - offsets_y, 0, height)[:, None]
+    start_x = np.clip(x_min - offsets_x, 0, width)[None, :]
+    end_x = np.clip(x_max + 1 - offsets_x, 0, width)[None, :]
+
+    return integral[end_y, end_x] - integral[start_y, end_x] - integral[end_y, start_x] + integral[start_y, start_x]
+
+def get_correlation_overlap_map(mask_spectrum, size, stamp, offsets_y, offsets_x):
+    """
+    Number of binary stamp pixels overlapping binary mask after stamp translation, via FFT cross-correlation.
+    mask_spectrum is the zero padded (size x size) spectrum of the mask, see get_feasibility_maps().
+    Stamp pixels translated outside of the mask frame are ignored, like in transform_image().
+    Returns array indexed by [offset_y_index, offset_x_index].
+    """
+    stamp_spectrum = np.fft.rfft2(stamp.astype(np.float64), s=(size, size))
+    overlap = np.fft.irfft2(np.conj(stamp_spectrum) * mask_spectrum, s=(size, size))
+    # Negative translations wrap around to the end of the zero padded correlation result
+    return overlap[np.ix_(np.asarray(offsets_y) % size, np.asarray(offsets_x) % size)]
+
+def get_yaw_bin_stamp(ground_trajectory_mask, center, yaw_min, yaw_max):
+    """
+    Union of the rotated trajectory stamps of all yaws in [yaw_min, yaw_max].
+    Rotation steps are chosen so that the outermost stamp pixel moves less than one pixel between steps.
+    """
+    (stamp_y, stamp_x) = np.nonzero(ground_trajectory_mask)
+    radius = max(np.sqrt(((stamp_x - center[0])**2 + (stamp_y - center[1])**2).max()), 1.0)
+    num_yaws = int(np.ceil(abs(yaw_max - yaw_min) / np.degrees(1.0 / radius))) + 1
+
+    height, width = ground_trajectory_mask.shape
+    stamp = np.zeros((height, width), dtype=bool)
+    for yaw in np.linspace(yaw_min, yaw_max, num_yaws):
+        # Same rotation as transform_image() so that map matches exact test at sampled yaws
+        R = cv2.getRotationMatrix2D(center=center, angle=-yaw, scale=1)
+        stamp |= cv2.warpAffine(ground_trajectory_mask, R, (width, height)) > 0
+
+    return stamp
+
+def get_feasibility_maps(c, data, ground_trajectory_mask, area_boundary_mask, occupancy_image_mask, rows, columns, body_yaw):
+    """
+    Build feasible position maps for all yaw bins in one shot.
+    Union of the rotated trajectory stamps over the yaw bin is correlated with the safety zone boundary mask and the current ground occupancy mask,
+    so that a valid position is feasible for all yaws of the bin.
+    Returns list of (yaw_bin_min, yaw_bin_max, valid) where valid is boolean array indexed by [row_cell_index, column_cell_index].
+    """
+    offsets_y = [cell[0] for cell in rows]
+    offsets_x = [cell[0] for cell in columns]
+    max_offset = max(abs(offset) for offset in (offsets_y + offsets_x))
+
+    height, width = ground_trajectory_mask.shape
+    center = ( (width-1)/2, (height-1)/2 )
+
+    # Area boundary mask is the full image frame minus the filled safety zone rectangle
+    (safety_y, safety_x) = np.nonzero(area_boundary_mask == 0)
+    frame = (0, height - 1, 0, width - 1)
+    safety_zone = (safety_y.min(), safety_y.max(), safety_x.min(), safety_x.max())
+    if len(safety_y) != (safety_zone[1] - safety_zone[0] + 1) * (safety_zone[3] - safety_zone[2] + 1):
+        print("ERROR: Feasibility map placement requires rectangular safety zone", file=sys.stderr)
+        sys.exit(1)
+
+    # Occupancy mask spectrum is shared by all yaw bins. Padding avoids circular wrap-around for all used translations.
+    image_height, image_width = data.image.shape
+    image_start_y = (height - image_height) // 2
+    image_start_x = (width - image_width) // 2
+
+    occupancy_spectrum = None
+    if np.any(occupancy_image_mask):
+        occupancy_fft_size = cv2.getOptimalDFTSize(max(image_height, image_width) + max_offset)
+        occupancy_spectrum = np.fft.rfft2((occupancy_image_mask > 0).astype(np.float64), s=(occupancy_fft_size, occupancy_fft_size))
+
+    yaw_bins = c.placement_yaw_bins
+    if c.yaw_min == c.yaw_max:
+        yaw_bins = 1
+    yaw_bin_width = (c.yaw_max - c.yaw_min) / yaw_bins
+
+    feasibility_maps = []
+    for yaw_bin in range(yaw_bins):
+        yaw_bin_min = c.yaw_min + yaw_bin * yaw_bin_width
+        yaw_bin_max = yaw_bin_min + yaw_bin_width
+        stamp = get_yaw_bin_stamp(ground_trajectory_mask, center, apply_body_yaw(yaw_bin_min, body_yaw), apply_body_yaw(yaw_bin_max, body_yaw))
+
+        # Stamp pixels inside image frame but outside of safety zone
+        stamp_integral = cv2.integral(stamp.astype(np.uint8))
+        overlap = get_rectangle_overlap_map(stamp_integral, frame, offsets_y, offsets_x) - get_rectangle_overlap_map(stamp_integral, safety_zone, offsets_y, offsets_x)
+        valid = overlap == 0
+
+        if (occupancy_spectrum is not None) and np.any(valid):
+            # Rotated body image is the center crop of the rotated padded trajectory mask
+            stamp_image = stamp[image_start_y:(image_start_y + image_height), image_start_x:(image_start_x + image_width)]
+            overlap = get_correlation_overlap_map(occupancy_spectrum, occupancy_fft_size, stamp_image, offsets_y, offsets_x)
+            valid &= overlap < 0.5
+
+        feasibility_maps.append( (yaw_bin_min, yaw_bin_max, valid) )
+
+    return feasibility_maps
+
+def get_feasible_location(c, data, ground_trajectory_mask, area_boundary_mask, occupancy_image_mask, x_min, x_max, y_min, y_max, body_yaw, frustum_mask):
+    """
+    Sample body location directly from the valid pixels of the yaw bin feasibility maps.
+    Candidates are weighted by covered coordinate area and verified with the exact location test at a random yaw inside the yaw bin,
+    which includes the camera frustum constraint. Candidates failing the exact test are removed until no candidate is left.
+    Returns (x, y, yaw, target_image, trials) or None if no feasible location exists in the given area.
+    """
+    rows = get_offset_cells(x_min, x_max, -1)
+    columns = get_offset_cells(y_min, y_max, 1)
+
+    feasibility_maps = get_feasibility_maps(c, data, ground_trajectory_mask, area_boundary_mask, occupancy_image_mask, rows, columns, body_yaw)
+
+    row_weights = np.array([cell[3] for cell in rows])
+    column_weights = np.array([cell[3] for cell in columns])
+    cell_weights = np.outer(row_weights, column_weights)
+
+    # Stack valid maps to (yaw_bin, row, column) and weight valid cells by covered coordinate area
+    valid = np.stack([valid for (_, _, valid) in feasibility_maps])
+    weights = np.where(valid, cell_weights[None, :, :], 0.0).ravel()
+    cum_weights = np.cumsum(weights)
+    if cum_weights[-1] <= 0.0:
+        return None
+
+    trials = 0
+    removed_weight = 0.0
+    while True:
+        if removed_weight > (cum_weights[-1] / 2):
+            # Rebuild sampling distribution without removed candidates, removed candidates are skipped until then
+            cum_weights = np.cumsum(weights)
+            removed_weight = 0.0
+            if cum_weights[-1] <= 0.0:
+                return None
+
+        candidate_index = int(np.searchsorted(cum_weights, random.uniform(0.0, cum_weights[-1]), side="right"))
+        candidate_index = min(candidate_index, len(cum_weights) - 1)
+        if weights[candidate_index] <= 0.0:
+            continue # removed candidate or zero weight boundary hit
+
+        (yaw_bin_index, row_index, column_index) = np.unravel_index(candidate_index, valid.shape)
+        (yaw_bin_min, yaw_bin_max, _) = feasibility_maps[yaw_bin_index]
+
+        x = random.uniform(rows[row_index][1], rows[row_index][2])
+        y = random.uniform(columns[column_index][1], columns[column_index][2])
+        yaw = apply_body_yaw(random.uniform(yaw_bin_min, yaw_bin_max), body_yaw)
+
+        trials += 1
+        (status, target_image) = test_location(data, ground_trajectory_mask, area_boundary_mask, occupancy_image_mask, x, y, yaw, frustum_mask)
+        if status == "valid":
+            return (x, y, yaw, target_image, trials)
+
+        removed_weight += weights[candidate_index]
+        weights[candidate_index] = 0.0
+
 
-def get_location_data(c, grouptype, sequence_index, used_subjects, used_animations, animation_folder, location_occupancy_mask, body_yaw_reference):
+################################################################################
+# Capsule collision placement
+################################################################################
+
+def get_capsules(data, start_frame, time_bucket_frames):
+    """
+    Simplified body local ground trajectory polylines of used animation frames in Unreal coordinates [cm].
+    Returns list of (time_bucket, points). Without time buckets a single polyline covers all frames (time_bucket=None).
+    """
+    points = get_frame_points(data, start_frame)
+    if time_bucket_frames <= 0:
+        return [ (None, simplify_polyline(points, CAPSULE_SIMPLIFY_TOLERANCE)) ]
+
+    capsules = []
+    for (time_bucket, frame) in enumerate(range(0, len(points), time_bucket_frames)):
+        # Include first frame of next time bucket to cover motion between buckets
+        capsules.append( (time_bucket, simplify_polyline(points[frame : (frame + time_bucket_frames + 1)], CAPSULE_SIMPLIFY_TOLERANCE)) )
+    return capsules
+
+def get_image_coordinates_from_unreal(imagesize, unreal_points):
+    center = (imagesize - 1) / 2
+    image_x = center + (unreal_points[:, 1] / 100) * CV_M_TO_PIXELS
+    image_y = center - (unreal_points[:, 0] / 100) * CV_M_TO_PIXELS
+    return np.round(np.stack((image_x, image_y), axis=1)).astype(np.int32)
+
+def get_frustum_test(frustum_mask, data, start_frame):
+    """
+    Frustum constraint argument of test_location_capsules() for given animation start frame, None if constraint is not used
+    """
+    if frustum_mask is None:
+        return None
+    return (frustum_mask, get_frame_points(data, start_frame))
+
+def test_location_capsules(capsules, radius, safety_zone, capsule_hash, mask_distance_field, x, y, yaw, frustum=None):
+    """
+    Check single body placement candidate against stage area boundary, camera frustum constraint, stage occupancy mask and already placed capsules.
+    frustum is optional (frustum_mask, frame_points) of the tested animation start frame.
+    Returns (status, target_capsules) where status is "valid", "boundary" or "occupied". Leaving the camera view counts as "boundary".
+    """
+    # Time bucket polylines share their end points, so all buckets together form the full trajectory polyline
+    # which is transformed and tested against the time independent constraints at once
+    points = capsules[0][1]
+    if len(capsules) > 1:
+        points = np.concatenate([points for (_, points) in capsules])
+    target_points = transform_polyline(points, x, y, yaw)
+
+    (x_min, x_max, y_min, y_max) = safety_zone
+    if not is_inside_rectangle(target_points, radius, x_min, x_max, y_min, y_max):
+        return ("boundary", None)
+
+    if frustum is not None:
+        (frustum_mask, frame_points) = frustum
+        if not frustum_mask.test(frame_points, x, y, yaw):
+            return ("boundary", None)
+
+    if mask_distance_field is not None:
+        if mask_distance_field.intersects(target_points, radius):
+            return ("occupied", None)
+
+    target_capsules = []
+    offset = 0
+    for (time_bucket, points) in capsules:
+        target_capsules.append( (time_bucket, target_points[offset:(offset + len(points))]) )
+        offset += len(points)
+
+    # Time buckets are tested in order, test stops at first occupied time bucket
+    for (time_bucket, target_points) in target_capsules:
+        (segments_start, segments_end) = get_polyline_segments(target_points)
+        if capsule_hash.intersects(segments_start, segments_end, radius, time_bucket):
+            return ("occupied", None)
+
+    return ("valid", target_capsules)
+
+def insert_capsules(capsule_hash, target_capsules, radius):
+    for (time_bucket, target_points) in target_capsules:
+        (segments_start, segments_end) = get_polyline_segments(target_points)
+        capsule_hash.insert(segments_start, segments_end, radius, time_bucket)
+
+def get_joint_location_capsules(c, capsules, radius, safety_zone, mask_distance_field, body_hashes, x_min, x_max, y_min, y_max, body_yaw, frustum):
+    """
+    Joint placement: sample locations which only collide with already placed bodies and return the one colliding with the fewest bodies.
+    Returns (x, y, yaw, target_capsules, conflicts) where conflicts are the indices of colliding placed bodies, or None.
+    """
+    empty_hash = CapsuleSpatialHash(CAPSULE_HASH_CELL_SIZE)
+    location = None
+    for _ in range(PLACEMENT_JOINT_TRIALS):
+        x = random.uniform(x_min, x_max)
+        y = random.uniform(y_min, y_max)
+        yaw = apply_body_yaw(random.uniform(c.yaw_min, c.yaw_max), body_yaw)
+
+        placement_statistics["trials"] += 1
+        (status, target_capsules) = test_location_capsules(capsules, radius, safety_zone, empty_hash, mask_distance_field, x, y, yaw, frustum)
+        if status != "valid":
+            continue
+
+        conflicts = []
+        for (index, body_hash) in enumerate(body_hashes):
+            if body_hash is None:
+                continue
+            for (time_bucket, target_points) in target_capsules:
+                (segments_start, segments_end) = get_polyline_segments(target_points)
+                if body_hash.intersects(segments_start, segments_end, radius, time_bucket):
+                    conflicts.append(index)
+                    break
+
+        if (location is None) or (len(conflicts) < len(location[4])):
+            location = (x, y, yaw, target_capsules, conflicts)
+            if len(conflicts) <= 1:
+                break
+
+    return location
+
+def get_capsule_locations(c, grouptype, sequence_index, location_data_areasorted, location_occupancy_mask, frustum_mask, body_yaw_reference):
+    """
+    Find body locations with continuous capsule collision tests. Bodies are placed in given order,
+    placement_solver="joint" evicts and relocates colliding placed bodies if a body cannot be placed.
+    With time buckets (space-time occupancy) bodies only collide if they occupy the same ground in the same time bucket
+    and alternative animation start frames are tested for occupied locations.
+    """
+    # Body radius is specified in ground occupancy image pixels, simplified polylines deviate up to tolerance from source trajectory
+    radius = (CV_BODY_RADIUS / CV_M_TO_PIXELS) * 100 + CAPSULE_SIMPLIFY_TOLERANCE
+
+    # Safety zone in stage local Unreal coordinates, image Y corresponds to Unreal X
+    safety_zone = (-c.safety_zone_height / 2, c.safety_zone_height / 2, -c.safety_zone_width / 2, c.safety_zone_width / 2)
+
+    capsule_hash = CapsuleSpatialHash(CAPSULE_HASH_CELL_SIZE)
+
+    mask_distance_field = None
+    if location_occupancy_mask is not None:
+        mask_distance_field = MaskDistanceField(location_occupancy_mask, 100 / CV_M_TO_PIXELS)
+
+    placed_capsules = [ None ] * len(location_data_areasorted)
+    body_hashes = [ None ] * len(location_data_areasorted) # per body spatial hashes for joint placement conflict tests
+    pending = list(range(len(location_data_areasorted)))
+    relocations = 0
+    evicted = set()
+    while len(pending) > 0:
+        index = pending.pop(0)
+        data = location_data_areasorted[index]
+        print(f"  Processing: {data.subject_name}_{data.animation_name}", file=sys.stderr)
+
+        capsules = { data.start_frame: get_capsules(data, data.start_frame, c.time_bucket_frames) } # cache for alternative start frames
+        frustums = { data.start_frame: get_frustum_test(frustum_mask, data, data.start_frame) }
+
+        # Joint placement: evict colliding bodies once per body visit instead of first body area increase
+        joint_available = (c.placement_solver == "joint") and (relocations < PLACEMENT_JOINT_RELOCATION_LIMIT) and (index not in evicted) # no eviction chains
+        conflicts = []
+
+        body_yaw = None
+        if body_yaw_reference is not None:
+            body = f"{data.subject_name}_{data.animation_name}"
+            body_yaw = body_yaw_reference[body]
+
+        target_capsules = None
+        target_location_test_index = 1
+        safety_zone_test_index = 1
+        start_frame_trials = 0
+        x_min = c.x_min
+        x_max = c.x_max
+        y_min = c.y_min
+        y_max = c.y_max
+
+        while target_capsules is None:
+            if target_location_test_index % 5000 == 0:
+                # Greedy budget exhausted, evict colliding bodies instead of increasing body area
+                if joint_available:
+                    joint_available = False
+                    location = get_joint_location_capsules(c, capsules[data.start_frame], radius, safety_zone, mask_distance_field, body_hashes, x_min, x_max, y_min, y_max, body_yaw, frustums[data.start_frame])
+                    if location is not None:
+                        (data.x, data.y, data.yaw, target_capsules, conflicts) = location
+                        break
+
+                offset = 20
+                x_min -= offset
+                x_max += offset
+                y_min -= offset
+                y_max += offset
+                print(f"  Increasing body area: Location trial={target_location_test_index}, x=[{x_min}, {x_max}], y=[{y_min}, {y_max}], safety_zone_test_index={safety_zone_test_index}", file=sys.stderr)
+                if x_max > max(500, c.safety_zone_height / 2):
+                    print("  WARNING: body area too large", file=sys.stderr)
+                    return False
+
+                target_location_test_index += 1 # prevent immediate retrigger if subsequent safety zone test fails
+
+            # Give up if we cannot find safety zone location within reasonable time
+            if safety_zone_test_index % 10000 == 0:
+                print(f"  WARNING: Safety zone test failed: Zone trial={safety_zone_test_index}", file=sys.stderr)
+                return False
+
+            x = random.uniform(x_min, x_max)
+            y = random.uniform(y_min, y_max)
+
+            yaw = apply_body_yaw(random.uniform(c.yaw_min, c.yaw_max), body_yaw)
+
+            placement_statistics["trials"] += 1
+            (status, target_capsules) = test_location_capsules(capsules[data.start_frame], radius, safety_zone, capsule_hash, mask_distance_field, x, y, yaw, frustums[data.start_frame])
+
+            # Space-time occupancy: try one alternative animation start frame before rejecting location, limited per body
+            if (status == "occupied") and (start_frame_trials < SPACETIME_START_FRAME_TRIALS) and (c.time_bucket_frames > 0) and (data.frames > data.used_frames):
+                start_frame_trials += 1
+                start_frame = random.randint(0, data.frames - data.used_frames)
+                if start_frame not in capsules:
+                    capsules[start_frame] = get_capsules(data, start_frame, c.time_bucket_frames)
+                    frustums[start_frame] = get_frustum_test(frustum_mask, data, start_frame)
+
+                placement_statistics["trials"] += 1
+                (alternative_status, alternative_capsules) = test_location_capsules(capsules[start_frame], radius, safety_zone, capsule_hash, mask_distance_field, x, y, yaw, frustums[start_frame])
+                if alternative_status == "valid":
+                    (status, target_capsules) = (alternative_status, alternative_capsules)
+                    data.start_frame = start_frame
+
+            if status != "boundary":
+                target_location_test_index += 1
+                if status == "valid":
+                    data.x = x
+                    data.y = y
+                    data.yaw = yaw
+            else:
+                # Safety zone test failed
+                safety_zone_test_index += 1
+
+        # Remove evicted bodies and place them again next with new start frame
+        for conflict_index in conflicts:
+            evicted_data = location_data_areasorted[conflict_index]
+            print(f"  Relocating: {evicted_data.subject_name}_{evicted_data.animation_name}", file=sys.stderr)
+            placed_capsules[conflict_index] = None
+            body_hashes[conflict_index] = None
+            randomize_start_frame(evicted_data)
+
+        relocations += len(conflicts)
+        evicted.update(conflicts)
+        pending = conflicts + pending
+
+        placed_capsules[index] = target_capsules
+        if c.placement_solver == "joint":
+            body_hashes[index] = CapsuleSpatialHash(CAPSULE_HASH_CELL_SIZE)
+            insert_capsules(body_hashes[index], target_capsules, radius)
+
+        if len(conflicts) > 0:
+            # Spatial hash does not support removal, rebuild from remaining bodies
+            capsule_hash = CapsuleSpatialHash(CAPSULE_HASH_CELL_SIZE)
+            for target_capsules in placed_capsules:
+                if target_capsules is not None:
+                    insert_capsules(capsule_hash, target_capsules, radius)
+        else:
+            insert_capsules(capsule_hash, target_capsules, radius)
+
+    target_polylines = [ [target_points for (_, target_points) in target_capsules] for target_capsules in placed_capsules ]
+
+    # Save ground trajectory image covering the full safety zone
+    extent = max(c.safety_zone_width, c.safety_zone_height) / 2 + 100
+    imagesize = 2 * round((extent / 100) * CV_M_TO_PIXELS) + 1
+    ground_trajectories = np.zeros( (imagesize, imagesize, 3), dtype=np.uint8)
+
+    (x_min, x_max, y_min, y_max) = safety_zone
+    boundary = get_image_coordinates_from_unreal(imagesize, np.array([[x_max, y_min], [x_min, y_max]]))
+    cv2.rectangle(ground_trajectories, tuple(boundary[0].tolist()), tuple(boundary[1].tolist()), (64, 64, 64), 1)
+
+    if location_occupancy_mask is not None:
+        mask_offset = (imagesize - location_occupancy_mask.shape[0]) // 2
+        if mask_offset >= 0:
+            mask_area = ground_trajectories[mask_offset:(mask_offset + location_occupancy_mask.shape[0]), mask_offset:(mask_offset + location_occupancy_mask.shape[1])]
+            mask_area[location_occupancy_mask > 0] = (0, 0, 255) # bgr
+
+    thickness = 2 * CV_BODY_RADIUS + 1
+    for (index, polylines) in enumerate(target_polylines):
+        (r, g, b) = rgb_colors[index % len(rgb_colors)]
+        color = (round(255 * b), round(255 * g), round(255 * r)) # bgr
+        image_polylines = [ get_image_coordinates_from_unreal(imagesize, target_points) for target_points in polylines ]
+        cv2.polylines(ground_trajectories, image_polylines, False, color, thickness)
+        for image_point in (image_polylines[0][0], image_polylines[-1][-1]):
+            cv2.circle(ground_trajectories, tuple(image_point.tolist()), CV_BODY_RADIUS, color, -1)
+
+    output_root = OUTPUT_IMAGE_ROOT / grouptype / "ground_trajectories"
+    output_root.mkdir(parents=True, exist_ok=True)
+    output_image_path = output_root / f"ground_trajectories_{sequence_index:06d}.png"
+    cv2.imwrite(str(output_image_path), ground_trajectories)
+
+    return True
+
+def get_location_data(c, grouptype, sequence_index, used_subjects, used_animations, animation_folder, location_occupancy_mask, frustum_mask, body_yaw_reference):
     location_data = []
     frame_rate_divisor = None
     for index, subject in enumerate(used_subjects):
@@ -91,24 +719,31 @@ def get_location_data(c, grouptype, sequence_index, used_subjects, used_animatio
 
         # Load animation data
         # Animation data must be in SMPL-X orientation notation (Y-up)
-        filepath = animation_folder / subject / "moving_body_para" / animation_name / "motion_seq.npz" # BEDLAM CVPR
-        if not filepath.exists():
-            filepath = animation_folder / subject / animation_name / "motion_seq.npz"
-            if not filepath.exists():
-                filepath = animation_folder / f"{subject}_{animation_name}.npz"
+        trans_30 = None
+        if trajectory_index is not None:
+            (trans_30, mocap_frame_rate) = trajectory_index.get_trans(subject, animation_name)
+            if trans_30 is None:
+                print(f"WARNING: Animation not in trajectory index, loading source data: {subject}_{animation_name}", file=sys.stderr)
+            else:
+                if frame_rate_divisor is None:
+                    frame_rate_divisor = get_frame_rate_divisor(mocap_frame_rate)
+                elif get_frame_rate_divisor(mocap_frame_rate) != frame_rate_divisor:
+                    # Indexed trajectory was downsampled with different divisor, use source data
+                    trans_30 = None
+
+        if trans_30 is None:
+            filepath = get_animation_npz_path(animation_folder, subject, animation_name)
+            with np.load(filepath) as data:
+                trans = data["trans"]
+                mocap_frame_rate = data["mocap_frame_rate"]
 
-        with np.load(filepath) as data:
-            trans = data["trans"]
-            mocap_frame_rate = data["mocap_frame_rate"]
+                if frame_rate_divisor is None:
+                    frame_rate_divisor = get_frame_rate_divisor(mocap_frame_rate)
 
-            if frame_rate_divisor is None:
-                frame_rate_divisor = 1
-                if mocap_frame_rate > 30:
-                    frame_rate_divisor = int(mocap_frame_rate / 30)
+                # Downsample animation to 30fps via list slicing
+                trans_30 = trans[::frame_rate_divisor]
 
-            # Downsample animation to 30fps via list slicing
-            trans_30 = trans[::frame_rate_divisor]
-            frames = len(trans_30)
+        frames = len(trans_30)
 
         data = SubjectLocationData(subject, animation_name, frames, 0.0, trans_30, None, 0, 0, 0, 0, 0)
         location_data.append(data)
@@ -148,21 +783,15 @@ def get_location_data(c, grouptype, sequence_index, used_subjects, used_animatio
                     location_data_areasorted.append(data)
                     break
 
+    if c.collision == "capsule":
+        if not get_capsule_locations(c, grouptype, sequence_index, location_data_areasorted, location_occupancy_mask, frustum_mask, body_yaw_reference):
+            return None
+        release_location_data(location_data)
+        return adjust_sequence_lengths(location_data)
+
     # Generate ground occupancy masks for unmodified animations
     for data in location_data_areasorted:
-        radius = CV_BODY_RADIUS
-        current_location_image = np.zeros( (CV_IMAGESIZE, CV_IMAGESIZE), dtype=np.uint8)
-        trans = data.trans[data.start_frame : (data.start_frame + data.used_frames), :]
-        for position in trans:
-            # Mark occupied area
-            circle_center = get_image_coordinates_from_smplx(CV_IMAGESIZE, position[0], position[2])
-            cv2.circle(current_location_image, circle_center, radius, 255, -1)
-
-        # Debug image output
-        #cv2.imwrite(f"{data.subject_name}_{data.animation_name}.png", current_location_image)
-
-        # Store image
-        data.image = current_location_image
+        data.image = get_ground_trajectory_image(data)
 
 
     # Initialize stage occlusion mask
@@ -174,28 +803,44 @@ def get_location_data(c, grouptype, sequence_index, used_subjects, used_animatio
         occupancy_image_mask = location_occupancy_mask
         occupancy_image = cv2.cvtColor(occupancy_image_mask, cv2.COLOR_GRAY2BGR) * (0.0, 0.0, 1.0) # bgr
 
-    # Find target locations
-    for (index, data) in enumerate(location_data_areasorted):
-        print(f"  Processing: {data.subject_name}_{data.animation_name}", file=sys.stderr)
+    # Generate mask to check if animation is leaving the area boundary
+    area_boundary_size = (CV_IMAGESIZE - 1) * 2 + 1
+    area_boundary_mask = np.ones( (area_boundary_size, area_boundary_size), dtype=np.uint8) * 255
 
-        # Randomize position and yaw and check if leaving area boundary
+    center_x = round( (area_boundary_size-1) / 2 )
+    safety_zone_width_pixels = round( (c.safety_zone_width / 100) * CV_M_TO_PIXELS)
+    safety_start_x = center_x - round( safety_zone_width_pixels / 2 )
+    safety_end_x = center_x + round( safety_zone_width_pixels / 2 )
 
-        # Generate mask to check if animation is leaving the area boundary
-        area_boundary_size = (CV_IMAGESIZE - 1) * 2 + 1
-        area_boundary_mask = np.ones( (area_boundary_size, area_boundary_size), dtype=np.uint8) * 255
+    center_y = round( (area_boundary_size-1) / 2 )
+    safety_zone_height_pixels = round( (c.safety_zone_height / 100) * CV_M_TO_PIXELS)
+    safety_start_y = center_y - round( safety_zone_height_pixels / 2 )
+    safety_end_y = center_y + round( safety_zone_height_pixels / 2 )
 
-        center_x = round( (area_boundary_size-1) / 2 )
-        safety_zone_width_pixels = round( (c.safety_zone_width / 100) * CV_M_TO_PIXELS)
-        safety_start_x = center_x - round( safety_zone_width_pixels / 2 )
-        safety_end_x = center_x + round( safety_zone_width_pixels / 2 )
+    cv2.rectangle(area_boundary_mask, (safety_start_x, safety_start_y), (safety_end_x, safety_end_y), 0, -1)
+    #cv2.imwrite(f"area_boundary_mask.png", area_boundary_mask)
+
+    start_x = round((CV_IMAGESIZE-1)/2)
+    start_y = start_x
+    height, width = (CV_IMAGESIZE, CV_IMAGESIZE)
+
+    stage_occupancy_mask = occupancy_image_mask # stage occupancy without placed bodies, used for joint placement
+
+    # Find target locations
+    target_images = [ None ] * len(location_data_areasorted)
+    pending = list(range(len(location_data_areasorted)))
+    relocations = 0
+    evicted = set()
+    while len(pending) > 0:
+        index = pending.pop(0)
+        data = location_data_areasorted[index]
+        print(f"  Processing: {data.subject_name}_{data.animation_name}", file=sys.stderr)
 
-        center_y = round( (area_boundary_size-1) / 2 )
-        safety_zone_height_pixels = round( (c.safety_zone_height / 100) * CV_M_TO_PIXELS)
-        safety_start_y = center_y - round( safety_zone_height_pixels / 2 )
-        safety_end_y = center_y + round( safety_zone_height_pixels / 2 )
+        # Randomize position and yaw and check if leaving area boundary
 
-        cv2.rectangle(area_boundary_mask, (safety_start_x, safety_start_y), (safety_end_x, safety_end_y), 0, -1)
-        #cv2.imwrite(f"area_boundary_mask.png", area_boundary_mask)
+        # Joint placement: evict colliding bodies once per body visit instead of first body area increase
+        joint_available = (c.placement_solver == "joint") and (relocations < PLACEMENT_JOINT_RELOCATION_LIMIT) and (index not in evicted) # no eviction chains
+        conflicts = []
 
         target_image = None
         target_image_location_test_index = 1
@@ -205,11 +850,49 @@ def get_location_data(c, grouptype, sequence_index, used_subjects, used_animatio
         y_min = c.y_min
         y_max = c.y_max
 
-        start_x = round((CV_IMAGESIZE-1)/2)
-        start_y = start_x
+        ground_trajectory_mask = np.zeros( (area_boundary_size, area_boundary_size), dtype=np.uint8)
+        # Copy current template trajectory in larger mask at center
+        ground_trajectory_mask[start_y:(start_y + height), start_x:(start_x + width)] = data.image
+
+        body_yaw = None
+        if body_yaw_reference is not None:
+            body = f"{data.subject_name}_{data.animation_name}"
+            body_yaw = body_yaw_reference[body]
+
+        while (c.placement == "feasibility") and (target_image is None):
+            location = get_feasible_location(c, data, ground_trajectory_mask, area_boundary_mask, occupancy_image_mask, x_min, x_max, y_min, y_max, body_yaw, frustum_mask)
+            if location is None:
+                if joint_available:
+                    joint_available = False
+                    location = get_joint_location(c, data, ground_trajectory_mask, area_boundary_mask, stage_occupancy_mask, target_images, x_min, x_max, y_min, y_max, body_yaw, frustum_mask)
+                    if location is not None:
+                        (data.x, data.y, data.yaw, target_image, conflicts) = location
+                        break
+
+                offset = 20
+                x_min -= offset
+                x_max += offset
+                y_min -= offset
+                y_max += offset
+                print(f"  Increasing body area: No feasible location, x=[{x_min}, {x_max}], y=[{y_min}, {y_max}]", file=sys.stderr)
+                if x_max > 500:
+                    print(f"  WARNING: body area too large", file=sys.stderr)
+                    return None
+                continue
+
+            (data.x, data.y, data.yaw, target_image, trials) = location
+            placement_statistics["trials"] += trials
 
         while target_image is None:
             if target_image_location_test_index % 5000 == 0:
+                # Greedy budget exhausted, evict colliding bodies instead of increasing body area
+                if joint_available:
+                    joint_available = False
+                    location = get_joint_location(c, data, ground_trajectory_mask, area_boundary_mask, stage_occupancy_mask, target_images, x_min, x_max, y_min, y_max, body_yaw, frustum_mask)
+                    if location is not None:
+                        (data.x, data.y, data.yaw, target_image, conflicts) = location
+                        break
+
                 offset = 20
                 x_min -= offset
                 x_max += offset
@@ -230,33 +913,15 @@ def get_location_data(c, grouptype, sequence_index, used_subjects, used_animatio
             x = random.uniform(x_min, x_max)
             y = random.uniform(y_min, y_max)
 
-            yaw = random.uniform(c.yaw_min, c.yaw_max)
-
-            if body_yaw_reference is not None:
-                body = f"{data.subject_name}_{data.animation_name}"
-                body_yaw = body_yaw_reference[body]
-                yaw = yaw + 90 + body_yaw # apply body yaw reference normalization, default Unreal body looks along Y-axis and needs yaw+=90 to face camera
+            yaw = apply_body_yaw(random.uniform(c.yaw_min, c.yaw_max), body_yaw)
 
-            ground_trajectory_mask = np.zeros( (area_boundary_size, area_boundary_size), dtype=np.uint8)
-            height, width = data.image.shape
-            # Copy current template trajectory in larger mask at center
-            ground_trajectory_mask[start_y:(start_y + height), start_x:(start_x + width)] = data.image
+            placement_statistics["trials"] += 1
+            (status, target_image) = test_location(data, ground_trajectory_mask, area_boundary_mask, occupancy_image_mask, x, y, yaw, frustum_mask)
 
-
-            ground_trajectory_mask_r_t = transform_image(ground_trajectory_mask, x, y, yaw)
-
-            area_mask_test = cv2.bitwise_and(area_boundary_mask, ground_trajectory_mask_r_t)
-            #cv2.imwrite(f"test_r_t_{index}_masked.png", area_mask_test)
-
-            if not np.any(area_mask_test):
+            if status != "boundary":
                 target_image_location_test_index += 1
-                # No overlap with outside boundary, we have valid area trajectory and can do occupancy overlap check next
-                target_image = transform_image(data.image, x, y, yaw)
-
-                occupancy_test = cv2.bitwise_and(occupancy_image_mask, target_image)
-                if np.any(occupancy_test):
+                if status == "occupied":
                     # Failed test, we are overlapping, need to try with new location
-                    target_image = None
                     continue
 
                 # Valid trajectory without occupancy overlap found
@@ -269,14 +934,25 @@ def get_location_data(c, grouptype, sequence_index, used_subjects, used_animatio
                 # Safety zone test failed
                 safety_zone_test_index += 1
 
-        # Color table (20 entries, generated with distinctipy)
-        rgb_colors = [(0.9719224153972289, 0.0006387120046262851, 0.9572435498906621), (0.0, 1.0, 0.0), (0.0, 0.5, 1.0), (1.0, 0.5, 0.0), (0.5, 0.75, 0.5),
-                      (0.30263956385061963, 0.02589151037218751, 0.6757257307743725), (0.8216012497248589, 0.0026428145851382645, 0.20847626796262153), (0.01267507572944171, 0.49697306807148534, 0.17396314179520123), (0.0, 1.0, 1.0), (0.9698728055826683, 0.5021762913810213, 0.7875501077376108),
-                      (1.0, 1.0, 0.0), (0.0, 1.0, 0.5), (0.510314116241271, 0.3232218781514624, 0.09891582182150804), (0.520147512582225, 0.8462498714551937, 0.00708852231806234), (0.5022640147541273, 0.3238721132368306, 0.9748299235270517),
-                      (0.5637646267468693, 0.7935494453374514, 0.9943913298776966), (0.9710018684130394, 0.8195424816067317, 0.46244870837979113), (0.26496132907909453, 0.38952992986967117, 0.5617810079535678), (0.0, 0.0, 1.0), (0.7026382639692401, 0.2676706088672629, 0.4941663340174245)]
+        # Remove evicted bodies from occupancy and place them again next with new start frame.
+        # Placed bodies never overlap so removal is exact.
+        for conflict_index in conflicts:
+            evicted_data = location_data_areasorted[conflict_index]
+            print(f"  Relocating: {evicted_data.subject_name}_{evicted_data.animation_name}", file=sys.stderr)
+            occupancy_image_mask = cv2.bitwise_and(occupancy_image_mask, cv2.bitwise_not(target_images[conflict_index]))
+            target_images[conflict_index] = None
+
+            randomize_start_frame(evicted_data)
+            evicted_data.image = get_ground_trajectory_image(evicted_data)
+
+        relocations += len(conflicts)
+        evicted.update(conflicts)
+        pending = conflicts + pending
 
         occupancy_image_mask = cv2.bitwise_or(occupancy_image_mask, target_image)
+        target_images[index] = target_image
 
+    for (index, target_image) in enumerate(target_images):
         (r, g, b) = rgb_colors[index % len(rgb_colors)]
         occupancy_image = occupancy_image + cv2.cvtColor(target_image, cv2.COLOR_GRAY2BGR) * (b, g, r) # bgr
 
@@ -296,6 +972,10 @@ def get_location_data(c, grouptype, sequence_index, used_subjects, used_animatio
 #    cv2.imwrite(str(output_image_path), occupancy_image)
     cv2.imwrite(str(output_image_path), ground_trajectories)
 
+    release_location_data(location_data)
+    return adjust_sequence_lengths(location_data)
+
+def adjust_sequence_lengths(location_data):
     # Adjust sequence lengths for proper motion blur at beginning and end
     for data in location_data:
         # Due to Unreal (5.0.3) Alembic Python import bug the last frame is invalid and we need to skip it
@@ -311,24 +991,85 @@ def get_location_data(c, grouptype, sequence_index, used_subjects, used_animatio
 
     return location_data
 
-def get_sequences(c, grouptype, subject_animations, animation_folder, body_yaw_reference, location_data, location_occupancy_masks, usage_subjects, usage_animations):
-    num_sequences = c.num_sequences
+def release_location_data(location_data):
+    """
+    Drop per-body trajectory and ground occupancy image after placement, be_seq.csv output only needs location and frame range
+    """
+    for data in location_data:
+        data.trans = None
+        data.image = None
+
+def get_sequence_location(c, sequence_index, location_data, location_occupancy_masks):
+    """
+    Returns (c, location_occupancy_mask, frustum_mask) for sequence, safety zone of c is set from stage location
+    """
+    location_occupancy_mask = None
+
+    # Camera setup for frustum constraint, cameraroot in stage local coordinates
+    (x_offset, y_offset) = (c.x_offset, c.y_offset)
+    cameraroot_yaw = 0.0
+    camera_distance = FRUSTUM_CAMERA_DISTANCE
+    if c.frustum_camera_distance >= 0:
+        camera_distance = c.frustum_camera_distance
+    (theta_min, theta_max) = (c.frustum_theta_min, c.frustum_theta_max)
 
-    use_locations = False
     if (location_data is not None) and (len(location_data) > 0):
-        use_locations = True
-
-    sequences = []
+        location_data_index = (sequence_index // c.location_sequences) % len(location_data)
+        # Set safety zone size from location data
+        size_x = float(location_data[location_data_index][5])
+        size_y = float(location_data[location_data_index][6])
+        # Stage size is specified in Unreal coordinates
+        # Image represents top down stage view with image Y corresponding to Unreal X
+        c = c._replace(safety_zone_width=size_y, safety_zone_height=size_x)
+
+        stage_name = location_data[location_data_index][0]
+        if stage_name in location_occupancy_masks:
+            location_occupancy_mask = location_occupancy_masks[stage_name]
+
+        (x_offset, y_offset) = (float(location_data[location_data_index][1]), float(location_data[location_data_index][2]))
+        cameraroot_yaw = float(location_data[location_data_index][4])
+        if (c.frustum_camera_distance < 0) and (len(location_data[location_data_index]) >= 8):
+            camera_distance = float(location_data[location_data_index][7])
+        if len(location_data[location_data_index]) >= 11:
+            (theta_min, theta_max) = (float(location_data[location_data_index][10]), float(location_data[location_data_index][11]))
+
+    frustum_mask = None
+    if c.frustum_constraint:
+        (cameraroot_x, cameraroot_y) = (0.0, 0.0)
+        if not c.override_cameraroot_location:
+            # Cameraroot stays at world origin
+            (cameraroot_x, cameraroot_y) = (-x_offset, -y_offset)
+
+        imagesize = CV_IMAGESIZE
+        if c.collision == "capsule":
+            # Capsule placement has no stage size limit, grid covers full safety zone
+            extent = max(c.safety_zone_width, c.safety_zone_height) / 2 + 100
+            imagesize = max(imagesize, 2 * round((extent / 100) * CV_M_TO_PIXELS) + 1)
+
+        mask = get_frustum_mask(c, imagesize, cameraroot_x, cameraroot_y, cameraroot_yaw, camera_distance, theta_min, theta_max)
+        if np.max(mask) < c.frustum_visible_ratio:
+            print(f"ERROR: No stage area is in camera view for frustum_visible_ratio={c.frustum_visible_ratio} of the camera yaws (theta=[{theta_min}, {theta_max}], camera_distance={camera_distance}, max view coverage={np.max(mask):.2f})", file=sys.stderr)
+            sys.exit(1)
+        frustum_mask = FrustumMask(mask, c.frustum_visible_ratio)
+
+    return (c, location_occupancy_mask, frustum_mask)
+
+def get_subject_animation_selections(c, subject_animations, usage_subjects, usage_animations):
+    """
+    Generator for subjects and animations of consecutive sequence attempts.
+    Selection does not depend on the placement result of previous attempts.
+    """
     subjects = list(subject_animations.keys())
 
     if c.unique_sequences:
         input_subjects = list(subjects)
         input_subject_animations = copy.deepcopy(subject_animations)
 
-    sequence_index = 0
-    while sequence_index < num_sequences:
-        print(f"Generating sequence: {sequence_index}", file=sys.stderr)
-        num_subjects = random.randint(c.bodies_min, c.bodies_max)
+    # Number of bodies of consecutive attempts, stratified over all sequences
+    sampler = ParameterSampler(SAMPLING_METHOD, ["bodies"], np.random.default_rng(random.getrandbits(128)), block_size=c.num_sequences)
+
+    while True:
+        num_subjects = c.bodies_min + int(get_range_index(sampler.sample(1)["bodies"], c.bodies_max - c.bodies_min + 1)[0])
 
         if c.unique_sequences:
             if len(subjects) < num_subjects:
@@ -342,20 +1083,6 @@ def get_sequences(c, grouptype, subject_animations, animation_folder, body_yaw_r
         used_subjects = []
         used_animations = []
 
-        location_occupancy_mask = None
-        if use_locations:
-            location_data_index = (sequence_index // c.location_sequences) % len(location_data)
-            # Set safety zone size from location data
-            size_x = float(location_data[location_data_index][5])
-            size_y = float(location_data[location_data_index][6])
-            # Stage size is specified in Unreal coordinates
-            # Image represents top down stage view with image Y corresponding to Unreal X
-            c = c._replace(safety_zone_width=size_y, safety_zone_height=size_x)
-
-            stage_name = location_data[location_data_index][0]
-            if stage_name in location_occupancy_masks:
-                location_occupancy_mask = location_occupancy_masks[stage_name]
-
         for _ in range(num_subjects):
             # Select target subjects, avoid same subject in same sequence if requested
             # Note: We treat rp_aaron_posed_002 and rp_aaron_posed_009 as different subjects due to different clothing
@@ -413,11 +1140,7 @@ def get_sequences(c, grouptype, subject_animations, animation_folder, body_yaw_r
 
             used_animations.append(current_animation)
 
-        # Get sequence bodies location data, sorted by ground area coverage, largest first
-        subject_location_data = get_location_data(c, grouptype, sequence_index, used_subjects, used_animations, animation_folder, location_occupancy_mask, body_yaw_reference)
-        if subject_location_data is not None:
-            sequences.append( (f"seq_{sequence_index:06d}", subject_location_data) )
-            sequence_index += 1
+        yield (used_subjects, used_animations)
 
         if c.unique_sequences:
             # Remove used animations
@@ -433,7 +1156,129 @@ def get_sequences(c, grouptype, subject_animations, animation_folder, body_yaw_r
                 elif c.unique_subjects:
                     subjects.remove(used_subject)
 
-    return sequences
+def get_sequences(c, grouptype, subject_animations, animation_folder, body_yaw_reference, location_data, location_occupancy_masks, usage_subjects, usage_animations):
+    """
+    Generator for placed sequences (sequence_name, subject_location_data), sequences are yielded as soon as they are placed
+    """
+    num_sequences = c.num_sequences
+
+    selections = get_subject_animation_selections(c, subject_animations, usage_subjects, usage_animations)
+
+    sequence_index = 0
+    while sequence_index < num_sequences:
+        print(f"Generating sequence: {sequence_index}", file=sys.stderr)
+        (used_subjects, used_animations) = next(selections)
+
+        (sequence_c, location_occupancy_mask, frustum_mask) = get_sequence_location(c, sequence_index, location_data, location_occupancy_masks)
+
+        # Get sequence bodies location data, sorted by ground area coverage, largest first
+        subject_location_data = get_location_data(sequence_c, grouptype, sequence_index, used_subjects, used_animations, animation_folder, location_occupancy_mask, frustum_mask, body_yaw_reference)
+        if subject_location_data is not None:
+            yield (f"seq_{sequence_index:06d}", subject_location_data)
+            sequence_index += 1
+
+################################################################################
+# Seeded sequence generation
+################################################################################
+
+def get_seed(seed, stream, index):
+    """
+    Independent seed for given random stream and sequence attempt index, derived from master seed
+    """
+    state = np.random.SeedSequence([seed, stream, index]).generate_state(2, dtype=np.uint64)
+    return (int(state[0]) << 64) | int(state[1])
+
+def init_placement_worker(use_trajectory_index):
+    global trajectory_index
+    if use_trajectory_index:
+        # Index was already checked against animation folder by main process
+        trajectory_index = TrajectoryIndex(TRAJECTORY_INDEX_PATH)
+
+def get_location_data_seeded(args):
+    """
+    Placement of one sequence attempt with own random stream. Global random state is restored afterwards.
+    """
+    (placement_seed, location_args) = args
+
+    random_state = random.getstate()
+    trials = placement_statistics["trials"]
+    random.seed(placement_seed)
+
+    subject_location_data = get_location_data(*location_args)
+
+    random.setstate(random_state)
+    (trials, placement_statistics["trials"]) = (placement_statistics["trials"] - trials, trials)
+    return (subject_location_data, trials)
+
+def get_sequences_seeded(c, grouptype, subject_animations, animation_folder, body_yaw_reference, location_data, location_occupancy_masks, usage_subjects, usage_animations, seed, processes):
+    """
+    Generator for reproducible sequences with parallel body placement.
+
+    Subject and animation selection runs serially with its own random stream. Placement of sequence
+    attempt N uses a random stream derived from master seed and N so that the result does not depend
+    on the number of worker processes.
+    Attempts are placed speculatively in batches under the assumption that all previous attempts
+    succeed. If a placement fails then following attempts of the batch are placed again since their
+    sequence index and stage location have changed.
+    """
+    num_sequences = c.num_sequences
+
+    random.seed(get_seed(seed, 0, 0))
+    selections = get_subject_animation_selections(c, subject_animations, usage_subjects, usage_animations)
+
+    pool = None
+    if processes > 1:
+        print(f"Starting pool with {processes} processes", file=sys.stderr)
+        pool = Pool(processes, initializer=init_placement_worker, initargs=(trajectory_index is not None,))
+
+    attempts = [] # (attempt_index, used_subjects, used_animations)
+    attempt_index = 0
+    sequence_index = 0
+    while sequence_index < num_sequences:
+        # Select subjects and animations for next batch, never more attempts than serial generation would need
+        batch_size = min(max(processes, 1) * 4, num_sequences - sequence_index)
+        while len(attempts) < batch_size:
+            (used_subjects, used_animations) = next(selections)
+            attempts.append( (attempt_index, used_subjects, used_animations) )
+            attempt_index += 1
+
+        tasklist = []
+        for batch_index, (current_attempt_index, used_subjects, used_animations) in enumerate(attempts):
+            current_sequence_index = sequence_index + batch_index
+            (sequence_c, location_occupancy_mask, frustum_mask) = get_sequence_location(c, current_sequence_index, location_data, location_occupancy_masks)
+
+            sequence_body_yaw_reference = None
+            if body_yaw_reference is not None:
+                sequence_body_yaw_reference = {}
+                for index, subject in enumerate(used_subjects):
+                    body = f"{subject}_{used_animations[index]}"
+                    if body in body_yaw_reference:
+                        sequence_body_yaw_reference[body] = body_yaw_reference[body]
+
+            location_args = (sequence_c, grouptype, current_sequence_index, used_subjects, used_animations, animation_folder, location_occupancy_mask, frustum_mask, sequence_body_yaw_reference)
+            tasklist.append( (get_seed(seed, 1, current_attempt_index), location_args) )
+
+        if pool is not None:
+            results = pool.map(get_location_data_seeded, tasklist)
+        else:
+            results = [get_location_data_seeded(task) for task in tasklist]
+
+        # Results are only valid up to and including first failed attempt
+        for (subject_location_data, trials) in results:
+            (current_attempt_index, _, _) = attempts.pop(0)
+            placement_statistics["trials"] += trials
+
+            if subject_location_data is None:
+                print(f"Placement failed for sequence attempt: {current_attempt_index}", file=sys.stderr)
+                break
+
+            print(f"Generated sequence: {sequence_index}", file=sys.stderr)
+            yield (f"seq_{sequence_index:06d}", subject_location_data)
+            sequence_index += 1
+
+    if pool is not None:
+        pool.close()
+        pool.join()
 
 
 ################################################################################
@@ -451,70 +1296,64 @@ if __name__ == "__main__":
         sys.exit(1)
     c = configs[grouptype]
 
+    if (c.collision == "capsule") and (c.placement != "sampling"):
+        print(f"ERROR: Capsule collision only supports sampling placement: {c.placement}", file=sys.stderr)
+        sys.exit(1)
+
+    if (c.time_bucket_frames > 0) and (c.collision != "capsule"):
+        print("ERROR: Space-time occupancy (time_bucket_frames > 0) requires capsule collision", file=sys.stderr)
+        sys.exit(1)
+
     whitelist_path = WHITELIST_PATH
 
     hdris_path = None
     if len(sys.argv) > 2:
         hdris_path = sys.argv[2]
 
+    # Parsed configuration files are cached in binary format, sources are only parsed again if they change
+    config_cache = ConfigCache(CONFIG_CACHE_PATH)
+
     # Get list of whitelisted subject animations
-    subject_animations = {}
-    with open(whitelist_path) as f:
-        subject_animations = json.load(f)
+    subject_animations = config_cache.load(whitelist_path, read_json)
 
-        # Remove subjects which do not have any animations
-        subjects = list(subject_animations.keys())
-        for subject in subjects:
-            if len(subject_animations[subject]) == 0:
-                print(f"WARNING: Removing subject without animations: {subject}", file=sys.stderr)
-                del(subject_animations[subject])
+    # Remove subjects which do not have any animations
+    subjects = list(subject_animations.keys())
+    for subject in subjects:
+        if len(subject_animations[subject]) == 0:
+            print(f"WARNING: Removing subject without animations: {subject}", file=sys.stderr)
+            del(subject_animations[subject])
 
     subjects = list(subject_animations.keys())
 
     hdris = None
     if hdris_path is not None:
-        hdris = []
         # Get list of HDRI images
-        with open(hdris_path) as f:
-            hdris = f.read().splitlines()
+        hdris = config_cache.load(hdris_path, read_lines)
 
     # Get subject gender information
     subject_gender = {}
-    with open(SUBJECT_GENDER_PATH) as f:
-        csv_reader = csv.DictReader(f)
-        for row in csv_reader:
-            subject_gender[row["Name"]] = row["Gender"]
+    for row in config_cache.load(SUBJECT_GENDER_PATH, read_csv_dicts):
+        subject_gender[row["Name"]] = row["Gender"]
 
     # Get list of available body textures
     textures_body_female = []
     textures_body_male = []
 
-    with open(TEXTURES_BODY_PATH) as f:
-        lines = f.read().splitlines()
-        for line in lines:
-            if ("_f" in line) or ("Female_" in line):
-                textures_body_female.append(line)
-            else:
-                textures_body_male.append(line)
+    for line in config_cache.load(TEXTURES_BODY_PATH, read_lines):
+        if ("_f" in line) or ("Female_" in line):
+            textures_body_female.append(line)
+        else:
+            textures_body_male.append(line)
 
     # Get list of available clothing textures
-    outfit_textures = {}
-    motion_outfit = {}
-    with open(OUTFIT_INFO_PATH) as f:
-        outfit_info = json.load(f)
-        outfit_textures = outfit_info["textures"]
-        motion_outfit = outfit_info["motions"]
+    outfit_info = config_cache.load(OUTFIT_INFO_PATH, read_json)
+    outfit_textures = outfit_info["textures"]
+    motion_outfit = outfit_info["motions"]
 
     # Get gender hair whitelelist
-    whitelist_hair = {}
-    with open(WHITELIST_HAIR_PATH) as f:
-        whitelist_hair = json.load(f)
+    whitelist_hair = config_cache.load(WHITELIST_HAIR_PATH, read_json)
 
-    whitelist_hair_colors = []
-    with open(WHITELIST_HAIRCOLORS_PATH) as f:
-        lines = f.read().splitlines()
-        for line in lines:
-            whitelist_hair_colors.append(line)
+    whitelist_hair_colors = config_cache.load(WHITELIST_HAIRCOLORS_PATH, read_lines)
 
     # Override world space offset if locations file is specified
     use_locations = False
@@ -522,14 +1361,9 @@ if __name__ == "__main__":
     location_occupancy_masks = None
     if c.location_file != "":
         use_locations = True
-        location_data = []
         level_name = c.location_file.replace(".csv", "")
         location_file_path = LOCATIONS_ROOT / level_name / c.location_file
-        with open(location_file_path, mode="r") as f:
-            csv_reader = csv.reader(f)
-            next(csv_reader) # skip header
-            for row in csv_reader:
-                location_data.append(row)
+        location_data = config_cache.load(location_file_path, read_csv_rows)[1:] # skip header
 
         # Initialize masks
         location_occupancy_masks = {}
@@ -538,7 +1372,7 @@ if __name__ == "__main__":
             stage_index = stage_name.rsplit("_", maxsplit=1)[1]
             image_file_path = LOCATIONS_ROOT / level_name / f"{level_name}_stage_{stage_index}.png"
             if image_file_path.exists():
-                img = cv2.imread(str(image_file_path), cv2.IMREAD_GRAYSCALE)
+                img = config_cache.load(image_file_path, read_image_grayscale)
                 if img is None:
                     print(f"ERROR: Could not load occupancy image: {image_file_path}", file=sys.stderr)
                     sys.exit(1)
@@ -556,54 +1390,64 @@ if __name__ == "__main__":
     usage_subjects = None
     if c.balance_subjects != "":
         usage_subjects_path = CONFIG_ROOT / c.balance_subjects
-        with open(usage_subjects_path, mode="r") as f:
-            usage_subjects = {}
-            csv_reader = csv.DictReader(f)
-
-            for row in csv_reader:
-                usage_subjects[row["subject"]] = row["count"]
+        usage_subjects = {}
+        for row in config_cache.load(usage_subjects_path, read_csv_dicts):
+            usage_subjects[row["subject"]] = row["count"]
 
     usage_animations = None
     if c.balance_animations != "":
         usage_animations_path = CONFIG_ROOT / c.balance_animations
-        with open(usage_animations_path, mode="r") as f:
-            usage_animations = {}
-            csv_reader = csv.DictReader(f)
-
-            for row in csv_reader:
-                usage_animations[row["animation"]] = row["count"]
+        usage_animations = {}
+        for row in config_cache.load(usage_animations_path, read_csv_dicts):
+            usage_animations[row["animation"]] = row["count"]
 
     # Load body yaw reference if requested
     body_yaw_reference = None
     if c.use_body_yaw_reference:
         body_yaw_reference = {}
-        with open(MOTION_STATS_PATH, 'r') as f:
-            csv_reader = csv.DictReader(f)
-            for row in csv_reader:
-                body_id = row["body_id"]
-                motion_id = row["motion_id"]
-                body = f"{body_id}_{motion_id}"
-                yaw =row["pelvis_world_yaw_deg"]
-                body_yaw_reference[body] = float(yaw)
+        for row in config_cache.load(MOTION_STATS_PATH, read_csv_dicts):
+            body_id = row["body_id"]
+            motion_id = row["motion_id"]
+            body = f"{body_id}_{motion_id}"
+            yaw =row["pelvis_world_yaw_deg"]
+            body_yaw_reference[body] = float(yaw)
 
     whitelist_shoes = []
     shoe_height_offsets = {}
     if c.use_shoes:
 
-        with open(WHITELIST_SHOES_PATH) as f:
-            lines = f.read().splitlines()
-            for line in lines:
-                whitelist_shoes.append(line)
+        whitelist_shoes = config_cache.load(WHITELIST_SHOES_PATH, read_lines)
 
-        with open(SHOE_OFFSETS_PATH, 'r') as f:
-            csv_reader = csv.DictReader(f)
-            for row in csv_reader:
-                shoe_name = row["shoe_id"]
-                height_offset = 100 * float(row["offset"]) # convert [m] to [cm]
-                shoe_height_offsets[shoe_name] = height_offset
+        for row in config_cache.load(SHOE_OFFSETS_PATH, read_csv_dicts):
+            shoe_name = row["shoe_id"]
+            height_offset = 100 * float(row["offset"]) # convert [m] to [cm]
+            shoe_height_offsets[shoe_name] = height_offset
+
+    config_cache.save()
+
+    # Use packed root trajectories if available, see be_trajectory_index.py
+    animation_keys = [f"{subject}_{animation_name}" for subject in subject_animations for animation_name in subject_animations[subject]]
+    trajectory_index = load_trajectory_index(TRAJECTORY_INDEX_PATH, animation_keys)
+    if trajectory_index is not None:
+        print(f"[INFO] Using trajectory index: {TRAJECTORY_INDEX_PATH} [{len(trajectory_index)} animations]", file=sys.stderr)
 
     # Get sequences
-    sequences = get_sequences(c, grouptype, subject_animations, SMPLX_NPZ_ANIMATION_FOLDER, body_yaw_reference, location_data, location_occupancy_masks, usage_subjects, usage_animations)
+    # Sequences are generated on demand and written as soon as they are placed. Sequence attributes use their own
+    # random stream so that attribute assignment does not interfere with selection and placement random streams.
+    if (SEED < 0) and (PROCESSES <= 1):
+        attribute_random = random.Random()
+        sequences = get_sequences(c, grouptype, subject_animations, SMPLX_NPZ_ANIMATION_FOLDER, body_yaw_reference, location_data, location_occupancy_masks, usage_subjects, usage_animations)
+    else:
+        seed = SEED
+        if seed < 0:
+            seed = random.randrange(2**32)
+        print(f"[INFO] Seeded sequence generation: seed={seed}, processes={PROCESSES}", file=sys.stderr)
+        attribute_random = random.Random(get_seed(seed, 2, 0))
+        sequences = get_sequences_seeded(c, grouptype, subject_animations, SMPLX_NPZ_ANIMATION_FOLDER, body_yaw_reference, location_data, location_occupancy_masks, usage_subjects, usage_animations, seed, PROCESSES)
+
+    time_sampler = ParameterSampler(SAMPLING_METHOD, ["time"], np.random.default_rng(attribute_random.getrandbits(128)), block_size=c.num_sequences)
+    sequence_samples = [] # unit values of sampled parameters for coverage report
+    bodies_range = c.bodies_max - c.bodies_min + 1
 
     index = 0
     print("Index,Type,Body,X,Y,Z,Yaw,Pitch,Roll,Comment")
@@ -656,11 +1500,16 @@ if __name__ == "__main__":
 
         comment = f"sequence_name={sequence_name};frames={sequence_frames}"
 
+        samples = {}
+        sequence_samples.append(samples)
+        if bodies_range > 1:
+            samples["bodies"] = (len(subject_location_data) - c.bodies_min + 0.5) / bodies_range # center of body count stratum
+
         if hdris is not None:
             # Add random HDRI name to sequence information
             if len(current_hdris) == 0:
                 current_hdris = list(hdris)
-            hdri_name = current_hdris.pop(random.randrange(len(current_hdris)))
+            hdri_name = current_hdris.pop(attribute_random.randrange(len(current_hdris)))
             comment += f";hdri={hdri_name}"
 
         if c.override_cameraroot_location:
@@ -682,7 +1531,10 @@ if __name__ == "__main__":
         comment += f";ground_height_world={c.z_offset}"
 
         if c.time_min > 0:
-            time_of_day = random.uniform(c.time_min, c.time_max)
+            time_unit = float(time_sampler.sample(1)["time"][0])
+            time_of_day = c.time_min + time_unit * (c.time_max - c.time_min)
+            if c.time_max > c.time_min:
+                samples["time"] = time_unit
             comment += f";time={time_of_day}"
 
         print(f"{index},Group,None,0.0,0.0,{c.camera_height + c.z_offset},0.0,0.0,0.0,{comment}")
@@ -699,11 +1551,11 @@ if __name__ == "__main__":
             if gender == "f":
                 if len(current_textures_body_female) == 0:
                     current_textures_body_female = list(textures_body_female)
-                texture_body_name = current_textures_body_female.pop(random.randrange(len(current_textures_body_female)))
+                texture_body_name = current_textures_body_female.pop(attribute_random.randrange(len(current_textures_body_female)))
             elif gender == "m":
                 if len(current_textures_body_male) == 0:
                     current_textures_body_male = list(textures_body_male)
-                texture_body_name = current_textures_body_male.pop(random.randrange(len(current_textures_body_male)))
+                texture_body_name = current_textures_body_male.pop(attribute_random.randrange(len(current_textures_body_male)))
             else:
                 print(f"ERROR: no gender definition for subject: {data.subject_name}", file=sys.stderr)
                 sys.exit(1)
@@ -715,7 +1567,7 @@ if __name__ == "__main__":
                 # Get outfit
                 outfit = motion_outfit[data.subject_name][data.animation_name]
                 textures = outfit_textures[outfit]
-                texture_clothing_name = textures[random.randrange(len(textures))]
+                texture_clothing_name = textures[attribute_random.randrange(len(textures))]
                 comment += f";texture_clothing={outfit}_{texture_clothing_name}"
 
             if c.use_hair:
@@ -723,12 +1575,12 @@ if __name__ == "__main__":
                 if len(current_hair[gender]) == 0:
                     current_hair[gender] = list(whitelist_hair[gender])
 
-                hair_name = current_hair[gender].pop(random.randrange(len(current_hair[gender])))
+                hair_name = current_hair[gender].pop(attribute_random.randrange(len(current_hair[gender])))
                 comment += f";hair={hair_name}"
 
                 if len(current_hair_colors) == 0:
                     current_hair_colors = list(whitelist_hair_colors)
-                hair_color = current_hair_colors.pop(random.randrange(len(current_hair_colors)))
+                hair_color = current_hair_colors.pop(attribute_random.randrange(len(current_hair_colors)))
                 comment += f";haircolor={hair_color}"
 
 
@@ -741,7 +1593,7 @@ if __name__ == "__main__":
                 if len(current_shoes) == 0:
                     current_shoes = list(whitelist_shoes)
 
-                shoe_name = current_shoes.pop(random.randrange(len(current_shoes)))
+                shoe_name = current_shoes.pop(attribute_random.randrange(len(current_shoes)))
                 comment += f";shoe={shoe_name}"
                 shoe_height_offset = shoe_height_offsets[shoe_name]
 
@@ -750,3 +1602,5 @@ if __name__ == "__main__":
             index = index + 1
 
     print(f"[INFO] Total frames in sequences: {total_frames}", file=sys.stderr)
+    print_coverage_report(SAMPLING_METHOD, [samples for samples in sequence_samples if len(samples) > 0], { "bodies": bodies_range, "time": COVERAGE_BINS })
+    print(f"[INFO] Total placement trials ({c.placement}): {placement_statistics['trials']}", file=sys.stderr)
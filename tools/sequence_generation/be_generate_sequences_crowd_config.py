@@ -11,6 +11,31 @@ CV_M_TO_PIXELS = 10
 CV_BODY_RADIUS = 5  # 50cm body radius
 #CV_BODY_RADIUS = 10  # 100cm body radius (MOYO multipeople)
 
+SEED = -1 # Master seed for reproducible sequence generation, -1: unseeded
+PROCESSES = 1 # Number of body placement worker processes, values > 1 enable seeded parallel generation (random master seed if SEED=-1)
+SAMPLING_METHOD = "random" # random | sobol | halton | lhs, stratified sampling of number of bodies and time of day over all sequences, see be_sampling.py
+COVERAGE_BINS = 10 # Histogram bins per parameter for sampling coverage report
+
+# placement="feasibility": feasible location maps are built with the union of the trajectory stamps over each yaw bin, so only locations
+# which are free for all yaws of a yaw bin are sampled (uniform location and yaw inside bin). Compared to rejection sampling ("sampling")
+# locations which are only free for some yaws of a bin are never used, which slightly favors open areas in crowded sequences.
+# Use more yaw bins (placement_yaw_bins) to reduce this effect.
+
+CAPSULE_SIMPLIFY_TOLERANCE = 2.0 # collision="capsule": maximum deviation [cm] of simplified trajectory polyline, added to capsule radius
+CAPSULE_HASH_CELL_SIZE = 100.0 # collision="capsule": spatial hash cell size [cm]
+SPACETIME_START_FRAME_TRIALS = 100 # time_bucket_frames > 0: alternative animation start frames tested per body, one per occupied location
+# Most of the space-time density gain comes from the time buckets themselves, alternative start frames rarely fit where the
+# original start frame collides (16 bodies in 4x4m: 27 area increases without alternatives vs. 41 for time-union capsules,
+# 29 with 2 alternatives per occupied location at 3x the trials). Set to 0 to disable.
+
+PLACEMENT_JOINT_TRIALS = 1000 # placement_solver="joint": search trials for location with fewest colliding placed bodies, search starts when greedy placement would increase body area
+PLACEMENT_JOINT_RELOCATION_LIMIT = 20 # placement_solver="joint": maximum number of evicted bodies per sequence, afterwards body area is increased as in greedy placement. Evicted bodies do not evict other bodies.
+
+FRUSTUM_THETA_STEP = 5.0 # frustum_constraint: theta sampling step [deg] for view coverage of camera view wedges
+FRUSTUM_CAMERA_DISTANCE = 500.0 # frustum_constraint: horizontal camera distance behind cameraroot [cm] if neither config nor stage location set it, distance_max of cam_default (be_generate_camera_animations_config.py)
+FRUSTUM_ASPECT_RATIO = 16 / 9 # frustum_constraint: image aspect ratio for vertical field of view
+FRUSTUM_BODY_HEIGHT = 200.0 # frustum_constraint: body height [cm] which must fit into vertical field of view of level camera
+
 CONFIG_ROOT = Path("../../config")
 STATS_ROOT = Path("../../stats")
 
@@ -35,6 +60,9 @@ OUTFIT_INFO_PATH = CONFIG_ROOT / f"motion2outfit_{DATA_SUBSET}.json" # Dictionar
 
 MOTION_STATS_PATH = STATS_ROOT / f"motion_stats_{DATA_SUBSET}.csv"
 
+TRAJECTORY_INDEX_PATH = STATS_ROOT / f"trajectories_{DATA_SUBSET}.json" # Packed 30fps root trajectories, generated with be_trajectory_index.py
+CONFIG_CACHE_PATH = STATS_ROOT / "config_cache.pkl" # Binary cache of parsed configuration files, see be_config_cache.py
+
 WHITELIST_HAIR_PATH = CONFIG_ROOT / "whitelist_hair.json"
 WHITELIST_HAIRCOLORS_PATH = CONFIG_ROOT / "whitelist_hair_colors.txt"
 
@@ -78,6 +106,16 @@ class Config(NamedTuple):
     balance_animations: str = "" # Utilize usage_animations.csv to prefer animation with lowest usage for selected subject
     use_body_yaw_reference : bool = False # Use body world yaw from motion_stats.csv to normalize body directions, randomication yaw=0 will then result in body looking along negative X-axis towards default camera.
     use_shoes: bool = False # Use shoes and shoe height offsets
+    placement: str = "sampling" # sampling: rejection sampling of body locations | feasibility: sample from per-yaw-bin feasible location maps
+    placement_yaw_bins: int = 36 # Number of yaw bins for feasibility map placement
+    placement_solver: str = "greedy" # greedy: place bodies in order, failed sequences are restarted with new subjects | joint: if a body cannot be placed then evict colliding placed bodies and relocate them (location, yaw, start frame) before increasing body area, subject and animation selection is kept
+    collision: str = "raster" # raster: ground occupancy images (10m stage limit) | capsule: continuous trajectory capsules with CV_BODY_RADIUS, no stage size limit
+    time_bucket_frames: int = 0 # collision="capsule": 0: ground occupancy is union over all frames | >0: space-time occupancy, bodies can share ground in different time buckets of given length [frames]
+    frustum_constraint: bool = False # Only accept body locations where most root locations are in the ground plane view of the camera, averaged over camera yaws (cameraroot yaw + theta range)
+    frustum_visible_ratio: float = 0.8 # frustum_constraint: minimum ratio of animation frames with root location in camera view, expected over sampled camera yaws
+    frustum_camera_distance: float = -1.0 # frustum_constraint: horizontal camera distance behind cameraroot [cm], negative value uses camera_radius_max of stage location or FRUSTUM_CAMERA_DISTANCE
+    frustum_theta_min: float = 0.0 # frustum_constraint: camera theta range relative to cameraroot yaw, overridden by theta_min/theta_max of stage location
+    frustum_theta_max: float = 0.0
 
 configs = {}
 
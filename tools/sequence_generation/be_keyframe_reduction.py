@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Keyframe curve reduction for baked per-frame camera tracks
+#
+# VCam and depth pass cameras are keyframed on every frame. Ramer-Douglas-Peucker over all channels first
+# selects the shared keyframe times which keep every channel within the given position/angle tolerance at
+# every source frame. Each channel (cameraroot x, y, z, yaw, pitch, camera_local x, y, z, yaw, pitch, roll
+# and hfov) is then reduced separately to a subset of these times, so channel keys are close to the per
+# channel minimum while keyframe records are shared between channels.
+# Keyframes of the reduced track only contain the channel values which are keyed at that frame.
+#
+# Interpolation: source keyframes are "auto" keys on every frame, which evaluate to the sampled values at
+# every frame. Reduced keyframes are "linear" since the tolerance is only guaranteed for linear interpolation
+# between the kept keys, Unreal auto tangents overshoot between sparse keys.
+# cameraroot roll is not stored in reduced keyframes since create_level_sequences_csv.py never keys it.
+#
+# Usage:
+#   python be_keyframe_reduction.py INPUT_JSON OUTPUT_JSON   # reduce existing camera animations, binary sidecar is written next to output
+#   python be_keyframe_reduction.py be_camera_animations_depth.json be_camera_animations_depth_reduced.json
+#
+import json
+from pathlib import Path
+import sys
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "unreal" / "render" / "Core" / "Python"))
+from be_camera_animations_bin import write_camera_animations_sidecar
+
+KEYFRAME_POSITION_TOLERANCE = 0.1 # [cm], maximum deviation of reduced location channels
+KEYFRAME_ANGLE_TOLERANCE = 0.01 # [deg], maximum deviation of reduced rotation channels and hfov
+
+# Keyframe channels in output order, (group, key). Group None denotes top level keyframe value.
+# cameraroot roll is omitted since it is never keyed in Unreal (fixed default of 0).
+KEYFRAME_CHANNELS = [ (None, "hfov"),
+                      ("cameraroot", "x"), ("cameraroot", "y"), ("cameraroot", "z"), ("cameraroot", "yaw"), ("cameraroot", "pitch"),
+                      ("camera_local", "x"), ("camera_local", "y"), ("camera_local", "z"), ("camera_local", "yaw"), ("camera_local", "pitch"), ("camera_local", "roll") ]
+
+################################################################################
+
+def get_hfov_from_inverse_tan(inverse_tan):
+    return np.degrees(2.0 * np.arctan(1.0 / inverse_tan))
+
+def get_reduced_indices(times, curves, candidates=None):
+    """
+    Ramer-Douglas-Peucker on one or more curves with shared key times: indices of samples which are kept so that
+    linear interpolation between them deviates at most the curve tolerance from all samples of every curve.
+    First and last sample are always kept.
+      curves: list of (values, tolerance, to_linear, from_linear), to_linear/from_linear are an optional mapping
+              into the space in which the curve is interpolated, or None
+      candidates: optional sorted sample indices which may be kept, must include first and last sample and
+                  keep all curves within tolerance themselves
+    """
+    times = np.asarray(times, dtype=np.float64)
+
+    num_samples = len(times)
+    if num_samples <= 2:
+        return np.arange(num_samples)
+
+    # (curves, samples) arrays, curves with mapping are converted back per segment
+    values = np.stack([np.asarray(curve[0], dtype=np.float64) for curve in curves])
+    linear = np.stack([values[index] if to_linear is None else to_linear(values[index]) for (index, (_, _, to_linear, _)) in enumerate(curves)])
+    tolerances = np.array([[tolerance] for (_, tolerance, _, _) in curves], dtype=np.float64)
+    mapped = [(index, from_linear) for (index, (_, _, _, from_linear)) in enumerate(curves) if from_linear is not None]
+
+    if candidates is not None:
+        candidates = np.asarray(candidates).tolist()
+        next_candidates = np.searchsorted(candidates, np.arange(num_samples)).tolist() # sample => index of first candidate at or after sample
+
+    keep = np.zeros(num_samples, dtype=bool)
+    keep[[0, -1]] = True
+    segments = [(0, num_samples - 1)]
+    while len(segments) > 0:
+        (start, end) = segments.pop()
+        if end - start < 2:
+            continue
+
+        # Largest deviation relative to curve tolerance
+        inner = slice(start + 1, end)
+        weight = (times[inner] - times[start]) / (times[end] - times[start])
+        interpolated = linear[:, start, None] + weight * (linear[:, end, None] - linear[:, start, None])
+        for (index, from_linear) in mapped:
+            interpolated[index] = from_linear(interpolated[index])
+        error = np.max(np.abs(interpolated - values[:, inner]) / tolerances, axis=0)
+
+        split = int(np.argmax(error))
+        if error[split] <= 1.0:
+            continue
+
+        split += start + 1
+        if candidates is not None:
+            # Nearest candidate inside segment, there is none if segment is within tolerance up to rounding
+            after = candidates[next_candidates[split]]
+            before = candidates[next_candidates[split] - 1] if after > split else after
+            if after >= end or (before > start and split - before <= after - split):
+                after = before
+            if after <= start:
+                continue
+            split = after
+
+        keep[split] = True
+        segments.append((start, split))
+        segments.append((split, end))
+
+    return np.flatnonzero(keep)
+
+def get_channel_curve(key, values, position_tolerance, angle_tolerance):
+    """
+    Curve (values, tolerance, to_linear, from_linear) of keyframe channel for get_reduced_indices
+    """
+    if key == "hfov":
+        # Unreal interpolates focal length which is proportional to 1/tan(hfov/2)
+        return (values, angle_tolerance, lambda hfov: 1.0 / np.tan(np.radians(hfov / 2)), get_hfov_from_inverse_tan)
+    elif key in ["x", "y", "z"]:
+        return (values, position_tolerance, None, None)
+    else:
+        return (values, angle_tolerance, None, None)
+
+def get_reduced_keyframes(frame_indices, channels, position_tolerance=KEYFRAME_POSITION_TOLERANCE, angle_tolerance=KEYFRAME_ANGLE_TOLERANCE, sources=None):
+    """
+    Reduced keyframes with linear interpolation from per-frame channel arrays.
+      frame_indices: (N,) int
+      channels: (group, key) => (N,) values, group None denotes top level keyframe value, channels which are not in KEYFRAME_CHANNELS are dropped
+      sources: optional (group, key) => list of N original values, used instead of array values so that value types are kept
+    """
+    times = np.asarray(frame_indices, dtype=np.float64)
+
+    curves = {}
+    for (group, key) in KEYFRAME_CHANNELS:
+        if (group, key) in channels:
+            curves[(group, key)] = get_channel_curve(key, np.asarray(channels[(group, key)], dtype=np.float64), position_tolerance, angle_tolerance)
+
+    if len(curves) == 0:
+        return []
+
+    # Keyframe times shared by all channels, then per channel subset of these times
+    shared_indices = get_reduced_indices(times, list(curves.values()))
+
+    channel_keys = {} # frame => list of (group, key)
+    for ((group, key), curve) in curves.items():
+        for index in get_reduced_indices(times, [curve], shared_indices).tolist():
+            channel_keys.setdefault(index, []).append((group, key))
+
+    reduced = []
+    for index in sorted(channel_keys.keys()):
+        keyframe = { "frame_index": int(frame_indices[index]) }
+        for (group, key) in channel_keys[index]:
+            value = sources[(group, key)][index] if sources is not None else float(channels[(group, key)][index])
+            if group is None:
+                keyframe[key] = value
+            else:
+                keyframe.setdefault(group, {})[key] = value
+        keyframe["type"] = "linear"
+        reduced.append(keyframe)
+
+    return reduced
+
+def reduce_keyframes(keyframes, position_tolerance=KEYFRAME_POSITION_TOLERANCE, angle_tolerance=KEYFRAME_ANGLE_TOLERANCE):
+    """
+    Reduce dense keyframes to per-channel key sets with linear interpolation, see module header.
+    Returns new keyframe list, keyframes which have no keyed channel are dropped.
+    Channels which are not in KEYFRAME_CHANNELS (cameraroot roll) are not stored.
+    """
+    if len(keyframes) <= 2:
+        return keyframes
+
+    frame_indices = [keyframe["frame_index"] for keyframe in keyframes]
+
+    channels = {}
+    sources = {}
+    passthrough = {} # keyframe index => list of (group, key)
+    for (group, key) in KEYFRAME_CHANNELS:
+        if group is None:
+            values = [keyframe.get(key, None) for keyframe in keyframes]
+        else:
+            values = [keyframe[group].get(key, None) if group in keyframe else None for keyframe in keyframes]
+
+        # Only channels which are keyed on every frame are reduced, others are passed through
+        if any(value is None for value in values):
+            for (index, value) in enumerate(values):
+                if value is not None:
+                    passthrough.setdefault(index, []).append((group, key))
+        else:
+            channels[(group, key)] = values
+            sources[(group, key)] = values
+
+    reduced = get_reduced_keyframes(frame_indices, channels, position_tolerance, angle_tolerance, sources)
+    if len(passthrough) == 0:
+        return reduced
+
+    # Merge passed through channel values, keys are kept in channel order
+    merged = { keyframe["frame_index"]: keyframe for keyframe in reduced }
+    for (index, channel_list) in passthrough.items():
+        keyframe = merged.setdefault(frame_indices[index], { "frame_index": frame_indices[index], "type": "linear" })
+        for (group, key) in channel_list:
+            if group is None:
+                keyframe[key] = keyframes[index][key]
+            else:
+                keyframe.setdefault(group, {})[key] = keyframes[index][group][key]
+
+    output = []
+    for frame_index in sorted(merged.keys()):
+        keyframe = merged[frame_index]
+        ordered = { "frame_index": frame_index }
+        for (group, key) in KEYFRAME_CHANNELS:
+            if group is None:
+                if key in keyframe:
+                    ordered[key] = keyframe[key]
+            elif key in keyframe.get(group, {}):
+                ordered.setdefault(group, {})[key] = keyframe[group][key]
+        ordered["type"] = "linear"
+        output.append(ordered)
+    return output
+
+def reduce_camera_animations(camera_animations, position_tolerance=KEYFRAME_POSITION_TOLERANCE, angle_tolerance=KEYFRAME_ANGLE_TOLERANCE):
+    """
+    Reduce keyframes of all sequences with per-frame keyframes in place, returns (number of keyframes before, after)
+    """
+    (num_before, num_after) = (0, 0)
+    for sequence_name in camera_animations:
+        if sequence_name == "info":
+            continue
+
+        keyframes = camera_animations[sequence_name]["keyframes"]
+        num_before += len(keyframes)
+        if all(keyframe.get("type", None) == "auto" for keyframe in keyframes):
+            keyframes = reduce_keyframes(keyframes, position_tolerance, angle_tolerance)
+            camera_animations[sequence_name]["keyframes"] = keyframes
+        num_after += len(keyframes)
+
+    return (num_before, num_after)
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} INPUT_JSON OUTPUT_JSON", file=sys.stderr)
+        sys.exit(1)
+
+    input_path = Path(sys.argv[1])
+    output_path = Path(sys.argv[2])
+
+    with open(input_path) as f:
+        camera_animations = json.load(f)
+
+    (num_before, num_after) = reduce_camera_animations(camera_animations)
+    print(f"[INFO] Keyframes: {num_before} => {num_after}", file=sys.stderr)
+
+    print(f"Saving: {output_path}", file=sys.stderr)
+    with open(output_path, "w") as f:
+        json.dump(camera_animations, f, indent=4)
+
+    # Binary sidecar for random access by sequence name, see be_camera_animations_bin.py
+    output_bin_path = output_path.with_suffix(".bin")
+    print(f"Saving: {output_bin_path}", file=sys.stderr)
+    write_camera_animations_sidecar(output_bin_path, camera_animations)
+
+    sys.exit(0)
@@ -19,11 +19,9 @@ mkdir -p "$outputroot"
 # Create body sequences on stage at origin
 ./be_generate_sequences_crowd.py $grouptype ../../config/whitelist_hdri.txt  | tee "$outputroot/be_seq_default.csv"
 
-# Move stage forward for defined camera focal length range
-./be_modify_sequences.py "$outputroot/be_seq_default.csv" autodistance $cameratype_modify
-
-# Rotate stage and camera around origin for randomized view into HDR panorama
-./be_modify_sequences.py "$outputroot/be_seq_default_autodistance.csv" sequenceroot -180 180
+# Move stage forward for defined camera focal length range,
+# then rotate stage and camera around origin for randomized view into HDR panorama
+./be_modify_sequences.py "$outputroot/be_seq_default.csv" pipeline autodistance:$cameratype_modify sequenceroot:-180:180
 cp -v "$outputroot/be_seq_default_autodistance_sequenceroot.csv" "$outputroot/be_seq.csv"
 
 # Generate camera animations (be_camera_animations.json)
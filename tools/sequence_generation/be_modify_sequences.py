@@ -5,363 +5,279 @@
 # Modify crowd sequence
 #
 
-import csv
-import json
 from math import sin, cos, tan, radians
+import numpy as np
 import random
 import re
 import sys
 
 from be_modify_sequences_config import *
+from be_config_cache import ConfigCache, read_csv_dicts, read_json
+from be_seq_csv import read_be_seq
 
 ################################################################################
 
-def change_camera(csv_path, config_camera, config_type):
-
+def get_camera_config_attributes(config_camera, config_type):
     c = config_camera
+    return { "cam_x_offset": f"{c.x_offset_max}", "cam_y_offset": f"{c.y_offset_max}", "cam_z_offset": f"{c.z_offset_max}",
+             "cam_yaw_min": f"{c.yaw_min}", "cam_yaw_max": f"{c.yaw_max}", "cam_pitch_min": f"{c.pitch_min}", "cam_pitch_max": f"{c.pitch_max}",
+             "cam_roll_min": f"{c.roll_min}", "cam_roll_max": f"{c.roll_max}", "cam_config": config_type }
+
+def set_camera_hfov(be_seq, group_row, hfov):
+    attributes = be_seq.attributes[group_row]
+    if "camera_hfov" not in attributes:
+        print("ERROR: Cannot find camera_hfov entry in source data")
+        sys.exit(1)
 
-    with open(csv_path, "r") as f:
-        bodies = f.readlines()
-
-    output = []
+    attributes["camera_hfov"] = f"{hfov}"
+    return
 
-    for line in bodies:
-        line = line.rstrip()
-        if line.startswith("Index"):
-            output.append(line + "\n")
-            continue
-        else:
-            items = line.split(",")
-            index = int(items[0])
-            rowtype = items[1]
-            if index == 0:
-                line = f"{line};cam_x_offset={c.x_offset_max};cam_y_offset={c.y_offset_max};cam_z_offset={c.z_offset_max};cam_yaw_min={c.yaw_min};cam_yaw_max={c.yaw_max};cam_pitch_min={c.pitch_min};cam_pitch_max={c.pitch_max};cam_roll_min={c.roll_min};cam_roll_max={c.roll_max};cam_config={config_type}"
-                output.append(line + "\n")
-                continue
-
-            if rowtype == "Group":
-                name = items[2]
-                if c.override_cam_position:
-                    x_start = c.x
-                    y_start = c.y
-                    if c.pitch_from_height:
-                        z_start = random.uniform(c.z_min, c.z_max)
-                    else:
-                        z_start = c.z
-                else:
-                    x_start = float(items[3])
-                    y_start = float(items[4])
-                    z_start = float(items[5])
-
-                x = x_start + random.uniform(-c.x_offset_max, c.x_offset_max)
-                y = y_start + random.uniform(-c.y_offset_max, c.y_offset_max)
-                z = z_start + random.uniform(-c.z_offset_max, c.z_offset_max)
-                yaw = random.uniform(c.yaw_min, c.yaw_max)
-
-                pitch_start = 0.0
-                if c.pitch_from_height:
-                    t = (z - c.z_min)/(c.z_max - c.z_min) # [0,1]
-                    pitch_start = (1 - t) * c.pitch_z_min + t * c.pitch_z_max
-
-                pitch = pitch_start + random.uniform(c.pitch_min, c.pitch_max)
-                roll = random.uniform(c.roll_min, c.roll_max)
-                comment = items[9]
-                if c.hfov > 0:
-                    # Use new horizontal field-of-view from configuration
-                    match = re.search(r"(.+)camera_hfov=([^;]+)(.*)", comment)
-                    if not match:
-                        print("ERROR: Cannot find camera_hfov entry in source data")
-                        sys.exit(1)
-
-                    comment = match.group(1) + f"camera_hfov={c.hfov}" + match.group(3)
-
-                line = f"{index},{rowtype},{name},{x},{y},{z},{yaw},{pitch},{roll},{comment}"
-
-            output.append(line + "\n")
-
-    csv_output_path = csv_path.parent / csv_path.name.replace(".csv", "_camrandom.csv")
+def save_sequences(be_seq, csv_path, suffix):
+    csv_output_path = csv_path.parent / csv_path.name.replace(".csv", f"{suffix}.csv")
     print(f"Saving modified sequence: {csv_output_path}")
-    with open(csv_output_path, "w") as f:
-        f.writelines(output)
-
+    be_seq.write(csv_output_path)
     return
 
-def change_camera_root(csv_path):
+################################################################################
+# Operations, modify sequence table in place
+################################################################################
 
-    with open(csv_path, "r") as f:
-        bodies = f.readlines()
+def change_camera(be_seq, config_camera, config_type):
 
-    output = []
+    c = config_camera
 
-    for line in bodies:
-        line = line.rstrip()
-        if line.startswith("Index"):
-            output.append(line + "\n")
+    for row in range(len(be_seq)):
+        if be_seq.index[row] == 0:
+            be_seq.attributes[row].update(get_camera_config_attributes(c, config_type))
             continue
 
-        items = line.split(",")
-        index = int(items[0])
-        rowtype = items[1]
-        if index == 0:
-            line = f"{line};cameraroot_yaw_min=0;cameraroot_yaw_max=360]"
-            output.append(line + "\n")
+        if be_seq.type[row] != "Group":
             continue
 
-        if rowtype == "Group":
-            cam_root_yaw = random.uniform(0, 360)
-            line = f"{line};cameraroot_yaw={cam_root_yaw}"
+        if c.override_cam_position:
+            x_start = c.x
+            y_start = c.y
+            if c.pitch_from_height:
+                z_start = random.uniform(c.z_min, c.z_max)
+            else:
+                z_start = c.z
+        else:
+            (x_start, y_start, z_start) = be_seq.pose[row, 0:3].tolist()
 
-        output.append(line + "\n")
+        x = x_start + random.uniform(-c.x_offset_max, c.x_offset_max)
+        y = y_start + random.uniform(-c.y_offset_max, c.y_offset_max)
+        z = z_start + random.uniform(-c.z_offset_max, c.z_offset_max)
+        yaw = random.uniform(c.yaw_min, c.yaw_max)
 
-    csv_output_path = csv_path.parent / csv_path.name.replace(".csv", "_camroot.csv")
-    print(f"Saving modified sequence: {csv_output_path}")
-    with open(csv_output_path, "w") as f:
-        f.writelines(output)
+        pitch_start = 0.0
+        if c.pitch_from_height:
+            t = (z - c.z_min)/(c.z_max - c.z_min) # [0,1]
+            pitch_start = (1 - t) * c.pitch_z_min + t * c.pitch_z_max
 
-    return
+        pitch = pitch_start + random.uniform(c.pitch_min, c.pitch_max)
+        roll = random.uniform(c.roll_min, c.roll_max)
+        be_seq.pose[row] = (x, y, z, yaw, pitch, roll)
 
-# Rotate camera and bodies in world space (HDRI background and body lighting variation)
-def change_sequence_root(csv_path, angle_min=0.0, angle_max=360.0):
+        if c.hfov > 0:
+            # Use new horizontal field-of-view from configuration
+            set_camera_hfov(be_seq, row, c.hfov)
 
-    with open(csv_path, "r") as f:
-        bodies = f.readlines()
+    return
 
-    output = []
+def change_camera_root(be_seq):
 
-    angle = 0.0
-    for line in bodies:
-        line = line.rstrip()
-        if line.startswith("Index"):
-            output.append(line + "\n")
+    for row in range(len(be_seq)):
+        if be_seq.index[row] == 0:
+            be_seq.attributes[row].update({ "cameraroot_yaw_min": "0", "cameraroot_yaw_max": "360" })
             continue
-        else:
-            items = line.split(",")
-
-            index = int(items[0])
-            rowtype = items[1]
-            name = items[2]
-            x = float(items[3])
-            y = float(items[4])
-            z = float(items[5])
-            yaw  = float(items[6])
-            pitch = float(items[7])
-            roll = float(items[8])
-            comment = items[9]
 
+        if be_seq.type[row] == "Group":
+            cam_root_yaw = random.uniform(0, 360)
+            be_seq.attributes[row]["cameraroot_yaw"] = f"{cam_root_yaw}"
 
-            if rowtype == "Group":
-                angle = random.uniform(angle_min, angle_max)
-
-                # Note: we do not need to rotate camera location since it's at origin for HDRI scenes
-
-                yaw_r = yaw + angle
-                if yaw_r >= 360.0:
-                    yaw_r -= 360.0
-
-                comment += f";angle={angle}"
+    return
 
-                line = f"{index},{rowtype},{name},{x},{y},{z},{yaw_r},{pitch},{roll},{comment}"
+# Rotate camera and bodies in world space (HDRI background and body lighting variation)
+def change_sequence_root(be_seq, angle_min=0.0, angle_max=360.0):
+
+    if len(be_seq.groups) == 0:
+        return
+
+    angles = []
+    for group_row in be_seq.groups:
+        angle = random.uniform(angle_min, angle_max)
+        be_seq.attributes[group_row]["angle"] = f"{angle}"
+        angles.append(angle)
+
+    # Per-group rotation, sin/cos evaluated once per group
+    angles = np.array(angles)
+    sin_a = np.array([sin(radians(angle)) for angle in angles])
+    cos_a = np.array([cos(radians(angle)) for angle in angles])
+
+    # Note: we do not need to rotate camera location since it's at origin for HDRI scenes
+    group_mask = be_seq.get_row_mask("Group")
+    body_mask = be_seq.get_row_mask("Body") & (be_seq.row_group >= 0)
+    rotate_mask = group_mask | body_mask
+
+    # Rotate all bodies in world space
+    body_group = be_seq.row_group[body_mask]
+    x = be_seq.pose[body_mask, 0]
+    y = be_seq.pose[body_mask, 1]
+    be_seq.pose[body_mask, 0] = cos_a[body_group] * x - sin_a[body_group] * y
+    be_seq.pose[body_mask, 1] = sin_a[body_group] * x + cos_a[body_group] * y
+
+    yaw_r = be_seq.pose[rotate_mask, 3] + angles[be_seq.row_group[rotate_mask]]
+    yaw_r[yaw_r >= 360.0] -= 360.0
+    be_seq.pose[rotate_mask, 3] = yaw_r
 
-            elif rowtype == "Body":
-                # Rotate body in world space
-                sin_a = sin(radians(angle))
-                cos_a = cos(radians(angle))
+    return
 
-                x_r = cos_a * x - sin_a * y
-                y_r = sin_a * x + cos_a * y
+def change_autodistance(be_seq, config_camera, config_type):
 
-                yaw_r = yaw + angle
-                if yaw_r >= 360.0:
-                    yaw_r -= 360.0
+    c = config_camera
 
-                line = f"{index},{rowtype},{name},{x_r},{y_r},{z},{yaw_r},{pitch},{roll},{comment}"
+    if (len(be_seq) > 0) and (be_seq.index[0] == 0):
+        be_seq.attributes[0].update(get_camera_config_attributes(c, config_type))
 
-            output.append(line + "\n")
+    if len(be_seq.groups) == 0:
+        return
 
-    csv_output_path = csv_path.parent / csv_path.name.replace(".csv", "_sequenceroot.csv")
-    print(f"Saving modified sequence: {csv_output_path}")
-    with open(csv_output_path, "w") as f:
-        f.writelines(output)
+    body_distances = []
+    for group_row in be_seq.groups:
+        (x, y, z) = be_seq.pose[group_row, 0:3].tolist()
 
-    return
+        x = x + random.uniform(-c.x_offset_max, c.x_offset_max)
+        y = y + random.uniform(-c.y_offset_max, c.y_offset_max)
+        z = z + random.uniform(-c.z_offset_max, c.z_offset_max)
+        yaw = random.uniform(c.yaw_min, c.yaw_max)
+        pitch = random.uniform(c.pitch_min, c.pitch_max)
+        roll = random.uniform(c.roll_min, c.roll_max)
+        be_seq.pose[group_row] = (x, y, z, yaw, pitch, roll)
 
-def change_autodistance(csv_path, config_camera, config_type):
+        # Randomize hfov
+        hfov = random.uniform(c.hfov_min, c.hfov_max)
+        if hfov < 0:
+            print(f"ERROR: Invalid hfov range specification for autodistance calculation: [{c.hfov_min}, {c.hfov_max}]")
+            sys.exit(1)
 
-    c = config_camera
+        # Use new horizontal field-of-view from configuration
+        set_camera_hfov(be_seq, group_row, hfov)
 
-    with open(csv_path, "r") as f:
-        bodies = f.readlines()
+        # Camera distance from given hfov
+        h_ref = c.camera_autodistance_ref # HFOV 52 needs at least 400cm distance from origin to fully see body, h_ref = 400 * tan (52/2) = 200
+        alpha = radians(hfov/2)
+        body_distances.append(h_ref / tan(alpha))
 
-    output = []
-
-    hfov = -1
-    for line in bodies:
-        line = line.rstrip()
-        if line.startswith("Index"):
-            output.append(line + "\n")
-            continue
-        else:
-            items = line.split(",")
-            index = int(items[0])
-            rowtype = items[1]
-            name = items[2]
-            x = float(items[3])
-            y = float(items[4])
-            z = float(items[5])
-            yaw  = float(items[6])
-            pitch = float(items[7])
-            roll = float(items[8])
-            comment = items[9]
-
-
-            if index == 0:
-                line = f"{line};cam_x_offset={c.x_offset_max};cam_y_offset={c.y_offset_max};cam_z_offset={c.z_offset_max};cam_yaw_min={c.yaw_min};cam_yaw_max={c.yaw_max};cam_pitch_min={c.pitch_min};cam_pitch_max={c.pitch_max};cam_roll_min={c.roll_min};cam_roll_max={c.roll_max};cam_config={config_type}"
-                output.append(line + "\n")
-                continue
-
-            if rowtype == "Group":
-                name = items[2]
-
-                x = x + random.uniform(-c.x_offset_max, c.x_offset_max)
-                y = y + random.uniform(-c.y_offset_max, c.y_offset_max)
-                z = z + random.uniform(-c.z_offset_max, c.z_offset_max)
-                yaw = random.uniform(c.yaw_min, c.yaw_max)
-                pitch = random.uniform(c.pitch_min, c.pitch_max)
-                roll = random.uniform(c.roll_min, c.roll_max)
-                comment = items[9]
-
-                # Randomize hfov
-                hfov = random.uniform(c.hfov_min, c.hfov_max)
-                if hfov < 0:
-                    print(f"ERROR: Invalid hfov range specification for autodistance calculation: [{c.hfov_min}, {c.hfov_max}]")
-                    sys.exit(1)
-
-                # Use new horizontal field-of-view from configuration
-                match = re.search(r"(.+)camera_hfov=([^;]+)(.*)", comment)
-                if not match:
-                    print("ERROR: Cannot find camera_hfov entry in source data")
-                    sys.exit(1)
-
-                comment = match.group(1) + f"camera_hfov={hfov}" + match.group(3)
-
-                line = f"{index},{rowtype},{name},{x},{y},{z},{yaw},{pitch},{roll},{comment}"
-
-            elif rowtype == "Body":
-
-                # Camera distance from given hfov
-                h_ref = c.camera_autodistance_ref # HFOV 52 needs at least 400cm distance from origin to fully see body, h_ref = 400 * tan (52/2) = 200
-                alpha = radians(hfov/2)
-                body_distance = h_ref / tan(alpha)
-
-                x_autodistance = x + body_distance
-                line = f"{index},{rowtype},{name},{x_autodistance},{y},{z},{yaw},{pitch},{roll},{comment}"
-
-            output.append(line + "\n")
-
-    csv_output_path = csv_path.parent / csv_path.name.replace(".csv", "_autodistance.csv")
-    print(f"Saving modified sequence: {csv_output_path}")
-    with open(csv_output_path, "w") as f:
-        f.writelines(output)
+    # Move all bodies away from camera
+    body_mask = be_seq.get_row_mask("Body") & (be_seq.row_group >= 0)
+    be_seq.pose[body_mask, 0] += np.array(body_distances)[be_seq.row_group[body_mask]]
 
     return
 
 # Replace textured geometry clothing with clothing overlay
-def clothing_overlay_replace(csv_path):
-
-    with open(csv_path, "r") as f:
-        bodies = f.readlines()
-
-    output = []
-
-    for line in bodies:
-        line = line.rstrip()
-
+def clothing_overlay_replace(be_seq):
 
-        if line.startswith("Index"):
-            output.append(line + "\n")
+    for row in be_seq.get_rows("Body"):
+        attributes = be_seq.attributes[row]
+        if "texture_clothing" not in attributes:
             continue
 
-        items = line.split(",")
-        index = int(items[0])
-        rowtype = items[1]
-        subject_animation_index = items[2].split("_")[-1]
-        subject = items[2].replace(f"_{subject_animation_index}", "")
-        if rowtype == "Body":
-            match = re.search(r"(.+)texture_clothing=([^\;]+)(.*)", line)
-            if match:
-                texture_clothing_overlay = f"{subject}_{match.group(2)}"
-                line = match.group(1) + f"texture_clothing_overlay={texture_clothing_overlay}" + match.group(3)
+        subject_animation_index = be_seq.body[row].split("_")[-1]
+        subject = be_seq.body[row].replace(f"_{subject_animation_index}", "")
 
-        output.append(line + "\n")
-
-    csv_output_path = csv_path.parent / csv_path.name.replace(".csv", "_overlay.csv")
-    print(f"Saving modified sequence: {csv_output_path}")
-    with open(csv_output_path, "w") as f:
-        f.writelines(output)
+        # Rename attribute in place to keep attribute order
+        overlay_attributes = {}
+        for (key, value) in attributes.items():
+            if key == "texture_clothing":
+                overlay_attributes["texture_clothing_overlay"] = f"{subject}_{value}"
+            else:
+                overlay_attributes[key] = value
+        be_seq.attributes[row] = overlay_attributes
 
     return
 
 # Add textured geometry clothing to files which do not have geometry clothing information
-def clothing_overlay_add(csv_path):
+def clothing_overlay_add(be_seq):
+
+    config_cache = ConfigCache(CONFIG_CACHE_PATH)
 
     subject_gender = {}
-    with open(SUBJECT_GENDER_PATH) as f:
-        csv_reader = csv.DictReader(f)
-        for row in csv_reader:
-            subject_gender[row["Name"]] = row["Gender"]
+    for row in config_cache.load(SUBJECT_GENDER_PATH, read_csv_dicts):
+        subject_gender[row["Name"]] = row["Gender"]
 
-    textures_overlay = {}
-    with open(TEXTURES_OVERLAY_PATH) as f:
-        textures_overlay = json.load(f)
+    textures_overlay = config_cache.load(TEXTURES_OVERLAY_PATH, read_json)
+
+    config_cache.save()
 
     current_textures_overlay = { "f": [], "m": [] }
 
-    with open(csv_path, "r") as f:
-        bodies = f.readlines()
+    for row in be_seq.get_rows("Body"):
+        body = be_seq.body[row]
 
-    output = []
+        # rp_aaron_posed_002_1234
+        match = re.search(r"(.+)_\d\d\d\d", body)
+        if match:
+            subject = match.group(1)
+        else:
+            subject = body.split("_")[0]
 
-    for line in bodies:
-        line = line.rstrip()
+        if subject not in subject_gender:
+            print(f"ERROR: Invalid subject name: {subject}, body name: {body}")
+            sys.exit(1)
 
+        gender = subject_gender[subject]
+        if len(current_textures_overlay[gender]) == 0:
+            current_textures_overlay[gender] = list(textures_overlay[gender])
 
-        if line.startswith("Index"):
-            output.append(line + "\n")
-            continue
+        texture_clothing_overlay = current_textures_overlay[gender].pop(random.randrange(len(current_textures_overlay[gender])))
 
-        items = line.split(",")
-        index = int(items[0])
-        rowtype = items[1]
-        body = items[2]
+        be_seq.attributes[row]["texture_clothing_overlay"] = texture_clothing_overlay
 
-        if rowtype == "Body":
-            # rp_aaron_posed_002_1234
-            match = re.search(r"(.+)_\d\d\d\d", body)
-            if match:
-                subject = match.group(1)
-            else:
-                subject = body.split("_")[0]
+    return
 
-            if subject not in subject_gender:
-                print(f"ERROR: Invalid subject name: {subject}, body name: {body}")
-                sys.exit(1)
+def get_operation(target_type, args):
+    """
+    Validate operation arguments and return (function(be_seq), output file suffix)
+    """
+    if target_type in ["camera", "autodistance"]:
+        if len(args) != 1:
+            print(f"ERROR: {target_type} needs CONFIGTYPE argument", file=sys.stderr)
+            sys.exit(1)
+
+        config_type = args[0]
+        if not config_type in configs_camera:
+            print(f"ERROR: Undefined camera type: {config_type}", file=sys.stderr)
+            print(configs_camera.keys())
+            sys.exit(1)
+
+        if target_type == "camera":
+            return (lambda be_seq: change_camera(be_seq, configs_camera[config_type], config_type), "_camrandom")
+        else:
+            return (lambda be_seq: change_autodistance(be_seq, configs_camera[config_type], config_type), "_autodistance")
 
-            gender = subject_gender[subject]
-            if len(current_textures_overlay[gender]) == 0:
-                current_textures_overlay[gender] = list(textures_overlay[gender])
+    elif target_type == "cameraroot":
+        return (change_camera_root, "_camroot")
 
-            texture_clothing_overlay = current_textures_overlay[gender].pop(random.randrange(len(current_textures_overlay[gender])))
+    elif target_type == "sequenceroot":
+        if len(args) == 0:
+            return (change_sequence_root, "_sequenceroot")
 
-            line += f";texture_clothing_overlay={texture_clothing_overlay}"
+        if len(args) != 2:
+            print("ERROR: sequenceroot needs no arguments or angle_min angle_max", file=sys.stderr)
+            sys.exit(1)
 
-        output.append(line + "\n")
+        angle_min = int(args[0])
+        angle_max = int(args[1])
+        return (lambda be_seq: change_sequence_root(be_seq, angle_min, angle_max), "_sequenceroot")
 
-    csv_output_path = csv_path.parent / csv_path.name.replace(".csv", "_overlay.csv")
-    print(f"Saving modified sequence: {csv_output_path}")
-    with open(csv_output_path, "w") as f:
-        f.writelines(output)
+    elif target_type == "clothing_overlay":
+        if len(args) == 1:
+            return (clothing_overlay_add, "_overlay")
+        else:
+            return (clothing_overlay_replace, "_overlay")
 
-    return
+    print(f"ERROR: Unknown target type: {target_type}", file=sys.stderr)
+    sys.exit(1)
 
 def print_usage():
     print(f"Usage: {sys.argv[0]} INPUTCSVPATH camera CONFIGTYPE", file=sys.stderr)
@@ -372,6 +288,8 @@ def print_usage():
     print(f"Usage: {sys.argv[0]} INPUTCSVPATH autodistance CONFIGTYPE", file=sys.stderr)
     print(f"Usage: {sys.argv[0]} INPUTCSVPATH clothing_overlay [add]", file=sys.stderr)
     print(f"Usage: {sys.argv[0]} INPUTCSVPATH hair", file=sys.stderr)
+    print(f"Usage: {sys.argv[0]} INPUTCSVPATH pipeline OPERATION [OPERATION ...]", file=sys.stderr)
+    print("       %s be_seq.csv pipeline sequenceroot:10:50 autodistance:cam_hdri_18-120 clothing_overlay" % (sys.argv[0]), file=sys.stderr)
     return
 
 ################################################################################
@@ -385,38 +303,24 @@ if len(sys.argv) < 3:
 csv_path = Path(sys.argv[1])
 target_type = sys.argv[2]
 
-if target_type == "camera":
-    config_type = sys.argv[3]
-    if not config_type in configs_camera:
-        print(f"ERROR: Undefined camera type: {config_type}", file=sys.stderr)
-        print(configs_camera.keys())
+# Pipeline operations are given as TARGETTYPE[:ARG[:ARG]] and applied in order on one in-memory table.
+# Output name and result are the same as chaining single runs on the respective intermediate files.
+if target_type == "pipeline":
+    if len(sys.argv) < 4:
+        print_usage()
         sys.exit(1)
 
-    change_camera(csv_path, configs_camera[config_type], config_type)
-elif target_type == "cameraroot":
-    change_camera_root(csv_path)
-elif target_type == "sequenceroot":
-    if len(sys.argv) == 3:
-        change_sequence_root(csv_path)
-    else:
-        angle_min = int(sys.argv[3])
-        angle_max = int(sys.argv[4])
-        change_sequence_root(csv_path, angle_min, angle_max)
-
-elif target_type == "autodistance":
-    config_type = sys.argv[3]
-    if not config_type in configs_camera:
-        print(f"ERROR: Undefined camera type: {config_type}", file=sys.stderr)
-        print(configs_camera.keys())
-        sys.exit(1)
-    change_autodistance(csv_path, configs_camera[config_type], config_type)
-elif target_type == "clothing_overlay":
-    if len(sys.argv) == 4:
-        clothing_overlay_add(csv_path)
-    else:
-        clothing_overlay_replace(csv_path)
+    operations = [get_operation(items[0], items[1:]) for items in [operation.split(":") for operation in sys.argv[3:]]]
 else:
-    print(f"ERROR: Unknown target type: {target_type}", file=sys.stderr)
-    sys.exit(1)
+    operations = [get_operation(target_type, sys.argv[3:])]
+
+be_seq = read_be_seq(csv_path)
+
+suffix = ""
+for (operation, operation_suffix) in operations:
+    operation(be_seq)
+    suffix += operation_suffix
+
+save_sequences(be_seq, csv_path, suffix)
 
 sys.exit(0)
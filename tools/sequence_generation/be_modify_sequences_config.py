@@ -7,6 +7,7 @@ from typing import NamedTuple
 # Globals
 SUBJECT_GENDER_PATH = Path("../../config/gender.csv")                       # Gender information for each subject
 TEXTURES_OVERLAY_PATH = Path("../../config/textures_clothing_overlay.json") # List of available overlay textures per gender
+CONFIG_CACHE_PATH = Path("../../stats/config_cache.pkl")                    # Binary cache of parsed configuration files, see be_config_cache.py
 
 # Predefined configurations
 # Notes:
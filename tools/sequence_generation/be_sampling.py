@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Stratified low-discrepancy sampling of sequence parameters
+#
+# Parameters of all sequences of a render job are drawn as rows of one point set in
+# the unit hypercube and then mapped to the configured parameter ranges. Scrambled
+# Sobol and Halton sequences and Latin hypercube strata cover the parameter space
+# more evenly than independent uniform draws, so a target distribution is reached
+# with fewer rendered sequences.
+#
+# Usage:
+#   python be_sampling.py NUM_SAMPLES DIMENSIONS   # show coverage of all sampling methods
+#   python be_sampling.py 1000 4
+#
+import sys
+
+import numpy as np
+
+SAMPLING_METHODS = ["random", "sobol", "halton", "lhs"]
+
+SOBOL_BITS = 32
+
+# Primitive polynomials and initial direction numbers for Sobol dimensions 2-16 (Joe & Kuo, new-joe-kuo-6.21201)
+# (degree s, coefficients a, initial direction numbers m)
+SOBOL_DIRECTIONS = [
+    (1, 0, [1]),
+    (2, 1, [1, 3]),
+    (3, 1, [1, 3, 1]),
+    (3, 2, [1, 1, 1]),
+    (4, 1, [1, 1, 3, 3]),
+    (4, 4, [1, 3, 5, 13]),
+    (5, 2, [1, 1, 5, 5, 17]),
+    (5, 4, [1, 1, 5, 5, 5]),
+    (5, 7, [1, 1, 7, 11, 19]),
+    (5, 11, [1, 1, 5, 1, 1]),
+    (5, 13, [1, 1, 1, 3, 11]),
+    (5, 14, [1, 3, 5, 5, 31]),
+    (6, 1, [1, 3, 3, 9, 7, 49]),
+    (6, 13, [1, 1, 1, 15, 21, 21]),
+    (6, 16, [1, 3, 1, 13, 27, 49]),
+]
+
+HALTON_PRIMES = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53]
+
+################################################################################
+# Point sets in unit hypercube
+################################################################################
+
+def get_sobol_direction_numbers(dimensions):
+    """
+    Direction numbers (dimensions, SOBOL_BITS) as integers with SOBOL_BITS bits
+    """
+    if dimensions > len(SOBOL_DIRECTIONS) + 1:
+        print(f"ERROR: Sobol sampling supports at most {len(SOBOL_DIRECTIONS) + 1} dimensions", file=sys.stderr)
+        sys.exit(1)
+
+    directions = np.zeros((dimensions, SOBOL_BITS), dtype=np.uint64)
+    directions[0] = [1 << (SOBOL_BITS - 1 - bit) for bit in range(SOBOL_BITS)]
+    for dimension in range(1, dimensions):
+        (s, a, m) = SOBOL_DIRECTIONS[dimension - 1]
+        v = [m[bit] << (SOBOL_BITS - 1 - bit) for bit in range(s)]
+        for bit in range(s, SOBOL_BITS):
+            value = v[bit - s] ^ (v[bit - s] >> s)
+            for k in range(1, s):
+                if (a >> (s - 1 - k)) & 1:
+                    value ^= v[bit - k]
+            v.append(value)
+        directions[dimension] = v
+
+    return directions
+
+def scramble_sobol_direction_numbers(rng, directions):
+    """
+    Linear matrix scrambling: multiply direction numbers with random lower triangular binary matrix with unit diagonal
+    """
+    (dimensions, bits) = directions.shape
+    shifts = np.arange(bits - 1, -1, -1, dtype=np.uint64) # bit k of direction number is stored at position bits-1-k
+    scrambled = np.zeros_like(directions)
+    for dimension in range(dimensions):
+        matrix = np.tril(rng.integers(0, 2, (bits, bits), dtype=np.uint64), -1) + np.eye(bits, dtype=np.uint64)
+        digits = (directions[dimension][:, np.newaxis] >> shifts[np.newaxis, :]) & np.uint64(1) # (direction, bit)
+        scrambled_digits = (digits @ matrix.T) & np.uint64(1)
+        scrambled[dimension] = np.bitwise_or.reduce(scrambled_digits << shifts[np.newaxis, :], axis=1)
+    return scrambled
+
+def get_sobol_points(directions, shift, start, num_points):
+    """
+    Sobol points [start, start + num_points) in Gray code order with digital shift
+    """
+    indices = np.arange(start, start + num_points, dtype=np.uint64)
+    gray = indices ^ (indices >> np.uint64(1))
+    points = np.broadcast_to(shift, (num_points, len(shift))).copy()
+    for bit in range(directions.shape[1]):
+        use_bit = ((gray >> np.uint64(bit)) & np.uint64(1)).astype(bool)
+        points[use_bit] ^= directions[:, bit]
+    return points.astype(np.float64) / float(1 << directions.shape[1])
+
+def get_halton_points(permutations, start, num_points):
+    """
+    Halton points [start, start + num_points) with random digit permutations per dimension and digit position
+    """
+    indices = np.arange(start, start + num_points, dtype=np.int64)
+    points = np.zeros((num_points, len(permutations)), dtype=np.float64)
+    for (dimension, digit_permutations) in enumerate(permutations):
+        base = len(digit_permutations[0])
+        remainder = indices.copy()
+        scale = 1.0 / base
+        for permutation in digit_permutations:
+            points[:, dimension] += permutation[remainder % base] * scale
+            remainder //= base
+            scale /= base
+    return points
+
+def get_latin_hypercube_points(rng, num_points, dimensions):
+    """
+    One point in each of num_points strata per dimension, strata of different dimensions are randomly paired
+    """
+    strata = np.argsort(rng.random((dimensions, num_points)), axis=1).T
+    return (strata + rng.random((num_points, dimensions))) / num_points
+
+class ParameterSampler:
+    """
+    Unit hypercube samples for named parameters, one row per sequence.
+    Consecutive sample() calls continue the Sobol/Halton sequence. Latin hypercube
+    strata are built for each call, at least block_size rows at once, so that the
+    first call for a whole render job is stratified over all sequences.
+    """
+    def __init__(self, method, parameters, rng, block_size=0):
+        if method not in SAMPLING_METHODS:
+            print(f"ERROR: Invalid sampling method: {method}, valid: {SAMPLING_METHODS}", file=sys.stderr)
+            sys.exit(1)
+
+        self.method = method
+        self.parameters = list(parameters)
+        self.rng = rng
+        self.block_size = block_size
+        self.index = 0
+        self.pending = np.zeros((0, len(self.parameters)), dtype=np.float64)
+
+        dimensions = len(self.parameters)
+        if method == "sobol":
+            self.directions = scramble_sobol_direction_numbers(rng, get_sobol_direction_numbers(dimensions))
+            self.shift = rng.integers(0, 1 << SOBOL_BITS, dimensions, dtype=np.uint64)
+        elif method == "halton":
+            if dimensions > len(HALTON_PRIMES):
+                print(f"ERROR: Halton sampling supports at most {len(HALTON_PRIMES)} dimensions", file=sys.stderr)
+                sys.exit(1)
+            # Enough digits for 2^31 points in every base
+            self.permutations = [[rng.permutation(base) for _ in range(int(np.ceil(31 / np.log2(base))))] for base in HALTON_PRIMES[:dimensions]]
+
+    def get_points(self, num_points):
+        if self.method == "sobol":
+            points = get_sobol_points(self.directions, self.shift, self.index, num_points)
+        elif self.method == "halton":
+            points = get_halton_points(self.permutations, self.index, num_points)
+        elif self.method == "lhs":
+            points = get_latin_hypercube_points(self.rng, num_points, len(self.parameters))
+        else:
+            points = self.rng.random((num_points, len(self.parameters)))
+        self.index += num_points
+        return points
+
+    def sample(self, num_samples):
+        """
+        Returns dictionary parameter => (num_samples,) unit values
+        """
+        if len(self.pending) < num_samples:
+            self.pending = np.concatenate([self.pending, self.get_points(max(num_samples - len(self.pending), self.block_size))])
+        (samples, self.pending) = (self.pending[:num_samples], self.pending[num_samples:])
+        return { parameter: samples[:, index] for (index, parameter) in enumerate(self.parameters) }
+
+    def redraw(self, samples):
+        """
+        Redraw unit values (dictionary parameter => (N,) values) uniformly inside their strata.
+        Strata are the block_size equal intervals per parameter, so retried samples keep the coverage of the point set.
+        Random points have no strata and are drawn again.
+        """
+        if self.method == "random":
+            return { parameter: self.rng.random(len(unit)) for (parameter, unit) in samples.items() }
+
+        strata = max(self.block_size, 1)
+        redrawn = {}
+        for (parameter, unit) in samples.items():
+            stratum = np.minimum(np.floor(np.asarray(unit, dtype=np.float64) * strata), strata - 1)
+            redrawn[parameter] = (stratum + self.rng.random(len(stratum))) / strata
+        return redrawn
+
+################################################################################
+# Mapping to parameter ranges
+################################################################################
+
+def get_range_value(unit, ranges):
+    """
+    Map unit values to list of equally likely (min, max) ranges.
+    Range index and position inside range are both taken from the unit value so that strata are kept.
+    """
+    ranges = np.asarray(ranges, dtype=np.float64).reshape(-1, 2)
+    scaled = np.asarray(unit, dtype=np.float64) * len(ranges)
+    range_index = np.minimum(scaled.astype(np.int64), len(ranges) - 1)
+    fraction = scaled - range_index
+    return ranges[range_index, 0] + fraction * (ranges[range_index, 1] - ranges[range_index, 0])
+
+def get_range_index(unit, num_values):
+    """
+    Map unit values to integer values [0, num_values)
+    """
+    return np.minimum((np.asarray(unit) * num_values).astype(np.int64), num_values - 1)
+
+################################################################################
+# Coverage report
+################################################################################
+
+def get_discrepancy(unit):
+    """
+    One-dimensional star discrepancy: maximum distance between empirical and uniform distribution function
+    """
+    unit = np.sort(np.asarray(unit, dtype=np.float64))
+    n = len(unit)
+    if n == 0:
+        return float("nan")
+    i = np.arange(1, n + 1)
+    return float(np.max(np.maximum(i / n - unit, unit - (i - 1) / n)))
+
+def get_coverage_report(samples, bins):
+    """
+    Coverage of sampled unit values against uniform target distribution.
+      samples: parameter => list of unit values, one per sequence which uses the parameter
+      bins: number of histogram bins or dictionary parameter => number of bins
+    Returns list of rows (parameter, samples, bins, empty_bins, bin_count_min, bin_count_max, discrepancy)
+    """
+    rows = []
+    for (parameter, unit) in samples.items():
+        unit = np.asarray(unit, dtype=np.float64)
+        if len(unit) == 0:
+            continue
+        parameter_bins = bins[parameter] if isinstance(bins, dict) else bins
+        counts = np.bincount(get_range_index(unit, parameter_bins), minlength=parameter_bins)
+        rows.append((parameter, len(unit), parameter_bins, int(np.count_nonzero(counts == 0)), int(counts.min()), int(counts.max()), get_discrepancy(unit)))
+    return rows
+
+def get_pair_coverage(samples, sequence_samples, bins):
+    """
+    Ratio of occupied cells of bins x bins grid for all pairs of parameters which are used by the same sequences.
+      sequence_samples: list of dictionaries parameter => unit value, one per sequence
+    """
+    parameters = list(samples.keys())
+    coverage = []
+    for (index, parameter_a) in enumerate(parameters):
+        for parameter_b in parameters[index + 1:]:
+            pairs = np.array([(values[parameter_a], values[parameter_b]) for values in sequence_samples if (parameter_a in values) and (parameter_b in values)], dtype=np.float64).reshape(-1, 2)
+            if len(pairs) == 0:
+                continue
+            cells = get_range_index(pairs[:, 0], bins) * bins + get_range_index(pairs[:, 1], bins)
+            coverage.append((parameter_a, parameter_b, len(np.unique(cells)) / float(min(bins * bins, len(pairs)))))
+    return coverage
+
+def print_coverage_report(method, sequence_samples, bins, file=sys.stderr):
+    """
+    Print coverage of all parameters and parameter pairs in CSV format.
+      sequence_samples: list of dictionaries parameter => unit value, one per sequence
+    """
+    samples = {}
+    for values in sequence_samples:
+        for (parameter, unit) in values.items():
+            samples.setdefault(parameter, []).append(unit)
+
+    print(f"[INFO] Parameter coverage: sampling={method}, sequences={len(sequence_samples)}", file=file)
+    print("parameter,samples,bins,empty_bins,bin_count_min,bin_count_max,discrepancy", file=file)
+    for (parameter, num_samples, parameter_bins, empty_bins, bin_count_min, bin_count_max, discrepancy) in get_coverage_report(samples, bins):
+        print(f"{parameter},{num_samples},{parameter_bins},{empty_bins},{bin_count_min},{bin_count_max},{discrepancy:.4f}", file=file)
+
+    pair_bins = max(2, int(np.sqrt(len(sequence_samples)))) # one cell per sequence
+    pair_coverage = get_pair_coverage(samples, sequence_samples, pair_bins)
+    if len(pair_coverage) > 0:
+        print(f"[INFO] Pairwise coverage: occupied cells of {pair_bins}x{pair_bins} grid", file=file)
+        print("parameter_a,parameter_b,occupied_ratio", file=file)
+        for (parameter_a, parameter_b, ratio) in pair_coverage:
+            print(f"{parameter_a},{parameter_b},{ratio:.3f}", file=file)
+    return
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} NUM_SAMPLES DIMENSIONS", file=sys.stderr)
+        sys.exit(1)
+
+    num_samples = int(sys.argv[1])
+    dimensions = int(sys.argv[2])
+    parameters = [f"p{dimension}" for dimension in range(dimensions)]
+    bins = max(2, min(100, num_samples // 10))
+
+    for method in SAMPLING_METHODS:
+        sampler = ParameterSampler(method, parameters, np.random.default_rng(), block_size=num_samples)
+        units = sampler.sample(num_samples)
+        sequence_samples = [{ parameter: float(units[parameter][index]) for parameter in parameters } for index in range(num_samples)]
+        print_coverage_report(method, sequence_samples, bins, file=sys.stdout)
+        print("")
+
+    sys.exit(0)
@@ -0,0 +1,240 @@
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Typed columnar access to be_seq.csv body scene definition files
+#
+# Index and pose columns (X, Y, Z, Yaw, Pitch, Roll) are stored as NumPy arrays,
+# the Comment column is decoded into one attribute dictionary per row.
+# Sequence names are indexed and each Group row knows the row range of its bodies.
+#
+# Unmodified cells are written back with their source text so that reading and
+# writing an unmodified file round-trips losslessly. Modified poses are written
+# with Python float formatting, modified attributes are encoded in dictionary order.
+#
+import csv
+import numpy as np
+
+HEADER = ["Index", "Type", "Body", "X", "Y", "Z", "Yaw", "Pitch", "Roll", "Comment"]
+POSE_COLUMNS = HEADER[3:9]
+
+################################################################################
+# Comment attributes
+################################################################################
+
+def decode_comment(comment):
+    """
+    Decode "key=value;key=value" comment into dictionary. Items without value are stored with value None.
+    """
+    attributes = {}
+    if comment == "":
+        return attributes
+
+    for item in comment.split(";"):
+        if "=" in item:
+            (key, value) = item.split("=", maxsplit=1)
+            attributes[key] = value
+        else:
+            attributes[item] = None
+    return attributes
+
+def get_comment_value(comment, key):
+    """
+    Value of single comment attribute without decoding the full comment, None if missing or without value
+    """
+    comment = f";{comment}"
+    start = comment.rfind(f";{key}=")
+    if start < 0:
+        return None
+    start += len(key) + 2
+    end = comment.find(";", start)
+    return comment[start:] if end < 0 else comment[start:end]
+
+def encode_comment(attributes):
+    items = []
+    for (key, value) in attributes.items():
+        if value is None:
+            items.append(key)
+        else:
+            items.append(f"{key}={value}")
+    return ";".join(items)
+
+################################################################################
+# Table
+################################################################################
+
+class RowAttributes:
+    """
+    Comment attribute dictionaries per row, decoded on first access
+    """
+    def __init__(self, comments):
+        self.comments = comments
+        self.decoded = {}
+
+    def __len__(self):
+        return len(self.comments)
+
+    def __getitem__(self, row):
+        if row < 0:
+            row += len(self.comments)
+        attributes = self.decoded.get(row, None)
+        if attributes is None:
+            attributes = decode_comment(self.comments[row])
+            self.decoded[row] = attributes
+        return attributes
+
+    def __setitem__(self, row, attributes):
+        if row < 0:
+            row += len(self.comments)
+        self.decoded[row] = attributes
+
+class SequenceTable:
+    """
+    Columnar be_seq.csv data.
+      index: (N,) int64, type/body: lists of str, pose: (N, 6) float64, attributes: dict per row (decoded on access)
+      groups: Group row numbers in file order
+      sequences: sequence name => Group row number
+      body_rows: Group row number => range of its Body row numbers
+      row_group: (N,) int64, position in groups of the Group a row belongs to, -1 for rows before first Group
+    """
+    def __init__(self, columns, header=HEADER):
+        self.header = list(header)
+        self.source_columns = [ list(column) for column in columns ]
+
+        self.type = self.source_columns[1]
+        self.body = self.source_columns[2]
+        self.attributes = RowAttributes(self.source_columns[9])
+
+        # Index and pose are converted on first access
+        self._index = None
+        self._pose = None
+
+        # Group structure from type column, body row range ends at last Body row before next Group
+        self.type_array = np.array(self.type, dtype=str)
+        group_mask = self.type_array == "Group"
+        self.row_group = np.cumsum(group_mask, dtype=np.int64) - 1
+        self.groups = np.flatnonzero(group_mask).tolist()
+
+        body_end = [ (group_row + 1) for group_row in self.groups ]
+        body_rows = np.flatnonzero((self.type_array == "Body") & (self.row_group >= 0))
+        if len(body_rows) > 0:
+            body_groups = self.row_group[body_rows]
+            last_mask = np.append(body_groups[1:] != body_groups[:-1], True)
+            for (group, row) in zip(body_groups[last_mask].tolist(), body_rows[last_mask].tolist()):
+                body_end[group] = row + 1
+
+        self.body_rows = {}
+        self.sequences = {}
+        for (group, group_row) in enumerate(self.groups):
+            self.body_rows[group_row] = range(group_row + 1, body_end[group])
+            sequence_name = get_comment_value(self.source_columns[9][group_row], "sequence_name")
+            if sequence_name is not None:
+                self.sequences[sequence_name] = group_row
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = np.array(list(map(int, self.source_columns[0])), dtype=np.int64)
+            self.source_index = self._index.copy()
+        return self._index
+
+    @property
+    def pose(self):
+        if self._pose is None:
+            self._pose = np.array([list(map(float, column)) for column in self.source_columns[3:9]], dtype=np.float64).reshape(len(POSE_COLUMNS), len(self)).T.copy()
+            self.source_pose = self._pose.copy()
+        return self._pose
+
+    def get_row_poses(self, rows):
+        """
+        (len(rows), 6) poses of given rows, only these rows are converted if pose was not accessed yet
+        """
+        if self._pose is not None:
+            return self._pose[rows]
+        pose_columns = self.source_columns[3:9]
+        return np.array([[float(column[row]) for column in pose_columns] for row in rows], dtype=np.float64).reshape(len(rows), len(POSE_COLUMNS))
+
+    def __len__(self):
+        return len(self.type)
+
+    def get_group_row(self, sequence_name):
+        return self.sequences[sequence_name]
+
+    def get_sequence_body_rows(self, sequence_name):
+        return self.body_rows[self.sequences[sequence_name]]
+
+    def get_rows(self, rowtype):
+        return np.flatnonzero(self.type_array == rowtype).tolist()
+
+    def get_row_mask(self, rowtype):
+        return self.type_array == rowtype
+
+    def get_float(self, row, key, default=None):
+        value = self.attributes[row].get(key, None)
+        if value is None:
+            return default
+        return float(value)
+
+    def get_int(self, row, key, default=None):
+        value = self.attributes[row].get(key, None)
+        if value is None:
+            return default
+        return int(value)
+
+    def get_output_rows(self):
+        """
+        Rows as lists of str, unmodified cells use their source text
+        """
+        output_rows = [ list(row) for row in zip(*self.source_columns) ]
+
+        # Only converted or decoded cells can be modified
+        if self._index is not None:
+            for row in np.flatnonzero(self._index != self.source_index).tolist():
+                output_rows[row][0] = str(int(self._index[row]))
+
+        if self._pose is not None:
+            for (row, column) in np.argwhere(self._pose != self.source_pose).tolist():
+                output_rows[row][3 + column] = str(float(self._pose[row, column]))
+
+        for (row, attributes) in self.attributes.decoded.items():
+            if attributes != decode_comment(self.source_columns[9][row]):
+                output_rows[row][9] = encode_comment(attributes)
+
+        return output_rows
+
+    def write(self, csv_path):
+        with open(csv_path, "w", newline="") as f:
+            csv_writer = csv.writer(f, lineterminator="\n")
+            csv_writer.writerow(self.header)
+            csv_writer.writerows(self.get_output_rows())
+
+def parse_be_seq(text):
+    """
+    Parse be_seq.csv text (including header) into SequenceTable, None if there is no header.
+    Unquoted files are split per line directly, files with quoted cells are parsed with csv module.
+    Raises ValueError with the line number of the first line which does not have one cell per header column.
+    """
+    lines = text.replace("\r\n", "\n").split("\n")
+
+    # (line number, cells) of non-empty lines
+    if '"' not in text:
+        rows = [ (number, line.split(",")) for (number, line) in enumerate(lines, start=1) if len(line) > 0 ]
+    else:
+        csv_reader = csv.reader(lines)
+        rows = [ (csv_reader.line_num, row) for row in csv_reader if len(row) > 0 ]
+
+    if len(rows) == 0:
+        return None
+
+    for (number, row) in rows:
+        if len(row) != len(HEADER):
+            raise ValueError(f"be_seq.csv line {number}: {len(row)} cells, expected {len(HEADER)}")
+
+    header = rows[0][1]
+    columns = list(zip(*[ row for (_, row) in rows[1:] ]))
+    if len(columns) == 0:
+        columns = [ [] for _ in HEADER ]
+    return SequenceTable(columns, header)
+
+def read_be_seq(csv_path):
+    with open(csv_path, mode="r", newline="") as f:
+        return parse_be_seq(f.read())
@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Simulate look-at and follow camera tracking offline and generate fully keyframed cameras (be_camera_animations_depth.json)
+#
+# Look-at and follow cameras are driven by low pass filters (LookAtTrackingInterpSpeed) which are ticked once per
+# temporal sample in Unreal. Instead of rebuilding the depth pass keyframes from the rendered camera ground truth
+# (be_generate_camera_animations_depth.py) the camera controllers are simulated here for the temporal sample count
+# of the image pass, using the root trajectories of the SMPL-X animations referenced in be_seq.csv.
+# Both render passes could then be queued together, but the simulation error against an Unreal render is not measured yet.
+# Until it is measured for one rendered look-at job and one rendered follow job, keep using be_generate_camera_animations_depth.py
+# for the depth pass and run this script with CAMERA_GT_ROOT on rendered jobs to record the error.
+#
+# Approximations:
+#   + Look-at target sockets are placed at fixed offsets (BODYPART_HEIGHTS) from the animated root translation, body pitch/roll are ignored.
+#     Offsets are rest pose joint heights relative to the SMPL-X translation origin, which lies above the pelvis, so they are negative below the neck.
+#   + Look-at offset is applied along world Z instead of the socket axis
+#   + BE_CameraOperator follow camera is modeled as arm with fixed yaw (body yaw + FollowCameraYawOffset) behind the target,
+#     the arm does not turn with the body
+#   + Camera shakes are not simulated, shake settings are passed on to the depth pass
+#
+# Usage:
+#   python be_simulate_camera_tracking.py BE_SEQ_CSV [CAMERA_GT_ROOT]
+#   python be_simulate_camera_tracking.py images/be_seq.csv
+#   python be_simulate_camera_tracking.py images/be_seq.csv render_output/ground_truth/meta_exr_csv     # compare against rendered camera ground truth
+#
+import csv
+import json
+from pathlib import Path
+import sys
+
+import numpy as np
+
+from be_keyframe_reduction import reduce_keyframes
+from be_seq_csv import read_be_seq
+from be_simulate_camera_tracking_config import *
+from be_trajectory_index import get_animation_npz_path, get_frame_rate_divisor, load_trajectory_index
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "unreal" / "render" / "Core" / "Python"))
+from be_camera_animations_bin import load_camera_animations, write_camera_animations_sidecar
+
+################################################################################
+# Unreal rotations
+################################################################################
+
+def normalize_angle(angle):
+    """
+    Normalize angles [deg] to (-180, 180] like FRotator::NormalizeAxis
+    """
+    angle = np.mod(angle, 360.0)
+    return np.where(angle > 180.0, angle - 360.0, angle)
+
+def get_rotation_axes(yaw, pitch, roll):
+    """
+    X, Y, Z axes (..., 3) of Unreal rotator [deg], see FRotationMatrix
+    """
+    (sp, cp) = (np.sin(np.radians(pitch)), np.cos(np.radians(pitch)))
+    (sy, cy) = (np.sin(np.radians(yaw)), np.cos(np.radians(yaw)))
+    (sr, cr) = (np.sin(np.radians(roll)), np.cos(np.radians(roll)))
+
+    x_axis = np.stack((cp * cy, cp * sy, sp), axis=-1)
+    y_axis = np.stack((sr * sp * cy - cr * sy, sr * sp * sy + cr * cy, -sr * cp), axis=-1)
+    z_axis = np.stack((-(cr * sp * cy + sr * sy), cy * sr - cr * sp * sy, cr * cp), axis=-1)
+    return (x_axis, y_axis, z_axis)
+
+def get_rotator(x_axis, y_axis, z_axis):
+    """
+    Unreal rotator (yaw, pitch, roll) [deg] of rotation axes, see FMatrix::Rotator
+    """
+    yaw = np.degrees(np.arctan2(x_axis[..., 1], x_axis[..., 0]))
+    pitch = np.degrees(np.arctan2(x_axis[..., 2], np.hypot(x_axis[..., 0], x_axis[..., 1])))
+
+    (_, sy_axis, _) = get_rotation_axes(yaw, pitch, 0.0)
+    roll = np.degrees(np.arctan2(np.sum(z_axis * sy_axis, axis=-1), np.sum(y_axis * sy_axis, axis=-1)))
+    return (yaw, pitch, roll)
+
+def get_look_at_rotation(camera_locations, target_locations):
+    """
+    Yaw and pitch [deg] of direction from camera to target, see FVector::Rotation
+    """
+    direction = target_locations - camera_locations
+    yaw = np.degrees(np.arctan2(direction[..., 1], direction[..., 0]))
+    pitch = np.degrees(np.arctan2(direction[..., 2], np.hypot(direction[..., 0], direction[..., 1])))
+    return (yaw, pitch)
+
+def simulate_look_at(target_yaw, target_pitch, interp_speed, delta_time):
+    """
+    Look-at tracking of CineCameraActor for all sequences at once.
+    First tick snaps to target, following ticks use FMath::RInterpTo(current, target, delta_time, interp_speed).
+      target_yaw, target_pitch: (S, T) per sequence and tick, interp_speed: (S,)
+    """
+    yaw = np.empty_like(target_yaw)
+    pitch = np.empty_like(target_pitch)
+    yaw[:, 0] = target_yaw[:, 0]
+    pitch[:, 0] = target_pitch[:, 0]
+
+    alpha = np.clip(delta_time * interp_speed, 0.0, 1.0)
+    alpha = np.where(interp_speed > 0, alpha, 1.0)
+    for tick in range(1, target_yaw.shape[1]):
+        delta_yaw = normalize_angle(target_yaw[:, tick] - yaw[:, tick - 1])
+        delta_pitch = normalize_angle(target_pitch[:, tick] - pitch[:, tick - 1])
+        yaw[:, tick] = normalize_angle(yaw[:, tick - 1] + alpha * delta_yaw)
+        pitch[:, tick] = normalize_angle(pitch[:, tick - 1] + alpha * delta_pitch)
+
+    return (yaw, pitch)
+
+################################################################################
+# Scene evaluation
+################################################################################
+
+def get_tick_times(frames, temporal_samples):
+    """
+    Evaluation times [frames] of all camera ticks from first warmup frame to last keyframe (frame index = frames).
+    Frame center shutter: temporal sample temporal_samples//2 is at the frame time for odd sample counts.
+    """
+    frame_indices = np.arange(-WARMUP_FRAMES, frames + 1)
+    subframes = (np.arange(temporal_samples) - (temporal_samples - 1) / 2) / temporal_samples
+    tick_times = (frame_indices[:, np.newaxis] + subframes[np.newaxis, :]).reshape(-1)
+    frame_ticks = (frame_indices + WARMUP_FRAMES) * temporal_samples + temporal_samples // 2
+    return (frame_indices, tick_times, frame_ticks)
+
+def interpolate_keyframes(keyframes, get_value, default, times):
+    """
+    Linear keyframe interpolation with constant extrapolation, keyframes without value are skipped
+    """
+    keys = [(keyframe["frame_index"], get_value(keyframe)) for keyframe in keyframes]
+    keys = [(frame_index, value) for (frame_index, value) in keys if value is not None]
+    if len(keys) == 0:
+        return np.full(len(times), default, dtype=np.float64)
+
+    (frame_indices, values) = zip(*keys)
+    return np.interp(times, frame_indices, values)
+
+def get_keyframe_value(group, key):
+    return lambda keyframe: keyframe.get(group, {}).get(key, None)
+
+def get_keyframed_camera(keyframes, camera_pose, times):
+    """
+    World locations (T, 3) and rotation axes of camera attached to keyframed camera root
+    """
+    (x, y, z, yaw, pitch, roll) = camera_pose
+
+    cameraroot_location = np.stack([interpolate_keyframes(keyframes, get_keyframe_value("cameraroot", key), 0.0, times) for key in ["x", "y", "z"]], axis=1)
+    cameraroot_yaw = interpolate_keyframes(keyframes, get_keyframe_value("cameraroot", "yaw"), 0.0, times)
+    cameraroot_pitch = interpolate_keyframes(keyframes, get_keyframe_value("cameraroot", "pitch"), 0.0, times)
+    cameraroot_axes = get_rotation_axes(cameraroot_yaw, cameraroot_pitch, 0.0) # cameraroot roll is not animated
+
+    camera_local = np.stack([interpolate_keyframes(keyframes, get_keyframe_value("camera_local", key), default, times) for (key, default) in [("x", x), ("y", y), ("z", z)]], axis=1)
+    camera_local_axes = get_rotation_axes(interpolate_keyframes(keyframes, get_keyframe_value("camera_local", "yaw"), yaw, times),
+                                          interpolate_keyframes(keyframes, get_keyframe_value("camera_local", "pitch"), pitch, times),
+                                          interpolate_keyframes(keyframes, get_keyframe_value("camera_local", "roll"), roll, times))
+
+    camera_location = cameraroot_location + sum(camera_local[:, [axis_index]] * cameraroot_axes[axis_index] for axis_index in range(3))
+    camera_axes = [sum(camera_local_axes[axis_index][:, [component]] * cameraroot_axes[component] for component in range(3)) for axis_index in range(3)]
+    return (camera_location, camera_axes)
+
+def get_keyframed_hfov(keyframes, hfov, times):
+    """
+    HFOV [deg] at given times. Unreal interpolates focal length, sensor width cancels out.
+    """
+    inverse_tan = interpolate_keyframes(keyframes, lambda keyframe: (1.0 / np.tan(np.radians(keyframe["hfov"] / 2))) if "hfov" in keyframe else None, 1.0 / np.tan(np.radians(hfov / 2)), times)
+    return 2 * np.degrees(np.arctan(1.0 / inverse_tan))
+
+class AnimationCache:
+    """
+    30fps root translations of SMPL-X animations, loaded on first use.
+    Packed trajectory index (be_trajectory_index.py) is used if given, fallback to .npz animation files.
+    """
+    def __init__(self, animation_folder, trajectory_index=None):
+        self.animation_folder = animation_folder
+        self.trajectory_index = trajectory_index
+        self.trans = {}
+
+    def get_trans(self, body):
+        trans = self.trans.get(body, None)
+        if trans is None:
+            (subject, animation_name) = body.rsplit("_", maxsplit=1)
+            if self.trajectory_index is not None:
+                (trans, _) = self.trajectory_index.get_trans(subject, animation_name)
+                if trans is not None:
+                    trans = np.asarray(trans, dtype=np.float64)
+                    self.trans[body] = trans
+                    return trans
+                print(f"WARNING: Animation not in trajectory index, loading source data: {body}", file=sys.stderr)
+
+            filepath = get_animation_npz_path(self.animation_folder, subject, animation_name)
+            if not filepath.exists():
+                print(f"ERROR: Animation not found: {filepath}", file=sys.stderr)
+                sys.exit(1)
+
+            with np.load(filepath) as data:
+                trans = data["trans"][::get_frame_rate_divisor(float(data["mocap_frame_rate"]))].astype(np.float64)
+            self.trans[body] = trans
+
+        return trans
+
+def get_body_target(trans, start_frame, body_pose, height, times):
+    """
+    World locations (T, 3) [cm] of look-at target socket of animated body.
+    Sequence frame t shows animation frame t + start_frame, animation is clamped outside of its range.
+    SMPL-X (X, Y-up, Z) [m] maps to Unreal (X, Z-up, Y) [cm] before body yaw is applied.
+    """
+    (x, y, z, yaw, _, _) = body_pose
+    animation_times = np.clip(times + start_frame, 0, len(trans) - 1)
+    frames = np.arange(len(trans))
+    local_x = 100.0 * np.interp(animation_times, frames, trans[:, 0])
+    local_y = 100.0 * np.interp(animation_times, frames, trans[:, 2])
+    local_z = 100.0 * np.interp(animation_times, frames, trans[:, 1]) + height
+
+    (sy, cy) = (np.sin(np.radians(yaw)), np.cos(np.radians(yaw)))
+    return np.stack((x + cy * local_x - sy * local_y, y + sy * local_x + cy * local_y, z + local_z), axis=1)
+
+################################################################################
+# Simulation
+################################################################################
+
+def get_sequence_setup(camera_animations, sequence_name, be_seq, animation_cache, temporal_samples):
+    """
+    Camera locations, look-at targets and keyframed rotations for all ticks of a sequence
+    """
+    config = camera_animations["info"]["config"]
+    sequence_camera_data = camera_animations[sequence_name]
+    info = sequence_camera_data["info"]
+    keyframes = sequence_camera_data["keyframes"]
+
+    group_row = be_seq.get_group_row(sequence_name)
+    frames = be_seq.get_int(group_row, "frames")
+    (frame_indices, tick_times, frame_ticks) = get_tick_times(frames, temporal_samples)
+
+    setup = { "frame_indices": frame_indices, "frame_ticks": frame_ticks, "target": None }
+    setup["hfov"] = get_keyframed_hfov(keyframes, be_seq.get_float(group_row, "camera_hfov"), frame_indices)
+
+    follow_camera = config["follow"]
+    look_at_camera = config["look_at"] and not follow_camera
+
+    if look_at_camera or follow_camera:
+        look_at_target = config.get("look_at_target", "body_0")
+        offset_z = info.get("look_at_offset_z", 0.0)
+        if look_at_target == "body_0":
+            body_row = be_seq.get_sequence_body_rows(sequence_name).start
+            body = be_seq.body[body_row]
+            bodypart = info.get("look_at_bodypart", "pelvis" if config["follow_static_location"] else "spine1")
+            if bodypart not in BODYPART_HEIGHTS:
+                print(f"ERROR: Unsupported look-at body part: {bodypart}", file=sys.stderr)
+                sys.exit(1)
+
+            start_frame = be_seq.get_int(body_row, "start_frame", 0)
+            setup["target"] = get_body_target(animation_cache.get_trans(body), start_frame, be_seq.pose[body_row], BODYPART_HEIGHTS[bodypart] + offset_z, tick_times)
+        elif look_at_target == "cameraroot":
+            cameraroot = keyframes[0]["cameraroot"]
+            setup["target"] = np.tile([cameraroot["x"], cameraroot["y"], info["ground_height_world"] + offset_z], (len(tick_times), 1))
+        else:
+            print(f"ERROR: Unsupported look-at target: {look_at_target}", file=sys.stderr)
+            sys.exit(1)
+
+        setup["interp_speed"] = config["look_at_interp_speed"]
+        setup["roll"] = info.get("camera_roll", 0.0)
+
+    if follow_camera:
+        body_yaw = be_seq.pose[be_seq.get_sequence_body_rows(sequence_name).start, 3]
+        arm_yaw = np.radians(body_yaw + info["follow_camera_yaw_offset"])
+        distance = info["follow_camera_distance"]
+
+        camera_location = np.empty_like(setup["target"])
+        camera_location[:, 0] = setup["target"][:, 0] - distance * np.cos(arm_yaw)
+        camera_location[:, 1] = setup["target"][:, 1] - distance * np.sin(arm_yaw)
+        camera_location[:, 2] = info["ground_height_world"] + info["camera_height"]
+        if config["follow_static_location"]:
+            camera_location[:] = camera_location[0]
+        setup["camera_location"] = camera_location
+    else:
+        (camera_location, camera_axes) = get_keyframed_camera(keyframes, be_seq.pose[group_row], tick_times)
+        setup["camera_location"] = camera_location
+        if not look_at_camera:
+            setup["rotation"] = get_rotator(*[axis[frame_ticks] for axis in camera_axes])
+
+    return setup
+
+def simulate_cameras(camera_animations, be_seq, animation_cache, temporal_samples):
+    """
+    Simulated world space camera locations (ticks, 3), rotations and HFOV of all sequences.
+    Returns sequence names and setups, setup["rotation"] and setup["hfov"] are indexed by setup["frame_indices"].
+    """
+    config = camera_animations["info"]["config"]
+    if config["static_world_location"]:
+        print("ERROR: Static world location cameras use the camera setup of the LevelSequence template and cannot be simulated", file=sys.stderr)
+        sys.exit(1)
+
+    sequence_names = [key for key in camera_animations if key != "info"]
+    setups = [get_sequence_setup(camera_animations, sequence_name, be_seq, animation_cache, temporal_samples) for sequence_name in sequence_names]
+
+    # Look-at filters of all sequences are ticked together, shorter sequences are padded with their last tick
+    tracking_setups = [setup for setup in setups if setup["target"] is not None]
+    if len(tracking_setups) > 0:
+        ticks = max(len(setup["target"]) for setup in tracking_setups)
+        target_yaw = np.empty((len(tracking_setups), ticks))
+        target_pitch = np.empty((len(tracking_setups), ticks))
+        for (setup_index, setup) in enumerate(tracking_setups):
+            (yaw, pitch) = get_look_at_rotation(setup["camera_location"], setup["target"])
+            target_yaw[setup_index] = np.pad(yaw, (0, ticks - len(yaw)), mode="edge")
+            target_pitch[setup_index] = np.pad(pitch, (0, ticks - len(pitch)), mode="edge")
+
+        interp_speed = np.array([setup["interp_speed"] for setup in tracking_setups], dtype=np.float64)
+        (yaw, pitch) = simulate_look_at(target_yaw, target_pitch, interp_speed, 1.0 / (FPS * temporal_samples))
+        for (setup_index, setup) in enumerate(tracking_setups):
+            frame_ticks = setup["frame_ticks"]
+            setup["rotation"] = (yaw[setup_index, frame_ticks], pitch[setup_index, frame_ticks], np.full(len(frame_ticks), setup["roll"]))
+
+    return (sequence_names, setups)
+
+def simulate_camera_animations(camera_animations, be_seq, animation_cache, temporal_samples):
+    config = camera_animations["info"]["config"]
+    (sequence_names, setups) = simulate_cameras(camera_animations, be_seq, animation_cache, temporal_samples)
+
+    info_depth = { "config":{} }
+    info_depth["config"]["sensor_width"] = config["sensor_width"]
+    info_depth["config"]["sensor_height"] = config["sensor_height"]
+    info_depth["config"]["static_world_location"] = False
+    info_depth["config"]["follow"] = False
+    info_depth["config"]["look_at"] = False
+
+    camera_animations_depth = {}
+    camera_animations_depth["info"] = info_depth
+
+    for (sequence_name, setup) in zip(sequence_names, setups):
+        # Keyframes from frame -1 to last frame + 1 for proper motion blur
+        keyframes = []
+        frame_ticks = setup["frame_ticks"]
+        for index in range(WARMUP_FRAMES - 1, len(frame_ticks)):
+            keyframe = {}
+            keyframe["frame_index"] = int(setup["frame_indices"][index])
+            keyframe["hfov"] = float(setup["hfov"][index])
+
+            # Camera is in world space so cameraroot must be at world space origin
+            keyframe["cameraroot"] = { "x": 0.0, "y": 0.0, "z": 0.0, "yaw": 0, "pitch": 0, "roll": 0 }
+
+            (x, y, z) = setup["camera_location"][frame_ticks[index]].tolist()
+            (yaw, pitch, roll) = [float(values[index]) for values in setup["rotation"]]
+            keyframe["camera_local"] = { "x": x, "y": y, "z": z, "yaw": yaw, "pitch": pitch, "roll": roll }
+            keyframe["type"] = "auto"
+
+            keyframes.append(keyframe)
+
+        if KEYFRAME_REDUCTION:
+            keyframes = reduce_keyframes(keyframes)
+
+        # Camera shakes are applied on top of the keyframed camera in both render passes
+        info = {}
+        for key in ["camera_shake", "camera_shake_scale", "camera_shake_start_offset"]:
+            if key in camera_animations[sequence_name]["info"]:
+                info[key] = camera_animations[sequence_name]["info"][key]
+
+        camera_animations_depth[sequence_name] = { "keyframes": keyframes, "info": info }
+
+    return camera_animations_depth
+
+################################################################################
+# Validation
+################################################################################
+
+def compare_camera_gt(camera_animations_depth, camera_gt_root):
+    """
+    Print maximum location [cm] and rotation [deg] deviation of simulated cameras from rendered camera ground truth,
+    per sequence and over all compared sequences
+    """
+    errors = []
+    for sequence_name in camera_animations_depth:
+        if sequence_name == "info":
+            continue
+
+        camera_gt_path = camera_gt_root / f"{sequence_name}_camera.csv"
+        if not camera_gt_path.exists():
+            print(f"WARNING: Camera ground truth not found: {camera_gt_path}", file=sys.stderr)
+            continue
+
+        with open(camera_gt_path, mode="r") as csv_file:
+            csv_rows = list(csv.DictReader(csv_file))
+
+        # Evaluate keyframes at rendered frames, keyframes may be reduced
+        keyframes = camera_animations_depth[sequence_name]["keyframes"]
+        frame_indices = np.arange(min(len(csv_rows), keyframes[-1]["frame_index"]), dtype=np.float64)
+        gt = np.array([[float(row[key]) for key in ["x", "y", "z", "yaw", "pitch", "roll", "hfov"]] for row in csv_rows[:len(frame_indices)]], dtype=np.float64)
+        simulated = np.stack([interpolate_keyframes(keyframes, get_keyframe_value("camera_local", key), 0.0, frame_indices) for key in ["x", "y", "z", "yaw", "pitch", "roll"]]
+                             + [get_keyframed_hfov(keyframes, float(keyframes[0]["hfov"]), frame_indices)], axis=1)
+
+        location_error = np.linalg.norm(simulated[:, 0:3] - gt[:, 0:3], axis=1).max()
+        rotation_error = np.abs(normalize_angle(simulated[:, 3:6] - gt[:, 3:6])).max()
+        hfov_error = np.abs(simulated[:, 6] - gt[:, 6]).max()
+        print(f"{sequence_name}: location={location_error:.3f}cm, rotation={rotation_error:.3f}deg, hfov={hfov_error:.3f}deg")
+        errors.append((location_error, rotation_error, hfov_error))
+
+    if len(errors) > 0:
+        (location_error, rotation_error, hfov_error) = np.max(np.array(errors, dtype=np.float64), axis=0)
+        print(f"[INFO] Maximum deviation over {len(errors)} sequences: location={location_error:.3f}cm, rotation={rotation_error:.3f}deg, hfov={hfov_error:.3f}deg", file=sys.stderr)
+
+    return
+
+def print_usage():
+    print(f"Usage: {sys.argv[0]} BE_SEQ_CSV [CAMERA_GT_ROOT]", file=sys.stderr)
+    return
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if (len(sys.argv) < 2) or (len(sys.argv) > 3):
+        print_usage()
+        sys.exit(1)
+
+    csv_path = Path(sys.argv[1])
+    camera_animations_path = csv_path.parent / "be_camera_animations.json"
+    camera_animations_depth_path = csv_path.parent / "be_camera_animations_depth.json"
+
+    if not csv_path.exists():
+        print(f"ERROR: Body scene definition not found: {csv_path}", file=sys.stderr)
+        sys.exit(1)
+
+    if not camera_animations_path.exists():
+        print(f"ERROR: Camera animations definition not found: {camera_animations_path}", file=sys.stderr)
+        sys.exit(1)
+
+    be_seq = read_be_seq(csv_path)
+    camera_animations = load_camera_animations(camera_animations_path)
+
+    trajectory_index = load_trajectory_index(TRAJECTORY_INDEX_PATH)
+    if trajectory_index is not None:
+        print(f"[INFO] Using trajectory index: {TRAJECTORY_INDEX_PATH} [{len(trajectory_index)} animations]", file=sys.stderr)
+    elif not SMPLX_NPZ_ANIMATION_FOLDER.exists():
+        print(f"ERROR: Neither trajectory index ({TRAJECTORY_INDEX_PATH}) nor animation folder ({SMPLX_NPZ_ANIMATION_FOLDER}) found", file=sys.stderr)
+        sys.exit(1)
+
+    camera_animations_depth = simulate_camera_animations(camera_animations, be_seq, AnimationCache(SMPLX_NPZ_ANIMATION_FOLDER, trajectory_index), TEMPORAL_SAMPLES)
+
+    print(f"Saving: {camera_animations_depth_path}", file=sys.stderr)
+    with open(camera_animations_depth_path, "w") as f:
+        json.dump(camera_animations_depth, f, indent=4)
+
+    # Binary sidecar for random access by sequence name, see be_camera_animations_bin.py
+    camera_animations_depth_bin_path = camera_animations_depth_path.with_suffix(".bin")
+    print(f"Saving: {camera_animations_depth_bin_path}", file=sys.stderr)
+    write_camera_animations_sidecar(camera_animations_depth_bin_path, camera_animations_depth)
+
+    if len(sys.argv) == 3:
+        compare_camera_gt(camera_animations_depth, Path(sys.argv[2]))
+
+    sys.exit(0)
@@ -0,0 +1,21 @@
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Camera tracking simulation settings for be_simulate_camera_tracking.py
+from pathlib import Path
+
+# Globals
+DATA_SUBSET="training"
+
+STATS_ROOT = Path("../../stats")
+SMPLX_NPZ_ANIMATION_FOLDER = Path(f"/mnt/c/bedlam2/animations/{DATA_SUBSET}")
+TRAJECTORY_INDEX_PATH = STATS_ROOT / f"trajectories_{DATA_SUBSET}.json" # Packed 30fps root trajectories, generated with be_trajectory_index.py
+
+FPS = 30 # LevelSequence display rate
+TEMPORAL_SAMPLES = 7 # Movie Render Queue temporal sample count of image render pass (1-1-7_EXR_PNG), one camera tick per temporal sample
+WARMUP_FRAMES = 10 # Must match WARMUP_FRAMES in create_level_sequences_csv.py, camera tracking starts at first warmup frame
+KEYFRAME_REDUCTION = True # Reduce per-frame keyframes to linear keys per channel within tolerance, see be_keyframe_reduction.py
+
+# Height of look-at target sockets relative to SMPL-X root translation [cm], rest pose joint locations of neutral SMPL-X body.
+# The translation origin lies above the pelvis, so sockets below the neck have negative values. Not yet checked against Unreal socket locations.
+BODYPART_HEIGHTS = { "pelvis": -35.1, "spine1": -24.4, "spine2": -11.5, "spine3": -5.9, "neck": 13.3 }
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Build and read packed root trajectory index for SMPL-X animations
+#
+# All 30fps-downsampled root translations (trans) of the whitelisted animations
+# are stored in one contiguous float32 array (N, 3) in .npy format which is
+# memory-mapped on load. The JSON index maps "subject_animation" to the frame
+# offset and length inside that array.
+#
+# The index records the modification time of every indexed .npz file. Loading
+# does not touch the animation folder: load_trajectory_index() only checks the
+# index version and reports whitelisted animations which are not indexed.
+# Use --check to compare the indexed animations against their .npz files after
+# the animation folder was changed, and rebuild the index with this script.
+#
+# Usage:
+#   python be_trajectory_index.py WHITELIST_PATH ANIMATION_FOLDER INDEX_PATH
+#   python be_trajectory_index.py ../../config/whitelist_animations_training.json /mnt/c/bedlam2/animations/training ../../stats/trajectories_training.json
+#   python be_trajectory_index.py --check INDEX_PATH [ANIMATION_FOLDER]   # exit code 1 if index is stale
+#
+import json
+import numpy as np
+from pathlib import Path
+import sys
+
+TRAJECTORY_INDEX_VERSION = 3
+
+################################################################################
+# Helper functions
+################################################################################
+
+def get_animation_npz_path(animation_folder, subject, animation_name):
+    filepath = animation_folder / subject / "moving_body_para" / animation_name / "motion_seq.npz" # BEDLAM CVPR
+    if not filepath.exists():
+        filepath = animation_folder / subject / animation_name / "motion_seq.npz"
+        if not filepath.exists():
+            filepath = animation_folder / f"{subject}_{animation_name}.npz"
+    return filepath
+
+def get_frame_rate_divisor(mocap_frame_rate):
+    frame_rate_divisor = 1
+    if mocap_frame_rate > 30:
+        frame_rate_divisor = int(mocap_frame_rate / 30)
+    return frame_rate_divisor
+
+class TrajectoryIndex:
+    """
+    Read-only access to packed root trajectories. Returned arrays are views into the memory-mapped data file.
+    """
+    def __init__(self, index_path):
+        index_path = Path(index_path)
+        with open(index_path) as f:
+            index = json.load(f)
+
+        if index.get("version") != TRAJECTORY_INDEX_VERSION:
+            raise ValueError(f"Unsupported trajectory index version: {index.get('version')} ({index_path})")
+
+        self.animations = index["animations"]
+        self.animation_folder = Path(index["animation_folder"])
+        self.trans = np.load(index_path.parent / index["data"], mmap_mode="r")
+
+    def __contains__(self, key):
+        return key in self.animations
+
+    def __len__(self):
+        return len(self.animations)
+
+    def get_stale_reason(self, animation_folder=None):
+        """
+        Return reason if indexed animations do not match their .npz files anymore, None if index is up to date.
+        Default is the animation folder the index was built from. Stats every indexed file, only used by --check.
+        """
+        if animation_folder is None:
+            animation_folder = self.animation_folder
+        animation_folder = Path(animation_folder)
+
+        if not animation_folder.exists():
+            return f"animation folder not available: {animation_folder}"
+
+        (missing, modified) = (0, 0)
+        for entry in self.animations.values():
+            (subject, animation_name) = entry[4]
+            filepath = get_animation_npz_path(animation_folder, subject, animation_name)
+            if not filepath.exists():
+                missing += 1
+            elif filepath.stat().st_mtime_ns != entry[5]:
+                modified += 1
+
+        if (missing > 0) or (modified > 0):
+            return f"{missing} indexed animations missing and {modified} modified in {animation_folder}"
+        return None
+
+    def get_entry(self, subject, animation_name):
+        """
+        Return (offset, frames, source_frames, mocap_frame_rate) or None if animation is not indexed
+        """
+        entry = self.animations.get(f"{subject}_{animation_name}", None)
+        if entry is None:
+            return None
+        return tuple(entry[:4])
+
+    def get_trans(self, subject, animation_name):
+        """
+        Return 30fps root translation [m] of given animation in SMPL-X orientation notation (Y-up) and source mocap frame rate
+        """
+        entry = self.get_entry(subject, animation_name)
+        if entry is None:
+            return (None, None)
+
+        (offset, frames, _, mocap_frame_rate) = entry
+        return (self.trans[offset : offset + frames], mocap_frame_rate)
+
+def load_trajectory_index(index_path, animation_keys=None):
+    """
+    Return TrajectoryIndex or None if index does not exist. Invalid indices are refused with a warning.
+    Animation files are not checked, see --check.
+      animation_keys: optional "subject_animation" keys of whitelisted animations, missing ones are reported
+    """
+    index_path = Path(index_path)
+    if not index_path.exists():
+        return None
+
+    try:
+        trajectory_index = TrajectoryIndex(index_path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"WARNING: Ignoring invalid trajectory index: {index_path} ({e}), rebuild with be_trajectory_index.py", file=sys.stderr)
+        return None
+
+    if animation_keys is not None:
+        missing = [key for key in animation_keys if key not in trajectory_index]
+        if len(missing) > 0:
+            print(f"WARNING: {len(missing)} whitelisted animations not in trajectory index {index_path}, loading source data for these (first: {missing[0]}). Rebuild with be_trajectory_index.py", file=sys.stderr)
+
+    return trajectory_index
+
+def build_trajectory_index(whitelist_path, animation_folder, index_path):
+    with open(whitelist_path) as f:
+        whitelist_animations = json.load(f)
+
+    animations = {}
+    trajectories = []
+    offset = 0
+    for subject in whitelist_animations:
+        for animation_name in whitelist_animations[subject]:
+            filepath = get_animation_npz_path(animation_folder, subject, animation_name)
+            if not filepath.exists():
+                print(f"WARNING: Animation not found: {filepath}", file=sys.stderr)
+                continue
+
+            with np.load(filepath) as data:
+                trans = data["trans"]
+                mocap_frame_rate = float(data["mocap_frame_rate"])
+
+            # Downsample animation to 30fps via list slicing
+            trans_30 = trans[::get_frame_rate_divisor(mocap_frame_rate)].astype(np.float32)
+            frames = len(trans_30)
+
+            animations[f"{subject}_{animation_name}"] = [offset, frames, len(trans), mocap_frame_rate, [subject, animation_name], filepath.stat().st_mtime_ns]
+            trajectories.append(trans_30)
+            offset += frames
+
+    data_path = index_path.with_suffix(".npy")
+    print(f"Saving: {data_path} [{len(animations)} animations, {offset} frames]", file=sys.stderr)
+    data = np.lib.format.open_memmap(data_path, mode="w+", dtype=np.float32, shape=(offset, 3))
+    offset = 0
+    for trans_30 in trajectories:
+        data[offset : offset + len(trans_30)] = trans_30
+        offset += len(trans_30)
+    data.flush()
+    del data
+
+    index = { "version": TRAJECTORY_INDEX_VERSION, "data": data_path.name, "animation_folder": str(Path(animation_folder).resolve()), "animations": animations }
+    print(f"Saving: {index_path}", file=sys.stderr)
+    with open(index_path, "w") as f:
+        json.dump(index, f)
+
+    return True
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if (len(sys.argv) in [3, 4]) and (sys.argv[1] == "--check"):
+        index_path = Path(sys.argv[2])
+        animation_folder = Path(sys.argv[3]) if len(sys.argv) == 4 else None
+        try:
+            trajectory_index = TrajectoryIndex(index_path)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"ERROR: Invalid trajectory index: {index_path} ({e})", file=sys.stderr)
+            sys.exit(1)
+
+        reason = trajectory_index.get_stale_reason(animation_folder)
+        if reason is not None:
+            print(f"ERROR: Stale trajectory index: {index_path} ({reason}), rebuild with be_trajectory_index.py", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"[INFO] Trajectory index is up to date: {index_path} [{len(trajectory_index)} animations]", file=sys.stderr)
+        sys.exit(0)
+
+    if len(sys.argv) != 4:
+        print(f"Usage: {sys.argv[0]} WHITELIST_PATH ANIMATION_FOLDER INDEX_PATH", file=sys.stderr)
+        print(f"       {sys.argv[0]} ../../config/whitelist_animations_training.json /mnt/c/bedlam2/animations/training ../../stats/trajectories_training.json", file=sys.stderr)
+        print(f"       {sys.argv[0]} --check INDEX_PATH [ANIMATION_FOLDER]", file=sys.stderr)
+        sys.exit(1)
+
+    whitelist_path = Path(sys.argv[1])
+    animation_folder = Path(sys.argv[2])
+    index_path = Path(sys.argv[3])
+
+    if not build_trajectory_index(whitelist_path, animation_folder, index_path):
+        sys.exit(1)
+
+    sys.exit(0)
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Validate body visibility of camera animations before rendering
+#
+# Cameras of all sequences are evaluated per frame with the camera tracking simulation (be_simulate_camera_tracking.py).
+# The root trajectory of every body in be_seq.csv is placed in world space and a body-height bounding box around it
+# is projected through the camera of every frame. All bodies are projected together in NumPy batches.
+#
+# A body is visible in a frame if its bounding box is in front of the camera and at least VISIBLE_AREA_MIN of its
+# projected bounding rectangle is inside the image. Per sequence the ratio of frames showing at least one body and the
+# mean ratio of visible frames of all bodies are reported.
+#
+# be_generate_camera_animations.py uses this validation to resample cameras of sequences below the thresholds.
+#
+# Usage:
+#   python be_validate_camera_visibility.py BE_SEQ_CSV
+#   python be_validate_camera_visibility.py images/be_seq.csv
+#
+from pathlib import Path
+import sys
+
+import numpy as np
+
+from be_seq_csv import read_be_seq
+from be_simulate_camera_tracking import AnimationCache, get_rotation_axes, simulate_cameras
+from be_simulate_camera_tracking_config import TEMPORAL_SAMPLES
+from be_trajectory_index import load_trajectory_index
+from be_validate_camera_visibility_config import *
+
+sys.path.append(str(Path(__file__).resolve().parents[2] / "unreal" / "render" / "Core" / "Python"))
+from be_camera_animations_bin import load_camera_animations
+
+# Bounding box corners relative to root translation (8, 3) [cm]
+BODY_CORNERS = np.array([[x, y, z] for x in (-BODY_RADIUS, BODY_RADIUS) for y in (-BODY_RADIUS, BODY_RADIUS) for z in (BODY_HEIGHT_MIN, BODY_HEIGHT_MAX)], dtype=np.float64)
+
+################################################################################
+# Helper functions
+################################################################################
+
+def get_animation_cache():
+    """
+    Root trajectory source for validation, None if neither trajectory index nor animation folder are available
+    """
+    trajectory_index = load_trajectory_index(TRAJECTORY_INDEX_PATH)
+    if trajectory_index is not None:
+        return AnimationCache(SMPLX_NPZ_ANIMATION_FOLDER, trajectory_index)
+
+    if SMPLX_NPZ_ANIMATION_FOLDER.exists():
+        return AnimationCache(SMPLX_NPZ_ANIMATION_FOLDER)
+
+    return None
+
+def get_camera_frames(camera_animations, be_seq, animation_cache):
+    """
+    Padded per-frame cameras of all sequences in camera_animations
+      location: (S, F, 3), axes: 3 x (S, F, 3), tan_half_hfov: (S, F), aspect_ratio: (S,), frames: (S,)
+    """
+    config = camera_animations["info"]["config"]
+    aspect_ratio = IMAGE_ASPECT_RATIO
+    if config["sensor_width"] > 0:
+        aspect_ratio = config["sensor_width"] / config["sensor_height"]
+
+    (sequence_names, setups) = simulate_cameras(camera_animations, be_seq, animation_cache, TEMPORAL_SAMPLES)
+
+    frames = np.array([be_seq.get_int(be_seq.get_group_row(sequence_name), "frames") for sequence_name in sequence_names], dtype=np.int64)
+    num_frames = max(int(frames.max()), 1)
+
+    location = np.zeros((len(setups), num_frames, 3))
+    rotation = np.zeros((len(setups), num_frames, 3))
+    hfov = np.full((len(setups), num_frames), 90.0)
+    for (setup_index, setup) in enumerate(setups):
+        # Rendered frames 0 to frames-1, cameras also exist for warmup frames and last keyframe
+        frame_mask = (setup["frame_indices"] >= 0) & (setup["frame_indices"] < frames[setup_index])
+        location[setup_index, :frames[setup_index]] = setup["camera_location"][setup["frame_ticks"][frame_mask]]
+        rotation[setup_index, :frames[setup_index]] = np.stack(setup["rotation"], axis=1)[frame_mask]
+        hfov[setup_index, :frames[setup_index]] = setup["hfov"][frame_mask]
+
+    camera = {}
+    camera["location"] = location
+    camera["axes"] = get_rotation_axes(rotation[..., 0], rotation[..., 1], rotation[..., 2])
+    camera["tan_half_hfov"] = np.tan(np.radians(hfov / 2))
+    camera["aspect_ratio"] = np.full(len(setups), aspect_ratio)
+    camera["frames"] = frames
+    return (sequence_names, camera)
+
+def get_body_trajectories(sequence_names, be_seq, animation_cache):
+    """
+    Body rows of given sequences with concatenated root trajectories
+      sequence_index, offset, length, start_frame: (B,) and trans: (N, 3) [m] in SMPL-X notation (Y-up)
+    """
+    bodies = {}
+    trans = []
+    offset = 0
+
+    body_rows = []
+    sequence_index = []
+    for (index, sequence_name) in enumerate(sequence_names):
+        for body_row in be_seq.get_sequence_body_rows(sequence_name):
+            body = be_seq.body[body_row]
+            if body not in bodies:
+                body_trans = animation_cache.get_trans(body)
+                bodies[body] = (offset, len(body_trans))
+                trans.append(body_trans)
+                offset += len(body_trans)
+            body_rows.append(body_row)
+            sequence_index.append(index)
+
+    trajectories = {}
+    trajectories["row"] = np.array(body_rows, dtype=np.int64)
+    trajectories["sequence_index"] = np.array(sequence_index, dtype=np.int64)
+    trajectories["offset"] = np.array([bodies[be_seq.body[row]][0] for row in body_rows], dtype=np.int64)
+    trajectories["length"] = np.array([bodies[be_seq.body[row]][1] for row in body_rows], dtype=np.int64)
+    trajectories["start_frame"] = np.array([be_seq.get_int(row, "start_frame", 0) for row in body_rows], dtype=np.int64)
+    trajectories["trans"] = np.concatenate(trans, axis=0) if len(trans) > 0 else np.zeros((0, 3))
+    return trajectories
+
+def get_body_visibility(trajectories, pose, camera, batch):
+    """
+    Visibility (B, F) of body bounding boxes in batch of body indices
+    """
+    sequence_index = trajectories["sequence_index"][batch]
+    frames = camera["frames"][sequence_index]
+    num_frames = camera["location"].shape[1]
+    frame_indices = np.arange(num_frames)
+
+    # Sequence frame t shows animation frame t + start_frame, animation is clamped outside of its range
+    animation_frames = np.clip(frame_indices[np.newaxis, :] + trajectories["start_frame"][batch, np.newaxis], 0, trajectories["length"][batch, np.newaxis] - 1)
+    trans = trajectories["trans"][trajectories["offset"][batch, np.newaxis] + animation_frames]
+
+    # SMPL-X (X, Y-up, Z) [m] maps to Unreal (X, Z-up, Y) [cm] before body yaw is applied
+    (x, y, z, yaw) = [pose[batch, column, np.newaxis] for column in range(4)]
+    (sy, cy) = (np.sin(np.radians(yaw)), np.cos(np.radians(yaw)))
+    local_x = 100.0 * trans[..., 0]
+    local_y = 100.0 * trans[..., 2]
+    root = np.stack((x + cy * local_x - sy * local_y, y + sy * local_x + cy * local_y, z + 100.0 * trans[..., 1]), axis=-1)
+
+    # Camera space coordinates of bounding box corners (B, F, 8): depth along camera X, right along Y, up along Z
+    delta = root - camera["location"][sequence_index]
+    (depth, right, up) = [np.sum(delta * axis[sequence_index], axis=-1)[..., np.newaxis] + axis[sequence_index] @ BODY_CORNERS.T for axis in camera["axes"]]
+
+    in_front = np.all(depth > NEAR_CLIP_DISTANCE, axis=-1)
+    depth = np.maximum(depth, NEAR_CLIP_DISTANCE)
+    tan_half_hfov = camera["tan_half_hfov"][sequence_index][..., np.newaxis]
+    u = right / (depth * tan_half_hfov)
+    v = up * camera["aspect_ratio"][sequence_index, np.newaxis, np.newaxis] / (depth * tan_half_hfov)
+
+    # Fraction of projected bounding rectangle inside image ([-1, 1] in normalized device coordinates)
+    (u_min, u_max, v_min, v_max) = (u.min(axis=-1), u.max(axis=-1), v.min(axis=-1), v.max(axis=-1))
+    inside = (np.clip(u_max, -1.0, 1.0) - np.clip(u_min, -1.0, 1.0)) * (np.clip(v_max, -1.0, 1.0) - np.clip(v_min, -1.0, 1.0))
+    area = np.maximum((u_max - u_min) * (v_max - v_min), 1e-12)
+
+    rendered = frame_indices[np.newaxis, :] < frames[:, np.newaxis]
+    return in_front & rendered & (inside >= VISIBLE_AREA_MIN * area)
+
+################################################################################
+# Validation
+################################################################################
+
+def validate_camera_visibility(camera_animations, be_seq, animation_cache):
+    """
+    Visibility ratios of all sequences in camera_animations.
+    Returns dictionary sequence_name => (frame_ratio, body_ratio), ratios are NaN for sequences without bodies.
+    """
+    config = camera_animations["info"]["config"]
+    if config["static_world_location"]:
+        print("WARNING: Static world location cameras use the camera setup of the LevelSequence template, visibility not validated", file=sys.stderr)
+        return {}
+
+    (sequence_names, camera) = get_camera_frames(camera_animations, be_seq, animation_cache)
+    trajectories = get_body_trajectories(sequence_names, be_seq, animation_cache)
+    pose = be_seq.pose[trajectories["row"]]
+
+    num_sequences = len(sequence_names)
+    visible_bodies = np.zeros((num_sequences, camera["location"].shape[1]), dtype=np.int64) # number of visible bodies per sequence frame
+    body_ratio_sum = np.zeros(num_sequences)
+    num_bodies = np.bincount(trajectories["sequence_index"], minlength=num_sequences)
+
+    for batch_start in range(0, len(trajectories["row"]), BATCH_BODIES):
+        batch = np.arange(batch_start, min(batch_start + BATCH_BODIES, len(trajectories["row"])))
+        visibility = get_body_visibility(trajectories, pose, camera, batch)
+        sequence_index = trajectories["sequence_index"][batch]
+        np.add.at(visible_bodies, sequence_index, visibility.astype(np.int64))
+        np.add.at(body_ratio_sum, sequence_index, visibility.sum(axis=1) / camera["frames"][sequence_index])
+
+    frames = np.maximum(camera["frames"], 1)
+    frame_ratio = (visible_bodies > 0).sum(axis=1) / frames
+    with np.errstate(invalid="ignore", divide="ignore"):
+        body_ratio = body_ratio_sum / num_bodies
+    frame_ratio = np.where(num_bodies > 0, frame_ratio, np.nan)
+
+    return { sequence_name: (float(frame_ratio[index]), float(body_ratio[index])) for (index, sequence_name) in enumerate(sequence_names) }
+
+def is_visible(frame_ratio, body_ratio):
+    if np.isnan(frame_ratio):
+        return True # nothing to see
+    return (frame_ratio >= VISIBILITY_FRAME_RATIO_MIN) and (body_ratio >= VISIBILITY_BODY_RATIO_MIN)
+
+def get_invisible_sequences(results):
+    """
+    Names of sequences below visibility thresholds
+    """
+    return [sequence_name for (sequence_name, (frame_ratio, body_ratio)) in results.items() if not is_visible(frame_ratio, body_ratio)]
+
+def print_usage():
+    print(f"Usage: {sys.argv[0]} BE_SEQ_CSV", file=sys.stderr)
+    return
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print_usage()
+        sys.exit(1)
+
+    csv_path = Path(sys.argv[1])
+    camera_animations_path = csv_path.parent / "be_camera_animations.json"
+
+    if not csv_path.exists():
+        print(f"ERROR: Body scene definition not found: {csv_path}", file=sys.stderr)
+        sys.exit(1)
+
+    if not camera_animations_path.exists():
+        print(f"ERROR: Camera animations definition not found: {camera_animations_path}", file=sys.stderr)
+        sys.exit(1)
+
+    animation_cache = get_animation_cache()
+    if animation_cache is None:
+        print(f"ERROR: Neither trajectory index ({TRAJECTORY_INDEX_PATH}) nor animation folder ({SMPLX_NPZ_ANIMATION_FOLDER}) found", file=sys.stderr)
+        sys.exit(1)
+
+    be_seq = read_be_seq(csv_path)
+    camera_animations = load_camera_animations(camera_animations_path)
+
+    results = validate_camera_visibility(camera_animations, be_seq, animation_cache)
+
+    print("sequence_name,frame_ratio,body_ratio,visible")
+    for (sequence_name, (frame_ratio, body_ratio)) in results.items():
+        print(f"{sequence_name},{frame_ratio:.3f},{body_ratio:.3f},{is_visible(frame_ratio, body_ratio)}")
+
+    invisible_sequences = get_invisible_sequences(results)
+    print(f"Sequences below visibility thresholds: {len(invisible_sequences)}/{len(results)}", file=sys.stderr)
+    if len(invisible_sequences) > 0:
+        sys.exit(1)
+
+    sys.exit(0)
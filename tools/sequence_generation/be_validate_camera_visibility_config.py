@@ -0,0 +1,28 @@
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Camera visibility validation settings for be_validate_camera_visibility.py and be_generate_camera_animations.py
+from pathlib import Path
+
+# Globals
+DATA_SUBSET="training"
+
+STATS_ROOT = Path("../../stats")
+SMPLX_NPZ_ANIMATION_FOLDER = Path(f"/mnt/c/bedlam2/animations/{DATA_SUBSET}")
+TRAJECTORY_INDEX_PATH = STATS_ROOT / f"trajectories_{DATA_SUBSET}.json" # Packed 30fps root trajectories, generated with be_trajectory_index.py
+
+IMAGE_ASPECT_RATIO = 1280.0 / 720.0 # Movie Render Queue output resolution, used if camera configuration has no sensor size
+
+# Body bounding volume: vertical box around SMPL-X root translation [cm], rest pose of neutral SMPL-X body
+BODY_HEIGHT_MIN = -130.0 # feet
+BODY_HEIGHT_MAX = 40.0 # top of head
+BODY_RADIUS = 30.0
+
+NEAR_CLIP_DISTANCE = 10.0 # [cm], bodies with bounding volume closer to or behind the camera are not visible
+VISIBLE_AREA_MIN = 0.5 # body is visible in frame if at least this fraction of its projected bounding rectangle is inside the image
+
+# Sequence thresholds
+VISIBILITY_FRAME_RATIO_MIN = 0.9 # ratio of frames which show at least one body
+VISIBILITY_BODY_RATIO_MIN = 0.5 # mean ratio of frames in which each body is visible
+
+BATCH_BODIES = 1024 # bodies projected at once, limits memory of (bodies, frames, corners) arrays
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Preloaded VCam capture store for handheld/egocentric camera motions
+#
+# Extrinsics of the capture files listed in vcam_captures.json for the requested
+# (type, orientation, focal length) keys are stored in one NumPy array bundle (.npz).
+# Keyframe windows are array slices of the preloaded data, capture JSON files are
+# only parsed again when vcam_captures.json or one of the capture files changes or
+# a key is requested which is not in the bundle yet. Missing capture files are
+# skipped with a warning.
+#
+# Usage:
+#   python be_vcam_store.py VCAM_ROOT STORE_PATH      # build store for all keys and show summary
+#   python be_vcam_store.py ../../config/vcam ../../stats/vcam_captures.npz
+#
+import json
+from pathlib import Path
+import random
+import re
+import sys
+
+import numpy as np
+
+VCAM_STORE_VERSION = 2
+
+def get_signature(path):
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+def get_capture_keys(vcam_captures):
+    """
+    All (type, orientation, focal length) keys of vcam_captures.json which list capture files for a focal length [mm], other entries are skipped with warning
+    """
+    keys = []
+    for vcam_type in vcam_captures:
+        if type(vcam_captures[vcam_type]) is not dict:
+            print(f"WARNING: Skipping invalid VCam capture entry: {vcam_type}", file=sys.stderr)
+            continue
+        for orientation in vcam_captures[vcam_type]:
+            if type(vcam_captures[vcam_type][orientation]) is not dict:
+                print(f"WARNING: Skipping invalid VCam capture entry: {vcam_type}/{orientation}", file=sys.stderr)
+                continue
+            for focallength in vcam_captures[vcam_type][orientation]:
+                captures = vcam_captures[vcam_type][orientation][focallength]
+                if (re.fullmatch(r"\d+(-\d+)?", focallength) is None) or (type(captures) is not list) or (not all(type(capture) is str for capture in captures)):
+                    print(f"WARNING: Skipping invalid VCam capture entry: {vcam_type}/{orientation}/{focallength}", file=sys.stderr)
+                    continue
+                keys.append((vcam_type, orientation, focallength))
+    return keys
+
+class VCamCaptureStore:
+    """
+    Capture extrinsics (x, y, z, yaw, pitch, roll per frame) of VCam captures for the requested (type, orientation, focal length) keys.
+      extrinsics: (M, 6) float64, all captures concatenated
+      capture_offsets: (C + 1,) int64, capture c uses extrinsics[capture_offsets[c]:capture_offsets[c+1]]
+      captures: (type, orientation, focal length) => list of capture file names
+    """
+    def __init__(self, extrinsics, capture_offsets, index):
+        self.extrinsics = extrinsics
+        self.capture_offsets = capture_offsets
+        self.sources = index["sources"]
+        self.keys = [tuple(key) for key in index["keys"]]
+
+        self.captures = { key: [] for key in self.keys }
+        self.capture_index = {}
+        for (capture_index, (vcam_type, orientation, focallength, capture)) in enumerate(index["captures"]):
+            self.captures[(vcam_type, orientation, focallength)].append(capture)
+            self.capture_index[(vcam_type, orientation, focallength, capture)] = capture_index
+
+    @classmethod
+    def build(cls, vcam_root, vcam_captures_path, keys=None):
+        """
+        Parse vcam_captures.json and capture files listed for given (type, orientation, focal length) keys, all keys if None
+          Missing capture files are skipped with warning
+        """
+        vcam_root = Path(vcam_root)
+        vcam_captures_path = Path(vcam_captures_path)
+        with open(vcam_captures_path) as f:
+            vcam_captures = json.load(f)
+
+        if keys is None:
+            keys = get_capture_keys(vcam_captures)
+
+        sources = { str(vcam_captures_path): get_signature(vcam_captures_path) }
+        captures = []
+        extrinsics = []
+        capture_offsets = [0]
+        for (vcam_type, orientation, focallength) in keys:
+            key_captures = vcam_captures.get(vcam_type, {}).get(orientation, {}).get(focallength, None)
+            if type(key_captures) is not list:
+                print(f"ERROR: VCam captures not defined in {vcam_captures_path}: {vcam_type}/{orientation}/{focallength}", file=sys.stderr)
+                sys.exit(1)
+
+            num_captures = len(captures)
+            for capture in key_captures:
+                vcam_path = vcam_root / vcam_type / orientation / focallength / capture
+                sources[str(vcam_path)] = get_signature(vcam_path)
+                if not vcam_path.exists():
+                    print(f"WARNING: Skipping missing VCam capture: {vcam_path}", file=sys.stderr)
+                    continue
+
+                with open(vcam_path) as f:
+                    capture_extrinsics = np.array(json.load(f)["extrinsics"], dtype=np.float64).reshape(-1, 6)
+
+                captures.append([vcam_type, orientation, focallength, capture])
+                extrinsics.append(capture_extrinsics)
+                capture_offsets.append(capture_offsets[-1] + len(capture_extrinsics))
+
+            if len(captures) == num_captures:
+                print(f"WARNING: No VCam captures found: {vcam_root / vcam_type / orientation / focallength} (see {vcam_root / 'readme.md'})", file=sys.stderr)
+
+        if len(extrinsics) > 0:
+            extrinsics = np.concatenate(extrinsics)
+        else:
+            extrinsics = np.zeros((0, 6), dtype=np.float64)
+
+        index = { "version": VCAM_STORE_VERSION, "keys": [list(key) for key in keys], "captures": captures, "sources": sources }
+        return cls(extrinsics, np.array(capture_offsets, dtype=np.int64), index)
+
+    @classmethod
+    def load(cls, store_path, vcam_root, vcam_captures_path, keys=None):
+        """
+        Load store for given (type, orientation, focal length) keys from bundle, all keys if None
+          Store is rebuilt and saved if bundle is missing, does not contain all keys or any source file has changed
+        """
+        if keys is None:
+            with open(vcam_captures_path) as f:
+                keys = get_capture_keys(json.load(f))
+
+        store_path = Path(store_path)
+        if store_path.exists():
+            try:
+                with np.load(store_path, allow_pickle=False) as data:
+                    index = json.loads(str(data["index"]))
+                    if (index["version"] == VCAM_STORE_VERSION) and (index["sources"].get(str(Path(vcam_captures_path)), None) is not None):
+                        if all(get_signature(Path(path)) == signature for (path, signature) in index["sources"].items()):
+                            stored_keys = [tuple(key) for key in index["keys"]]
+                            if set(keys).issubset(stored_keys):
+                                return cls(data["extrinsics"], data["capture_offsets"], index)
+                            keys = stored_keys + [key for key in keys if key not in stored_keys] # keep previously requested keys in rebuilt bundle
+            except Exception as e:
+                print(f"WARNING: Ignoring invalid VCam capture store: {store_path} ({e})", file=sys.stderr)
+
+        print(f"[INFO] Building VCam capture store: {store_path}", file=sys.stderr)
+        store = cls.build(vcam_root, vcam_captures_path, keys)
+        store.save(store_path)
+        return store
+
+    def save(self, store_path):
+        store_path = Path(store_path)
+        store_path.parent.mkdir(parents=True, exist_ok=True)
+
+        captures = [list(key) for (key, capture_index) in sorted(self.capture_index.items(), key=lambda item: item[1])]
+        index = { "version": VCAM_STORE_VERSION, "keys": [list(key) for key in self.keys], "captures": captures, "sources": self.sources }
+        with open(store_path, "wb") as f:
+            np.savez(f, extrinsics=self.extrinsics, capture_offsets=self.capture_offsets, index=np.array(json.dumps(index)))
+        return
+
+    def get_captures(self, vcam_type, orientation, focallength):
+        return self.captures[(vcam_type, orientation, focallength)]
+
+    def get_extrinsics(self, vcam_type, orientation, focallength, capture):
+        capture_index = self.capture_index[(vcam_type, orientation, focallength, capture)]
+        return self.extrinsics[self.capture_offsets[capture_index]:self.capture_offsets[capture_index + 1]]
+
+    def get_keyframe_window(self, vcam_type, orientation, focallength, capture, num_frames, trim_frames, reverse=False):
+        """
+        Random window of num_frames extrinsics after trimming trim_frames at start and end of capture, optionally reversed
+        """
+        extrinsics = self.get_extrinsics(vcam_type, orientation, focallength, capture)
+
+        # Trim off frames at start and end of raw captures
+        extrinsics = extrinsics[trim_frames:len(extrinsics) - trim_frames]
+
+        if reverse:
+            extrinsics = extrinsics[::-1]
+
+        # Sample window of length num_frames from extrinsics
+        start_index_max = len(extrinsics) - num_frames
+        if start_index_max < 0:
+            print(f"ERROR: VCam capture too short for {num_frames} frames: {vcam_type}/{orientation}/{focallength}/{capture} ({len(extrinsics)} frames after trimming)", file=sys.stderr)
+            sys.exit(1)
+
+        start_index = random.randint(0, start_index_max)
+        return extrinsics[start_index:start_index + num_frames]
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} VCAM_ROOT STORE_PATH", file=sys.stderr)
+        sys.exit(1)
+
+    vcam_root = Path(sys.argv[1])
+    store = VCamCaptureStore.load(sys.argv[2], vcam_root, vcam_root / "vcam_captures.json")
+    for (key, captures) in store.captures.items():
+        frames = [len(store.get_extrinsics(*key, capture)) for capture in captures]
+        print(f"{'/'.join(key)}: {len(captures)} captures, {sum(frames)} frames")
+    print(f"[INFO] {len(store.capture_index)} captures, {len(store.extrinsics)} frames", file=sys.stderr)
+
+    sys.exit(0)
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+# Copyright (c) 2025 Max Planck Society
+# License: https://bedlam2.is.tuebingen.mpg.de/license.html
+#
+# Binary sidecar format for be_camera_animations.json
+#
+# Keyframes of all sequences are stored as fixed-size records in one typed array,
+# sequences are located through an offset index. Readers memory-map the file and
+# only decode the sequences they access, so batched editor instances which handle
+# a subset of the sequences do not need to parse the complete camera definition.
+#
+# Conversion JSON -> binary -> JSON is lossless for files written by the camera
+# animation generators (same keys, key order, value types and float values).
+#
+# Only uses Python standard library since it is also used inside Unreal Editor.
+#
+# Layout (little-endian):
+#   header:    magic, version, number of sequences, offsets/sizes of following sections
+#   info:      JSON { "info": global info, "types": keyframe type names }
+#   index:     per sequence: data offset, name size, info size, first keyframe, number of keyframes
+#   data:      per sequence: UTF-8 name followed by JSON encoded sequence info
+#   keyframes: fixed-size keyframe records, see KEYFRAME_STRUCT
+#
+# Usage:
+#   python be_camera_animations_bin.py be_camera_animations.json be_camera_animations.bin
+#   python be_camera_animations_bin.py be_camera_animations.bin be_camera_animations.json
+#
+import json
+import mmap
+from pathlib import Path
+import struct
+import sys
+
+CAMERA_ANIMATIONS_MAGIC = b"BECAMANI"
+CAMERA_ANIMATIONS_VERSION = 1
+
+HEADER_STRUCT = struct.Struct("<8sIIQQQQQ") # magic, version, num_sequences, info_offset, info_size, index_offset, data_offset, keyframes_offset
+INDEX_STRUCT = struct.Struct("<QIIQI") # data_offset, name_size, info_size, first_keyframe, num_keyframes
+
+# Keyframe values in storage order, (group, key). Group None denotes top level keyframe value.
+KEYFRAME_VALUES = [ (None, "hfov"),
+                    ("cameraroot", "x"), ("cameraroot", "y"), ("cameraroot", "z"), ("cameraroot", "yaw"), ("cameraroot", "pitch"), ("cameraroot", "roll"),
+                    ("camera_local", "x"), ("camera_local", "y"), ("camera_local", "z"), ("camera_local", "yaw"), ("camera_local", "pitch"), ("camera_local", "roll") ]
+KEYFRAME_KEYS = ["frame_index", "hfov", "cameraroot", "camera_local", "type"]
+
+# frame_index, present value bits, integer value bits, type index, values
+KEYFRAME_STRUCT = struct.Struct(f"<iHHB{len(KEYFRAME_VALUES)}d")
+KEYFRAME_TYPE_NONE = 255
+
+################################################################################
+# Write
+################################################################################
+
+def get_keyframe_layout(keyframe):
+    """
+    Return (present, value indices) of keyframe values in storage order for keyframe key structure, raise ValueError if unsupported
+    """
+    keys = list(keyframe.keys())
+    if keys != [key for key in KEYFRAME_KEYS if key in keyframe]:
+        raise ValueError(f"Unsupported keyframe keys: {keys}")
+
+    present = 0
+    value_indices = []
+    for group in [None, "cameraroot", "camera_local"]:
+        if group is None:
+            source = keyframe
+        else:
+            if group not in keyframe:
+                continue
+            source = keyframe[group]
+            group_keys = list(source.keys())
+            if (len(group_keys) == 0) or (group_keys != [key for (value_group, key) in KEYFRAME_VALUES if (value_group == group) and (key in source)]):
+                raise ValueError(f"Unsupported {group} keys: {group_keys}")
+
+        for (value_index, (value_group, key)) in enumerate(KEYFRAME_VALUES):
+            if (value_group == group) and (key in source):
+                present |= (1 << value_index)
+                value_indices.append(value_index)
+
+    return (present, value_indices)
+
+def encode_keyframe(keyframe, types, layouts=None):
+    """
+    Return KEYFRAME_STRUCT values for keyframe dictionary, raise ValueError if keyframe cannot be stored losslessly
+      layouts: optional cache of keyframe layouts per key structure, shared between calls
+    """
+    cameraroot = keyframe.get("cameraroot", None)
+    camera_local = keyframe.get("camera_local", None)
+    structure = (tuple(keyframe), None if type(cameraroot) is not dict else tuple(cameraroot), None if type(camera_local) is not dict else tuple(camera_local))
+
+    layout = None if layouts is None else layouts.get(structure, None)
+    if layout is None:
+        layout = get_keyframe_layout(keyframe)
+        if layouts is not None:
+            layouts[structure] = layout
+    (present, value_indices) = layout
+
+    frame_index = keyframe["frame_index"]
+    if type(frame_index) is not int:
+        raise ValueError(f"Invalid frame_index: {frame_index}")
+
+    source_values = []
+    if "hfov" in keyframe:
+        source_values.append(keyframe["hfov"])
+    if cameraroot is not None:
+        source_values.extend(cameraroot.values())
+    if camera_local is not None:
+        source_values.extend(camera_local.values())
+
+    integer = 0
+    values = [0.0] * len(KEYFRAME_VALUES)
+    for (value_index, value) in zip(value_indices, source_values):
+        if type(value) is int:
+            integer |= (1 << value_index)
+        elif type(value) is not float:
+            (group, key) = KEYFRAME_VALUES[value_index]
+            raise ValueError(f"Invalid keyframe value: {key}={value}")
+        values[value_index] = value
+
+    type_index = KEYFRAME_TYPE_NONE
+    if "type" in keyframe:
+        if keyframe["type"] not in types:
+            types.append(keyframe["type"])
+        type_index = types.index(keyframe["type"])
+
+    return (frame_index, present, integer, type_index, *values)
+
+def write_camera_animations(path, camera_animations):
+    """
+    Write camera animations dictionary (be_camera_animations.json structure) in binary format
+    """
+    sequence_names = [key for key in camera_animations if key != "info"]
+
+    types = []
+    layouts = {}
+    index = bytearray(INDEX_STRUCT.size * len(sequence_names))
+    data = bytearray()
+    keyframe_values = []
+    for (sequence_index, sequence_name) in enumerate(sequence_names):
+        sequence = camera_animations[sequence_name]
+        if list(sequence.keys()) != ["keyframes", "info"]:
+            raise ValueError(f"Unsupported sequence keys: {sequence_name}: {list(sequence.keys())}")
+
+        name = sequence_name.encode("utf-8")
+        info = json.dumps(sequence["info"], separators=(",", ":")).encode("utf-8")
+        INDEX_STRUCT.pack_into(index, sequence_index * INDEX_STRUCT.size, len(data), len(name), len(info), len(keyframe_values), len(sequence["keyframes"]))
+        data += name
+        data += info
+
+        for keyframe in sequence["keyframes"]:
+            keyframe_values.append(encode_keyframe(keyframe, types, layouts))
+
+    keyframes = bytearray(KEYFRAME_STRUCT.size * len(keyframe_values))
+    for (keyframe_index, values) in enumerate(keyframe_values):
+        KEYFRAME_STRUCT.pack_into(keyframes, keyframe_index * KEYFRAME_STRUCT.size, *values)
+
+    info = json.dumps({ "info": camera_animations.get("info", None), "types": types }, separators=(",", ":")).encode("utf-8")
+
+    info_offset = HEADER_STRUCT.size
+    index_offset = info_offset + len(info)
+    data_offset = index_offset + len(index)
+    keyframes_offset = data_offset + len(data)
+
+    with open(path, "wb") as f:
+        f.write(HEADER_STRUCT.pack(CAMERA_ANIMATIONS_MAGIC, CAMERA_ANIMATIONS_VERSION, len(sequence_names), info_offset, len(info), index_offset, data_offset, keyframes_offset))
+        f.write(info)
+        f.write(index)
+        f.write(data)
+        f.write(keyframes)
+
+    return
+
+def write_camera_animations_sidecar(path, camera_animations):
+    """
+    Write binary sidecar next to freshly written JSON file, remove stale sidecar if camera animations cannot be stored losslessly
+      Loaders prefer a .bin which is not older than its .json, so the sidecar must be written after the JSON file
+    """
+    try:
+        write_camera_animations(path, camera_animations)
+    except ValueError as e:
+        Path(path).unlink(missing_ok=True)
+        print(f"WARNING: Binary camera animations not saved, using JSON only: {e}", file=sys.stderr)
+        return False
+
+    return True
+
+################################################################################
+# Read
+################################################################################
+
+class CameraAnimations:
+    """
+    Read-only, memory-mapped camera animations. Behaves like the dictionary loaded from be_camera_animations.json:
+    camera_animations["info"] is the global info, camera_animations[sequence_name] returns { "keyframes": [...], "info": {...} }.
+    Sequences are decoded on first access.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, self.num_sequences, info_offset, info_size, self.index_offset, self.data_offset, self.keyframes_offset) = HEADER_STRUCT.unpack_from(self.buffer, 0)
+        if magic != CAMERA_ANIMATIONS_MAGIC:
+            raise ValueError(f"Not a camera animations file: {self.path}")
+        if version != CAMERA_ANIMATIONS_VERSION:
+            raise ValueError(f"Unsupported camera animations version {version}: {self.path}")
+
+        header = json.loads(self.buffer[info_offset:info_offset + info_size].decode("utf-8"))
+        self.info = header["info"]
+        self.types = header["types"]
+
+        self.sequence_index = {}
+        for sequence_index in range(self.num_sequences):
+            (data_offset, name_size, info_size, first_keyframe, num_keyframes) = INDEX_STRUCT.unpack_from(self.buffer, self.index_offset + sequence_index * INDEX_STRUCT.size)
+            name_offset = self.data_offset + data_offset
+            self.sequence_index[self.buffer[name_offset:name_offset + name_size].decode("utf-8")] = sequence_index
+
+        self.sequences = {}
+
+    def __len__(self):
+        return self.num_sequences + 1
+
+    def __iter__(self):
+        yield "info"
+        yield from self.sequence_index
+
+    def keys(self):
+        return list(self)
+
+    def __contains__(self, key):
+        return (key == "info") or (key in self.sequence_index)
+
+    def __getitem__(self, key):
+        if key == "info":
+            return self.info
+
+        sequence = self.sequences.get(key, None)
+        if sequence is None:
+            sequence = self.get_sequence(self.sequence_index[key])
+            self.sequences[key] = sequence
+        return sequence
+
+    def get(self, key, default=None):
+        if key not in self:
+            return default
+        return self[key]
+
+    def get_sequence(self, sequence_index):
+        (data_offset, name_size, info_size, first_keyframe, num_keyframes) = INDEX_STRUCT.unpack_from(self.buffer, self.index_offset + sequence_index * INDEX_STRUCT.size)
+        info_offset = self.data_offset + data_offset + name_size
+        info = json.loads(self.buffer[info_offset:info_offset + info_size].decode("utf-8"))
+
+        keyframes = []
+        offset = self.keyframes_offset + first_keyframe * KEYFRAME_STRUCT.size
+        for (frame_index, present, integer, type_index, *values) in KEYFRAME_STRUCT.iter_unpack(self.buffer[offset:offset + num_keyframes * KEYFRAME_STRUCT.size]):
+            keyframe = { "frame_index": frame_index }
+            for (value_index, (group, key)) in enumerate(KEYFRAME_VALUES):
+                if not (present & (1 << value_index)):
+                    continue
+
+                value = values[value_index]
+                if integer & (1 << value_index):
+                    value = int(value)
+
+                if group is None:
+                    keyframe[key] = value
+                else:
+                    keyframe.setdefault(group, {})[key] = value
+
+            if type_index != KEYFRAME_TYPE_NONE:
+                keyframe["type"] = self.types[type_index]
+
+            keyframes.append(keyframe)
+
+        return { "keyframes": keyframes, "info": info }
+
+    def to_dict(self):
+        camera_animations = {}
+        if self.info is not None:
+            camera_animations["info"] = self.info
+        for sequence_name in self.sequence_index:
+            camera_animations[sequence_name] = self[sequence_name]
+        return camera_animations
+
+    def close(self):
+        self.buffer.close()
+
+def load_camera_animations(path):
+    """
+    Load camera animations from JSON (.json) or binary (.bin) file
+    """
+    path = Path(path)
+    if path.suffix == ".bin":
+        return CameraAnimations(path)
+
+    with open(path, "r") as f:
+        return json.load(f)
+
+################################################################################
+# Main
+################################################################################
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: {sys.argv[0]} INPUT OUTPUT", file=sys.stderr)
+        print(f"       {sys.argv[0]} be_camera_animations.json be_camera_animations.bin", file=sys.stderr)
+        print(f"       {sys.argv[0]} be_camera_animations.bin be_camera_animations.json", file=sys.stderr)
+        sys.exit(1)
+
+    input_path = Path(sys.argv[1])
+    output_path = Path(sys.argv[2])
+
+    if input_path.suffix == output_path.suffix:
+        print(f"ERROR: Input and output need different formats (.json/.bin): {input_path} {output_path}", file=sys.stderr)
+        sys.exit(1)
+
+    if not input_path.exists():
+        print(f"ERROR: Input file not found: {input_path}", file=sys.stderr)
+        sys.exit(1)
+
+    if output_path.suffix == ".bin":
+        with open(input_path, "r") as f:
+            camera_animations = json.load(f)
+
+        try:
+            write_camera_animations(output_path, camera_animations)
+        except ValueError as e:
+            print(f"ERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+    else:
+        camera_animations = CameraAnimations(input_path)
+        with open(output_path, "w") as f:
+            json.dump(camera_animations.to_dict(), f, indent=4)
+        camera_animations.close()
+
+    print(f"Saving: {output_path}", file=sys.stderr)
+    sys.exit(0)
@@ -9,7 +9,6 @@
 from configparser import NoOptionError
 import csv
 from dataclasses import dataclass
-import json
 from math import radians, tan
 from pathlib import Path
 import re
@@ -17,6 +16,8 @@ import sys
 import time
 import unreal
 
+from be_camera_animations_bin import load_camera_animations
+
 # Globals
 WARMUP_FRAMES = 10 # Needed for proper temporal sampling on frame 0 of animations and raytracing warmup. These frames are rendered out with negative numbers and will be deleted in post render pipeline.
 data_root_unreal = "/Engine/PS/Bedlam/"
@@ -354,27 +355,19 @@ def add_camera_animation(camera_animations, level_sequence, sequence_name, camer
             unreal.log_error(f"Unsupported interpolation type {type}")
             return False
 
+        # Reduced keyframes (be_keyframe_reduction.py) only contain the channels which are keyed at this frame
         frame_index = keyframe["frame_index"]
-        if cameraroot_binding is not None:
+        if (cameraroot_binding is not None) and ("cameraroot" in keyframe):
             cameraroot = keyframe["cameraroot"]
-            cameraroot_transform_channels[0].add_key(time=unreal.FrameNumber(frame_index), new_value=cameraroot["x"], interpolation=interpolation)
-            cameraroot_transform_channels[1].add_key(time=unreal.FrameNumber(frame_index), new_value=cameraroot["y"], interpolation=interpolation)
-            cameraroot_transform_channels[2].add_key(time=unreal.FrameNumber(frame_index), new_value=cameraroot["z"], interpolation=interpolation)
-            cameraroot_transform_channels[4].add_key(time=unreal.FrameNumber(frame_index), new_value=cameraroot["pitch"], interpolation=interpolation)
-            cameraroot_transform_channels[5].add_key(time=unreal.FrameNumber(frame_index), new_value=cameraroot["yaw"], interpolation=interpolation)
+            for (channel_index, key) in [(0, "x"), (1, "y"), (2, "z"), (4, "pitch"), (5, "yaw")]:
+                if key in cameraroot:
+                    cameraroot_transform_channels[channel_index].add_key(time=unreal.FrameNumber(frame_index), new_value=cameraroot[key], interpolation=interpolation)
 
         if "camera_local" in keyframe:
             camera = keyframe["camera_local"]
-            camera_transform_channels[0].add_key(time=unreal.FrameNumber(frame_index), new_value=camera["x"], interpolation=interpolation)
-            camera_transform_channels[1].add_key(time=unreal.FrameNumber(frame_index), new_value=camera["y"], interpolation=interpolation)
-            camera_transform_channels[2].add_key(time=unreal.FrameNumber(frame_index), new_value=camera["z"], interpolation=interpolation)
-
-            if "roll" in camera:
-                camera_transform_channels[3].add_key(time=unreal.FrameNumber(frame_index), new_value=camera["roll"], interpolation=interpolation)
-            if "pitch" in camera:
-                camera_transform_channels[4].add_key(time=unreal.FrameNumber(frame_index), new_value=camera["pitch"], interpolation=interpolation)
-            if "yaw" in camera:
-                camera_transform_channels[5].add_key(time=unreal.FrameNumber(frame_index), new_value=camera["yaw"], interpolation=interpolation)
+            for (channel_index, key) in [(0, "x"), (1, "y"), (2, "z"), (3, "roll"), (4, "pitch"), (5, "yaw")]:
+                if key in camera:
+                    camera_transform_channels[channel_index].add_key(time=unreal.FrameNumber(frame_index), new_value=camera[key], interpolation=interpolation)
 
     return True
 
@@ -960,15 +953,23 @@ if __name__ == '__main__':
 
         # Check for presence of be_camera_animations.json file
         # If be_camera_animations_depth.json (fully keyframed camera pose) is existing then this will be used instead of be_camera_animations.json
+        # Binary sidecar (.bin) is preferred if it is not older than the JSON file. It is memory-mapped and only sequences handled by this instance are decoded.
         camera_animation_depth_filename = camera_animation_filename.replace(".json", "_depth.json")
-        camera_movement_path = Path(csv_path).parent / camera_animation_depth_filename
-        if not camera_movement_path.is_file():
-            camera_movement_path = Path(csv_path).parent / camera_animation_filename
-
-        if camera_movement_path.is_file():
+        camera_movement_path = None
+        for filename in [camera_animation_depth_filename, camera_animation_filename]:
+            camera_movement_json_path = Path(csv_path).parent / filename
+            camera_movement_bin_path = camera_movement_json_path.with_suffix(".bin")
+            if camera_movement_bin_path.is_file() and ((not camera_movement_json_path.is_file()) or (camera_movement_bin_path.stat().st_mtime >= camera_movement_json_path.stat().st_mtime)):
+                camera_movement_path = camera_movement_bin_path
+            elif camera_movement_json_path.is_file():
+                camera_movement_path = camera_movement_json_path
+
+            if camera_movement_path is not None:
+                break
+
+        if camera_movement_path is not None:
             unreal.log(f"Using camera animation definition: {camera_movement_path}")
-            with open(camera_movement_path, "r") as f:
-                camera_animations = json.load(f)
+            camera_animations = load_camera_animations(camera_movement_path)
 
     start_time = time.perf_counter()
 